@@ -16,6 +16,94 @@ TOGETHER_API_KEY = os.getenv("TOGETHER_API_KEY")
 DEFAULT_MODEL_SIZE = os.getenv("DEFAULT_MODEL_SIZE", "base")
 DEFAULT_SAVE_DIR = os.getenv("DEFAULT_SAVE_DIR", str(DATA_DIR / "saved_meetings"))
 DEFAULT_LLM_MODEL = os.getenv("DEFAULT_LLM_MODEL", "meta-llama/Meta-Llama-3-8B-Instruct-Lite")
+# Run one dummy inference after loading so the first real request is not slow
+WHISPER_WARMUP = os.getenv("WHISPER_WARMUP", "true").lower() in ("1", "true", "yes")
+# RAM budget for loaded Whisper models; least recently used ones are evicted (0 = unlimited)
+WHISPER_MEMORY_BUDGET_MB = float(os.getenv("WHISPER_MEMORY_BUDGET_MB", "4096"))
+# On-disk transcription cache keyed by audio hash, model and decode options (0 MB = disabled)
+TRANSCRIPT_CACHE_DIR = os.getenv("TRANSCRIPT_CACHE_DIR", str(DATA_DIR / "cache" / "transcripts"))
+TRANSCRIPT_CACHE_MAX_MB = float(os.getenv("TRANSCRIPT_CACHE_MAX_MB", "512"))
+# Live transcription: seconds of audio per background window and characters of prompt carried over
+STREAM_WINDOW_SECONDS = float(os.getenv("STREAM_WINDOW_SECONDS", "15"))
+STREAM_PROMPT_CHARS = int(os.getenv("STREAM_PROMPT_CHARS", "200"))
+# Voice activity detection: only speech regions are sent to Whisper
+VAD_ENABLED = os.getenv("VAD_ENABLED", "true").lower() in ("1", "true", "yes")
+VAD_THRESHOLD_DB = float(os.getenv("VAD_THRESHOLD_DB", "12"))
+VAD_PAD_MS = int(os.getenv("VAD_PAD_MS", "300"))
+VAD_MIN_SILENCE_MS = int(os.getenv("VAD_MIN_SILENCE_MS", "600"))
+VAD_MIN_SPEECH_MS = int(os.getenv("VAD_MIN_SPEECH_MS", "150"))
+# Parallel chunked transcription on CPU: worker processes (0 or 1 = off), torch threads
+# per worker (0 = CPU count / workers), chunk length and minimum recording length
+PARALLEL_WORKERS = int(os.getenv("PARALLEL_WORKERS", "0"))
+PARALLEL_TORCH_THREADS = int(os.getenv("PARALLEL_TORCH_THREADS", "0"))
+PARALLEL_CHUNK_SECONDS = float(os.getenv("PARALLEL_CHUNK_SECONDS", "120"))
+PARALLEL_MIN_SECONDS = float(os.getenv("PARALLEL_MIN_SECONDS", "300"))
+# Decode guardrails: end a 30 s window once its text repeats the same phrase this many
+# times, or after this many seconds including temperature retries, and skip the rest of
+# a request once decoding takes this many times the audio duration (0 = off, each)
+WHISPER_REPEAT_LIMIT = int(os.getenv("WHISPER_REPEAT_LIMIT", "4"))
+WHISPER_WINDOW_BUDGET_SECONDS = float(os.getenv("WHISPER_WINDOW_BUDGET_SECONDS", "60"))
+WHISPER_MAX_RTF = float(os.getenv("WHISPER_MAX_RTF", "5"))
+# Columnar segment tables ("*.seg", memory-mapped when read) and the confidence limits
+# below which segments are left out of summaries
+SEGMENTS_DIR = os.getenv("SEGMENTS_DIR", str(DATA_DIR / "segments"))
+SEGMENT_MIN_AVG_LOGPROB = float(os.getenv("SEGMENT_MIN_AVG_LOGPROB", "-1.0"))
+SEGMENT_MAX_NO_SPEECH_PROB = float(os.getenv("SEGMENT_MAX_NO_SPEECH_PROB", "0.6"))
+# Cross-request dynamic batching: decode 30 s windows of concurrent requests together
+# (one segment per window, no word timestamps or previous-text prompt; windows that
+# fail Whisper's quality thresholds are still retried at higher temperatures)
+WHISPER_BATCHING = os.getenv("WHISPER_BATCHING", "false").lower() in ("1", "true", "yes")
+WHISPER_BATCH_SIZE = int(os.getenv("WHISPER_BATCH_SIZE", "8"))
+WHISPER_BATCH_WAIT_MS = float(os.getenv("WHISPER_BATCH_WAIT_MS", "50"))
+# CPU acceleration (opt-in): int8 dynamic quantization of Whisper's Linear layers on CPU,
+# checked with `python main.py bench --scenarios quantization` before enabling
+WHISPER_CPU_INT8 = os.getenv("WHISPER_CPU_INT8", "false").lower() in ("1", "true", "yes")
+# Torch intra-op (within one op) and inter-op (across ops) threads (0 = torch defaults)
+TORCH_INTRA_OP_THREADS = int(os.getenv("TORCH_INTRA_OP_THREADS", "0"))
+TORCH_INTER_OP_THREADS = int(os.getenv("TORCH_INTER_OP_THREADS", "0"))
+# Seconds a transcription request waits for the background model load
+MODEL_LOAD_TIMEOUT = float(os.getenv("MODEL_LOAD_TIMEOUT", "600"))
+
+# Storage
+# SQLite database holding every meeting's transcript, segments, summary and metadata
+ARCHIVE_DB_PATH = os.getenv("ARCHIVE_DB_PATH", str(DATA_DIR / "meetings.db"))
+# Recordings are stored once per distinct audio as 16 kHz mono "flac" or "opus"
+AUDIO_ARCHIVE_DIR = os.getenv("AUDIO_ARCHIVE_DIR", str(DATA_DIR / "audio"))
+AUDIO_ARCHIVE_CODEC = os.getenv("AUDIO_ARCHIVE_CODEC", "flac")
+AUDIO_ARCHIVE_OPUS_BITRATE = os.getenv("AUDIO_ARCHIVE_OPUS_BITRATE", "24k")
+
+# Audio Tools
+# Explicit ffmpeg executable; when unset, PATH and imageio-ffmpeg are searched
+FFMPEG_BINARY = os.getenv("FFMPEG_BINARY")
+
+# Job Queues
+# Concurrent jobs and waiting slots per stage; requests beyond that are turned away
+TRANSCRIBE_CONCURRENCY = int(os.getenv("TRANSCRIBE_CONCURRENCY", "1"))
+TRANSCRIBE_QUEUE_SIZE = int(os.getenv("TRANSCRIBE_QUEUE_SIZE", "8"))
+SUMMARIZE_CONCURRENCY = int(os.getenv("SUMMARIZE_CONCURRENCY", "4"))
+SUMMARIZE_QUEUE_SIZE = int(os.getenv("SUMMARIZE_QUEUE_SIZE", "16"))
+
+# Summarization
+# OpenAI-compatible chat completions endpoint (Together by default; any local server works)
+LLM_BASE_URL = os.getenv("LLM_BASE_URL", "https://api.together.xyz/v1")
+LLM_API_KEY = os.getenv("LLM_API_KEY", TOGETHER_API_KEY)
+# Seconds per attempt (reading a streamed reply included), retries on 429/5xx,
+# pooled connections and rate limits (0 = unlimited)
+LLM_TIMEOUT = float(os.getenv("LLM_TIMEOUT", "60"))
+LLM_MAX_RETRIES = int(os.getenv("LLM_MAX_RETRIES", "4"))
+LLM_MAX_CONNECTIONS = int(os.getenv("LLM_MAX_CONNECTIONS", "16"))
+LLM_REQUESTS_PER_MINUTE = float(os.getenv("LLM_REQUESTS_PER_MINUTE", "0"))
+LLM_TOKENS_PER_MINUTE = float(os.getenv("LLM_TOKENS_PER_MINUTE", "0"))
+# Transcripts longer than this many tokens are summarized map-reduce style in chunks,
+# with up to SUMMARY_MAP_CONCURRENCY chunk requests in flight
+SUMMARY_CHUNK_TOKENS = int(os.getenv("SUMMARY_CHUNK_TOKENS", "3000"))
+SUMMARY_MAP_CONCURRENCY = int(os.getenv("SUMMARY_MAP_CONCURRENCY", "4"))
+# On-disk summary cache keyed by transcript, prompts and LLM model (0 MB = disabled, 0 h = no expiry)
+SUMMARY_CACHE_DIR = os.getenv("SUMMARY_CACHE_DIR", str(DATA_DIR / "cache" / "summaries"))
+SUMMARY_CACHE_MAX_MB = float(os.getenv("SUMMARY_CACHE_MAX_MB", "64"))
+SUMMARY_CACHE_TTL_HOURS = float(os.getenv("SUMMARY_CACHE_TTL_HOURS", "168"))
+# Remove filler words and repeated phrases from transcripts before they are summarized
+TRANSCRIPT_COMPACTION = os.getenv("TRANSCRIPT_COMPACTION", "true").lower() in ("1", "true", "yes")
 
 # User Interface
 APP_TITLE = os.getenv("APP_TITLE", "AI-Wizard: Meeting Recorder and Summarizer")
@@ -24,5 +112,5 @@ APP_DESCRIPTION = os.getenv("APP_DESCRIPTION", "Record, transcribe, and summariz
 # Warn if no API key is found
 if not TOGETHER_API_KEY:
     print("⚠️  Warning: TOGETHER_API_KEY not found in environment variables.")
-    print("   Summarization will use a placeholder implementation.")
+    print("   Summarization will use the offline extractive summarizer.")
     print("   Please copy .env.example to .env and add your API key.")
\ No newline at end of file
@@ -1,65 +1,82 @@
 import os
 import argparse
-import gradio as gr
-from datetime import datetime
-import sys
-import subprocess
 
-# 尝试安装ffmpeg
-def ensure_ffmpeg():
-    """确保ffmpeg可用"""
-    try:
-        # 尝试运行ffmpeg命令
-        subprocess.run(["ffmpeg", "-version"], check=True, capture_output=True)
-        print("System ffmpeg is available")
-        return True
-    except:
-        print("System ffmpeg not found, trying to install via pip...")
-        try:
-            # 安装imageio-ffmpeg
-            subprocess.run([sys.executable, "-m", "pip", "install", "imageio-ffmpeg"], check=True)
-            
-            # 设置环境变量
-            import imageio_ffmpeg
-            ffmpeg_path = imageio_ffmpeg.get_ffmpeg_exe()
-            os.environ["PATH"] = os.environ["PATH"] + os.pathsep + os.path.dirname(ffmpeg_path)
-            print(f"Added ffmpeg to PATH: {ffmpeg_path}")
-            
-            # 验证安装
-            try:
-                subprocess.run([ffmpeg_path, "-version"], check=True, capture_output=True)
-                print("ffmpeg from imageio_ffmpeg is working")
-                return True
-            except:
-                print(f"Failed to run {ffmpeg_path}")
-                return False
-        except Exception as e:
-            print(f"Failed to install ffmpeg: {str(e)}")
-            return False
-
-# 确保ffmpeg可用
-ensure_ffmpeg()
-
-# Import our modules
-from src.transcription.whisper_transcriber import WhisperTranscriber
-from src.summarization.llm_summarizer import MeetingSummarizer
-from src.ui.gradio_interface import create_interface
+from src.utils.timing import PhaseTimer
 
 # Import configuration
-from config import TOGETHER_API_KEY, DEFAULT_MODEL_SIZE, DEFAULT_SAVE_DIR
+from config import (
+    LLM_API_KEY, LLM_BASE_URL, DEFAULT_MODEL_SIZE, DEFAULT_SAVE_DIR, ARCHIVE_DB_PATH,
+    AUDIO_ARCHIVE_DIR, AUDIO_ARCHIVE_CODEC, AUDIO_ARCHIVE_OPUS_BITRATE
+)
 
 def parse_args():
     """Parse command line arguments."""
     parser = argparse.ArgumentParser(description='Meeting Recorder and Summarizer')
     parser.add_argument('--model_size', default=DEFAULT_MODEL_SIZE, 
                         choices=['tiny', 'base', 'small', 'medium', 'large'],
-                        help='Whisper model size to use for transcription')
+                        help='Default Whisper model size, loaded at startup (others load on first use)')
     parser.add_argument('--save_dir', default=DEFAULT_SAVE_DIR,
                         help='Directory to save meeting recordings and summaries')
     parser.add_argument('--port', type=int, default=7860,
                         help='Port for the Gradio web interface')
     parser.add_argument('--debug', action='store_true',
                         help='Enable debug mode')
+    parser.add_argument('--share', action='store_true',
+                        help='Create a public Gradio link (disables the /healthz and /readyz routes)')
+    parser.add_argument('--setup-ffmpeg', action='store_true',
+                        help='Install an ffmpeg binary via imageio-ffmpeg and exit')
+    
+    # Without a subcommand the web interface is served
+    subparsers = parser.add_subparsers(dest='command')
+    batch = subparsers.add_parser('batch', help='Transcribe and summarize every recording in a directory')
+    batch.add_argument('input_dir', help='Directory of audio files')
+    batch.add_argument('--model_size', default=DEFAULT_MODEL_SIZE,
+                       choices=['tiny', 'base', 'small', 'medium', 'large'],
+                       help='Whisper model size')
+    batch.add_argument('--output_dir', default=None,
+                       help='Where transcripts and summaries are written (default: input_dir)')
+    batch.add_argument('--recursive', action='store_true',
+                       help='Include subdirectories')
+    batch.add_argument('--no-summary', action='store_true',
+                       help='Only transcribe')
+    batch.add_argument('--decode-workers', type=int, default=2,
+                       help='Files decoded concurrently')
+    batch.add_argument('--summary-workers', type=int, default=4,
+                       help='Concurrent LLM requests')
+    batch.add_argument('--queue-size', type=int, default=4,
+                       help='Files buffered between pipeline stages')
+    
+    import_parser = subparsers.add_parser('import', help='Import .txt transcripts and summaries into the meeting archive')
+    import_parser.add_argument('input_dir', nargs='?', default=DEFAULT_SAVE_DIR,
+                               help='Directory of saved text files (default: the save directory)')
+    
+    bench = subparsers.add_parser('bench', help='Benchmark transcription and summarization on synthetic fixtures')
+    bench.add_argument('--scenarios', nargs='+', default=None,
+                       choices=['transcribe', 'summarize', 'summarize_offline', 'pipeline', 'quantization'],
+                       help='Scenarios to run (default: all but quantization)')
+    bench.add_argument('--model_size', default='tiny',
+                       choices=['tiny', 'base', 'small', 'medium', 'large'],
+                       help='Whisper model size')
+    bench.add_argument('--model-sizes', nargs='+', default=None,
+                       choices=['tiny', 'base', 'small', 'medium', 'large'],
+                       help='Model sizes compared fp32 vs int8 by the quantization scenario (default: --model_size)')
+    bench.add_argument('--reference-dir', default=None,
+                       help='Recordings with reference transcripts (name.wav + name.txt) for the int8 accuracy check '
+                            '(required by the quantization scenario)')
+    bench.add_argument('--max-wer-increase', type=float, default=0.02,
+                       help='Largest word error rate increase int8 may cause')
+    bench.add_argument('--durations', type=float, nargs='+', default=[30, 300],
+                       help='Audio fixture lengths in seconds')
+    bench.add_argument('--transcript-words', type=int, nargs='+', default=[2000, 20000],
+                       help='Transcript fixture lengths in words')
+    bench.add_argument('--repeats', type=int, default=3,
+                       help='Measurements per fixture')
+    bench.add_argument('--work-dir', default=os.path.join('data', 'benchmark'),
+                       help='Directory for fixtures and scratch output')
+    bench.add_argument('--output', default=None,
+                       help='Results JSON file (default: <work-dir>/results-<timestamp>.json)')
+    bench.add_argument('--compare', default=None,
+                       help='Earlier results JSON to compare against')
     return parser.parse_args()
 
 def setup_environment(args):
@@ -75,45 +92,193 @@ def setup_environment(args):
             format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
         )
 
+def create_summarizer():
+    """Create the meeting summarizer, using the LLM if an API key (or endpoint) is configured."""
+    from src.summarization.llm_summarizer import MeetingSummarizer
+    
+    if LLM_API_KEY or os.getenv("LLM_BASE_URL"):
+        from src.summarization.llm_client import AsyncLLMClient
+        client = AsyncLLMClient(LLM_BASE_URL, api_key=LLM_API_KEY)
+        print(f"Using {LLM_BASE_URL} for meeting summarization")
+        return MeetingSummarizer(client)
+    
+    # Use the offline extractive summarizer, which needs no API access
+    print("WARNING: No API key found. Using offline extractive summarization.")
+    print("For full functionality, set TOGETHER_API_KEY in .env file")
+    return MeetingSummarizer(None)
+
+def run_batch(args):
+    """Process a directory of recordings without the web interface."""
+    from src.pipeline.batch import BatchPipeline, find_audio_files
+    from src.storage.audio_archive import AudioArchive
+    from src.storage.meeting_archive import MeetingArchive
+    from src.transcription.whisper_transcriber import WhisperTranscriber
+    
+    paths = find_audio_files(args.input_dir, recursive=args.recursive)
+    if not paths:
+        print(f"No audio files found in {args.input_dir}")
+        return
+    print(f"Found {len(paths)} audio files in {args.input_dir}")
+    
+    transcriber = WhisperTranscriber(model_size=args.model_size, background=True)
+    summarizer = None if args.no_summary else create_summarizer()
+    pipeline = BatchPipeline(
+        transcriber,
+        summarizer,
+        output_dir=args.output_dir or args.input_dir,
+        input_dir=args.input_dir,
+        archive=MeetingArchive(ARCHIVE_DB_PATH),
+        audio_archive=AudioArchive(AUDIO_ARCHIVE_DIR, AUDIO_ARCHIVE_CODEC, AUDIO_ARCHIVE_OPUS_BITRATE),
+        decode_workers=args.decode_workers,
+        summary_workers=args.summary_workers,
+        queue_size=args.queue_size,
+    )
+    stats = pipeline.run(paths)
+    
+    print(f"Done: {stats['transcribed']} transcribed ({stats['no_speech']} without speech), "
+          f"{stats['summarized']} summarized, {stats['skipped']} skipped, {stats['failed']} failed")
+    print(f"Processed {stats['audio_seconds'] / 3600:.2f} h of audio in {stats['wall_seconds'] / 3600:.2f} h "
+          f"({stats['throughput']:.1f} audio hours per wall-clock hour)")
+    if stats['failed']:
+        raise SystemExit(1)
+
+def run_import(args):
+    """Bulk import saved text files into the meeting archive."""
+    import time
+    from src.storage.meeting_archive import MeetingArchive
+    
+    archive = MeetingArchive(ARCHIVE_DB_PATH)
+    start = time.time()
+    count = archive.import_directory(args.input_dir)
+    stats = archive.stats()
+    print(f"Imported {count} meetings from {args.input_dir} in {time.time() - start:.1f}s "
+          f"({stats['meetings']} meetings in {ARCHIVE_DB_PATH})")
+
+def run_bench(args):
+    """Run the benchmark suite and write (and optionally compare) its results."""
+    from datetime import datetime
+    from src.benchmark.runner import BenchmarkSuite, DEFAULT_SCENARIOS, compare_results, load_results, save_results
+    
+    scenarios = args.scenarios or DEFAULT_SCENARIOS
+    if "quantization" in scenarios and not args.reference_dir:
+        print("The quantization scenario needs --reference-dir: int8 accuracy cannot be checked on synthetic audio")
+        raise SystemExit(2)
+    
+    suite = BenchmarkSuite(
+        args.work_dir,
+        durations=[int(d) if d == int(d) else d for d in args.durations],
+        model_size=args.model_size,
+        repeats=args.repeats,
+        transcript_words=args.transcript_words,
+        model_sizes=args.model_sizes,
+        reference_dir=args.reference_dir,
+        max_wer_increase=args.max_wer_increase,
+    )
+    results = suite.run(scenarios)
+    output = args.output or os.path.join(args.work_dir, f"results-{datetime.now():%Y%m%d-%H%M%S}.json")
+    save_results(results, output)
+    
+    for name, result in results["results"].items():
+        if "error" in result:
+            print(f"{name}: failed ({result['error']})")
+            continue
+        line = f"{name}: {result['wall_seconds']:.1f}s"
+        if "rtf_p50" in result:
+            line += f", RTF p50 {result['rtf_p50']:.3f} / p95 {result.get('rtf_p95', result['rtf_p50']):.3f}"
+        if "throughput" in result:
+            line += f", throughput {result['throughput']:.1f}"
+        line += f", peak RSS {result['peak_rss_bytes'] / 2**20:.0f} MB"
+        print(line)
+        for model_size, comparison in result.get("models", {}).items():
+            line = (f"  {model_size} int8: {comparison['rtf_speedup']:.2f}x faster, "
+                    f"{comparison['model_memory_ratio']:.0%} of fp32 model memory, "
+                    f"{comparison['agreement_wer']:.1%} words differ from fp32, "
+                    f"WER {comparison['fp32_wer']:.1%} -> {comparison['int8_wer']:.1%} "
+                    f"({'ok' if comparison['drift_ok'] else 'DRIFT'})")
+            print(line)
+    print(f"Results written to {output}")
+    
+    if args.compare:
+        print(f"Compared with {args.compare}:")
+        for line in compare_results(load_results(args.compare), results):
+            print(f"  {line}")
+    failed = any("error" in result for result in results["results"].values())
+    drifted = any(comparison.get("drift_ok") is False
+                  for result in results["results"].values() for comparison in result.get("models", {}).values())
+    if failed or drifted:
+        raise SystemExit(1)
+
 def main():
     """Main entry point for the application."""
     # Parse command line arguments
     args = parse_args()
     
+    if args.setup_ffmpeg:
+        from src.transcription.whisper_patch import install_ffmpeg
+        raise SystemExit(0 if install_ffmpeg() else 1)
+    
+    if args.command == 'batch':
+        run_batch(args)
+        return
+    if args.command == 'import':
+        run_import(args)
+        return
+    if args.command == 'bench':
+        run_bench(args)
+        return
+    
+    timer = PhaseTimer("startup")
+    
     # Set up environment
-    setup_environment(args)
+    with timer.phase("setup environment"):
+        setup_environment(args)
+    
+    with timer.phase("resolve ffmpeg"):
+        from src.transcription.whisper_patch import resolve_ffmpeg
+        ffmpeg_path = resolve_ffmpeg()
+    if ffmpeg_path:
+        print(f"Using ffmpeg at: {ffmpeg_path}")
+    else:
+        print("WARNING: ffmpeg not found. Run `python main.py --setup-ffmpeg` to install it.")
+    
+    # Import our modules
+    with timer.phase("import modules"):
+        from src.transcription.whisper_transcriber import WhisperTranscriber
+        from src.ui.gradio_interface import create_interface
+        from src.ui.server import create_app
     
     print(f"Starting Meeting Recorder with Whisper model: {args.model_size}")
     
-    # Initialize the transcriber
-    transcriber = WhisperTranscriber(model_size=args.model_size)
+    # Initialize the transcriber; the model loads and warms up in the background
+    with timer.phase("start whisper model load"):
+        transcriber = WhisperTranscriber(model_size=args.model_size, background=True)
     
     # Initialize the summarizer
     # If API key is available, use the LLM for summarization
-    if TOGETHER_API_KEY:
-        from together import Together
-        client = Together(api_key=TOGETHER_API_KEY)
-        summarizer = MeetingSummarizer(client)
-        print("Using Together AI for meeting summarization")
-    else:
-        # Use a placeholder summarizer that doesn't require API access
-        summarizer = MeetingSummarizer(None)
-        print("WARNING: No API key found. Using placeholder summarization.")
-        print("For full functionality, set TOGETHER_API_KEY in .env file")
+    with timer.phase("create summarizer"):
+        summarizer = create_summarizer()
     
     # Create and launch the interface
-    interface = create_interface(
-        transcriber=transcriber,
-        summarizer=summarizer,
-        save_dir=args.save_dir
-    )
+    with timer.phase("build interface"):
+        interface = create_interface(
+            transcriber=transcriber,
+            summarizer=summarizer,
+            save_dir=args.save_dir
+        )
     
+    print(timer.report())
     print(f"Launching web interface on port {args.port}")
-    interface.launch(
-        server_name="0.0.0.0",  # Make available on local network
-        server_port=args.port,
-        share=True              # Create a public link
-    )
+    if args.share:
+        interface.launch(
+            server_name="0.0.0.0",  # Make available on local network
+            server_port=args.port,
+            share=True              # Create a public link
+        )
+        return
+    
+    import uvicorn
+    app = create_app(interface, transcriber)
+    uvicorn.run(app, host="0.0.0.0", port=args.port)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
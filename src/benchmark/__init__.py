@@ -0,0 +1,8 @@
+"""Benchmarks for AI-Wizard with synthetic fixtures."""
+
+from src.benchmark.fixtures import synthetic_audio, synthetic_transcript, write_audio_fixture
+from src.benchmark.runner import BenchmarkSuite, compare_results, load_results, save_results
+from src.benchmark.stub_llm import StubLLMServer
+
+__all__ = ['BenchmarkSuite', 'StubLLMServer', 'synthetic_audio', 'synthetic_transcript',
+           'write_audio_fixture', 'compare_results', 'load_results', 'save_results']
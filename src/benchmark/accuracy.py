@@ -0,0 +1,61 @@
+"""
+Transcript accuracy measures for benchmarks.
+"""
+import os
+import re
+
+_WORD = re.compile(r"[\w']+")
+
+
+def normalize_words(text):
+    """
+    Lowercase words without punctuation, so only wording differences count.
+
+    Returns:
+        list: Words
+    """
+    return _WORD.findall(text.lower())
+
+
+def word_error_rate(reference, hypothesis):
+    """
+    Word error rate: word-level edit distance divided by the reference length.
+
+    Args:
+        reference (str): Correct transcript
+        hypothesis (str): Transcript to score
+
+    Returns:
+        float: 0.0 for a perfect match; can exceed 1.0 with many insertions
+    """
+    ref = normalize_words(reference)
+    hyp = normalize_words(hypothesis)
+    if not ref:
+        return 0.0 if not hyp else 1.0
+
+    # One row of the Levenshtein table at a time
+    previous = list(range(len(hyp) + 1))
+    for i, word in enumerate(ref, 1):
+        current = [i] + [0] * len(hyp)
+        for j, other in enumerate(hyp, 1):
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (word != other))
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def load_reference_set(directory):
+    """
+    Find recordings with a reference transcript next to them ("name.wav" + "name.txt").
+
+    Returns:
+        list: (audio path, reference text) pairs, sorted by path
+    """
+    from src.pipeline.batch import find_audio_files
+
+    pairs = []
+    for path in find_audio_files(directory, recursive=True):
+        reference_path = os.path.splitext(path)[0] + ".txt"
+        if os.path.exists(reference_path):
+            with open(reference_path, "r", encoding="utf-8") as f:
+                pairs.append((path, f.read()))
+    return pairs
@@ -0,0 +1,193 @@
+"""
+Synthetic benchmark fixtures, generated offline and deterministically.
+
+Audio fixtures are 16 kHz mono signals of a given length: silence, tones,
+noise, a speech-like signal (voiced syllables with formant-shaped harmonics,
+a syllable-rate envelope and pauses between utterances) and a "meeting" mix
+of all of them. They exercise decoding, VAD and Whisper's decode loop with
+realistic durations without shipping recordings or a TTS engine. Transcript
+fixtures are meeting-like text of a given word count, with the fillers,
+stutters and action items real transcripts contain.
+"""
+import os
+
+import numpy as np
+
+from src.transcription.audio import SAMPLE_RATE
+
+AUDIO_KINDS = ("silence", "tone", "noise", "speech", "meeting")
+
+# (F1, F2, F3) in Hz of a few vowels
+_VOWEL_FORMANTS = np.array([
+    (730, 1090, 2440),  # a
+    (270, 2290, 3010),  # i
+    (300, 870, 2240),   # u
+    (530, 1840, 2480),  # e
+    (570, 840, 2410),   # o
+])
+
+_NAMES = ("Alice", "Bob", "Carol", "David", "Erin", "Frank", "Grace", "Heidi")
+_TOPICS = ("the Q3 roadmap", "the billing migration", "hiring for the platform team", "the customer escalation",
+           "the release checklist", "the marketing launch", "the on-call rotation", "the data retention policy",
+           "the mobile onboarding flow", "the vendor contract", "the budget review", "the security audit")
+_SENTENCES = (
+    "So the next item is {topic}.",
+    "I think we should look at {topic} before the end of the month.",
+    "{name} mentioned that {topic} is behind schedule by about {number} days.",
+    "We agreed to go ahead with the proposal for {topic}.",
+    "{name} will follow up on {topic} by Friday.",
+    "Um, I'm not sure the numbers for {topic} are final yet.",
+    "The main risk with {topic} is that we depend on another team.",
+    "Can we get an update on {topic} next week?",
+    "We decided to postpone {topic} until we have more data.",
+    "{name} needs to send the summary of {topic} to the group.",
+    "Uh, I I think that's, that's basically where we are with {topic}.",
+    "Yeah, okay, that makes sense.",
+    "Let's move on.",
+    "The estimate for {topic} went from {number} to {number2} hours.",
+    "{name} is responsible for {topic} going forward.",
+)
+
+
+def synthetic_audio(seconds, kind="meeting", seed=0, sr=SAMPLE_RATE):
+    """
+    Generate a synthetic recording.
+
+    Args:
+        seconds (float): Length of the recording
+        kind (str): One of AUDIO_KINDS
+        seed (int): Random seed; the same arguments always give the same samples
+        sr (int): Sample rate
+
+    Returns:
+        np.ndarray: float32 samples in [-1, 1]
+    """
+    if kind not in AUDIO_KINDS:
+        raise ValueError(f"Unknown fixture kind {kind!r}; choose from {', '.join(AUDIO_KINDS)}")
+    rng = np.random.default_rng(seed)
+    n = int(seconds * sr)
+
+    if kind == "silence":
+        audio = _noise(rng, n, 0.0005)
+    elif kind == "tone":
+        audio = _tones(rng, n, sr) + _noise(rng, n, 0.002)
+    elif kind == "noise":
+        audio = _noise(rng, n, 0.1)
+    elif kind == "speech":
+        audio = _speech_like(rng, n, sr) + _noise(rng, n, 0.003)
+    else:
+        # Mostly speech, with stretches of silence, a notification tone and noise bursts
+        audio = _speech_like(rng, n, sr) + _noise(rng, n, 0.003)
+        segment = sr * 10
+        for start in range(0, n, segment):
+            end = min(start + segment, n)
+            roll = rng.random()
+            if roll < 0.1:
+                audio[start:end] = _noise(rng, end - start, 0.0005)
+            elif roll < 0.15:
+                audio[start:end] += _tones(rng, end - start, sr) * 0.5
+            elif roll < 0.2:
+                audio[start:end] += _noise(rng, end - start, 0.05)
+    return np.clip(audio, -1.0, 1.0).astype(np.float32)
+
+
+def write_audio_fixture(path, seconds, kind="meeting", seed=0):
+    """
+    Write a synthetic recording as a 16 kHz mono 16-bit WAV file.
+
+    Existing files are reused, so fixtures are only generated once per directory.
+
+    Returns:
+        str: The path
+    """
+    if os.path.exists(path):
+        return path
+    import wave
+
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    pcm = (synthetic_audio(seconds, kind, seed) * 32767).astype("<i2")
+    tmp_path = f"{path}.tmp"
+    with wave.open(tmp_path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(pcm.tobytes())
+    os.replace(tmp_path, path)
+    return path
+
+
+def synthetic_transcript(words, seed=0):
+    """
+    Generate a meeting-like transcript.
+
+    Args:
+        words (int): Approximate number of words
+        seed (int): Random seed
+
+    Returns:
+        str: Transcript text, one utterance per line
+    """
+    rng = np.random.default_rng(seed)
+    lines = []
+    count = 0
+    while count < words:
+        sentence = _SENTENCES[rng.integers(len(_SENTENCES))].format(
+            name=_NAMES[rng.integers(len(_NAMES))],
+            topic=_TOPICS[rng.integers(len(_TOPICS))],
+            number=int(rng.integers(2, 40)),
+            number2=int(rng.integers(40, 120)),
+        )
+        if rng.random() < 0.02:
+            # Whisper's repetition loops on noisy audio
+            sentence = " ".join([sentence] * int(rng.integers(3, 8)))
+        lines.append(sentence)
+        count += len(sentence.split())
+    return "\n".join(lines)
+
+
+def _noise(rng, n, level):
+    """White noise at an RMS level."""
+    return (rng.standard_normal(n) * level).astype(np.float32)
+
+
+def _tones(rng, n, sr):
+    """A few steady sine tones."""
+    t = np.arange(n) / sr
+    audio = np.zeros(n, dtype=np.float32)
+    for frequency in rng.choice([440.0, 660.0, 880.0, 1000.0], size=2, replace=False):
+        audio += (0.1 * np.sin(2 * np.pi * frequency * t)).astype(np.float32)
+    return audio
+
+
+def _speech_like(rng, n, sr):
+    """
+    Voiced syllables of a talker, grouped into utterances separated by pauses.
+
+    Each syllable is a harmonic series of a gliding fundamental, weighted by
+    the formants of a random vowel and shaped by a Hann envelope.
+    """
+    audio = np.zeros(n, dtype=np.float32)
+    base_f0 = rng.uniform(95, 220)
+    position = int(rng.uniform(0.1, 0.5) * sr)
+    while position < n:
+        for _ in range(int(rng.integers(3, 13))):
+            length = min(int(rng.uniform(0.12, 0.3) * sr), n - position)
+            if length <= 0:
+                break
+            t = np.arange(length) / sr
+            glide = rng.uniform(-0.1, 0.1)
+            f0 = base_f0 * rng.uniform(0.85, 1.15) * (1 + glide * t / max(t[-1], 1e-6))
+            phase = 2 * np.pi * np.cumsum(f0) / sr
+            harmonics = np.arange(1, int(4000 // (base_f0 * 1.15)) + 1)
+            formants = _VOWEL_FORMANTS[rng.integers(len(_VOWEL_FORMANTS))]
+            frequencies = harmonics * base_f0
+            weights = np.exp(-((frequencies[:, None] - formants[None, :]) / 120.0) ** 2).sum(axis=1) / harmonics
+            syllable = weights @ np.sin(np.outer(harmonics, phase))
+            syllable *= np.hanning(length) * rng.uniform(0.1, 0.3) / max(np.abs(syllable).max(), 1e-6)
+            audio[position:position + length] += syllable.astype(np.float32)
+            position += length + int(rng.uniform(0.0, 0.05) * sr)
+        # Pause between utterances
+        position += int(rng.uniform(0.2, 1.2) * sr)
+    return audio
@@ -0,0 +1,428 @@
+"""
+End-to-end benchmarks of transcription, summarization and the batch pipeline.
+
+Every scenario runs on synthetic fixtures (see fixtures.py) with the
+transcript and summary caches disabled, and summarization talks to a local
+StubLLMServer, so results only depend on the code, the model and the
+machine. The quantization scenario compares fp32 and int8 Whisper on CPU
+per model size against a set of recordings with reference transcripts, and
+fails if int8 loses more accuracy than allowed. Results are
+plain JSON: latency percentiles, real-time factor (processing seconds per
+audio second, lower is better), throughput and peak RSS per scenario, plus
+enough environment details to tell runs apart. compare_results() lines up
+two result files.
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import platform
+import subprocess
+from datetime import datetime
+
+import numpy as np
+
+from config import TORCH_INTRA_OP_THREADS, TORCH_INTER_OP_THREADS
+from src.benchmark.accuracy import load_reference_set, word_error_rate
+from src.benchmark.fixtures import synthetic_transcript, write_audio_fixture
+from src.benchmark.stub_llm import StubLLMServer
+from src.utils.disk_cache import DiskCache
+from src.utils.memory import current_rss_bytes, peak_rss_bytes
+
+SCENARIOS = ("transcribe", "summarize", "summarize_offline", "pipeline", "quantization")
+# Run by default; quantization loads every model size twice, so it is asked for explicitly
+DEFAULT_SCENARIOS = ("transcribe", "summarize", "summarize_offline", "pipeline")
+
+# Metrics compared between runs and whether a higher value is better
+_COMPARED = {"p50_seconds": False, "p95_seconds": False, "rtf_p50": False, "rtf_p95": False,
+             "ttft_p50_seconds": False, "throughput": True, "peak_rss_bytes": False,
+             "model_memory_bytes": False}
+
+
+def latency_stats(samples):
+    """
+    Summarize latency samples.
+
+    Returns:
+        dict: count, mean, min, p50, p95 and max in seconds
+    """
+    values = np.asarray(samples, dtype=np.float64)
+    if values.size == 0:
+        return {"count": 0}
+    return {
+        "count": int(values.size),
+        "mean_seconds": float(values.mean()),
+        "min_seconds": float(values.min()),
+        "p50_seconds": float(np.percentile(values, 50)),
+        "p95_seconds": float(np.percentile(values, 95)),
+        "max_seconds": float(values.max()),
+    }
+
+
+def environment_info():
+    """
+    Describe the machine and code a run was made with.
+
+    Returns:
+        dict: Python and platform versions, CPU count, git commit and torch settings
+    """
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+    }
+    try:
+        info["git_commit"] = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        info["git_commit"] = None
+    if "torch" in sys.modules:
+        torch = sys.modules["torch"]
+        info["torch"] = torch.__version__
+        info["torch_threads"] = torch.get_num_threads()
+        info["cuda"] = torch.cuda.is_available()
+    return info
+
+
+class BenchmarkSuite:
+    """
+    Run benchmark scenarios and collect their results.
+    """
+
+    def __init__(self, work_dir, durations=(30, 300), model_size="tiny", repeats=3,
+                 transcript_words=(2000, 20000), audio_kind="meeting", llm_latency=0.05,
+                 llm_tokens_per_second=200.0, seed=0, model_sizes=None, reference_dir=None,
+                 max_wer_increase=0.02):
+        """
+        Initialize the suite.
+
+        Args:
+            work_dir (str): Directory for fixtures and scratch output (fixtures are reused)
+            durations (tuple): Audio fixture lengths in seconds
+            model_size (str): Whisper model size
+            repeats (int): Measurements per fixture
+            transcript_words (tuple): Transcript fixture lengths in words
+            audio_kind (str): Kind of audio fixture, see fixtures.AUDIO_KINDS
+            llm_latency (float): Stub LLM time to first token
+            llm_tokens_per_second (float): Stub LLM generation rate
+            seed (int): Fixture random seed
+            model_sizes (tuple): Sizes compared by the quantization scenario, default model_size
+            reference_dir (str): Recordings with reference transcripts ("x.wav" + "x.txt"),
+                                 required by the quantization scenario
+            max_wer_increase (float): Largest int8 word error rate increase that passes
+        """
+        self.work_dir = work_dir
+        self.durations = tuple(durations)
+        self.model_size = model_size
+        self.repeats = max(1, repeats)
+        self.transcript_words = tuple(transcript_words)
+        self.audio_kind = audio_kind
+        self.llm_latency = llm_latency
+        self.llm_tokens_per_second = llm_tokens_per_second
+        self.seed = seed
+        self.model_sizes = tuple(model_sizes or (model_size,))
+        self.reference_dir = reference_dir
+        self.max_wer_increase = max_wer_increase
+        self._transcriber = None
+
+    def run(self, scenarios=DEFAULT_SCENARIOS):
+        """
+        Run scenarios in order. A scenario that fails is recorded with its error
+        and the others still run.
+
+        Returns:
+            dict: "created_at", "environment", "settings" and per-scenario "results"
+        """
+        results = {}
+        for name in scenarios:
+            if name not in SCENARIOS:
+                raise ValueError(f"Unknown scenario {name!r}; choose from {', '.join(SCENARIOS)}")
+            print(f"[bench] {name}...")
+            rss_before = current_rss_bytes()
+            start = time.perf_counter()
+            try:
+                result = getattr(self, f"_bench_{name}")()
+            except Exception as e:
+                print(f"[bench] {name} failed: {str(e)}")
+                result = {"error": f"{type(e).__name__}: {str(e)}"}
+            result["wall_seconds"] = time.perf_counter() - start
+            # Peak RSS is process-wide, so scenarios are best compared in the order they ran
+            result["peak_rss_bytes"] = peak_rss_bytes()
+            result["rss_growth_bytes"] = current_rss_bytes() - rss_before
+            results[name] = result
+
+        return {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "environment": environment_info(),
+            "settings": {
+                "durations": list(self.durations), "model_size": self.model_size, "repeats": self.repeats,
+                "transcript_words": list(self.transcript_words), "audio_kind": self.audio_kind,
+                "llm_latency": self.llm_latency, "llm_tokens_per_second": self.llm_tokens_per_second,
+                "seed": self.seed, "model_sizes": list(self.model_sizes), "reference_dir": self.reference_dir,
+            },
+            "results": results,
+        }
+
+    def audio_fixtures(self):
+        """
+        Create (once) the audio fixtures.
+
+        Returns:
+            list: (seconds, path) per duration
+        """
+        directory = os.path.join(self.work_dir, "fixtures")
+        return [(seconds, write_audio_fixture(
+                    os.path.join(directory, f"{self.audio_kind}_{seconds}s_seed{self.seed}.wav"),
+                    seconds, self.audio_kind, self.seed))
+                for seconds in self.durations]
+
+    def _get_transcriber(self):
+        """Load the Whisper model once, without the transcript cache; returns (transcriber, load seconds)."""
+        if self._transcriber is None:
+            from src.transcription.whisper_transcriber import WhisperTranscriber
+
+            start = time.perf_counter()
+            transcriber = WhisperTranscriber(model_size=self.model_size,
+                                             cache=DiskCache(os.path.join(self.work_dir, "cache"), 0))
+            self._transcriber = (transcriber, time.perf_counter() - start)
+        return self._transcriber
+
+    def _bench_transcribe(self):
+        """WhisperTranscriber.transcribe_result on each audio fixture."""
+        fixtures = self.audio_fixtures()
+        transcriber, load_seconds = self._get_transcriber()
+        result = {"model_size": self.model_size, "model_load_seconds": load_seconds, "fixtures": {}}
+        all_rtf, audio_total, busy_total = [], 0.0, 0.0
+        for seconds, path in fixtures:
+            samples = []
+            for _ in range(self.repeats):
+                start = time.perf_counter()
+                transcriber.transcribe_result(path)
+                samples.append(time.perf_counter() - start)
+            rtf = [sample / seconds for sample in samples]
+            all_rtf += rtf
+            audio_total += seconds * len(samples)
+            busy_total += sum(samples)
+            result["fixtures"][f"{seconds}s"] = dict(latency_stats(samples), audio_seconds=seconds,
+                                                     rtf_p50=float(np.percentile(rtf, 50)),
+                                                     rtf_p95=float(np.percentile(rtf, 95)))
+        result["rtf_p50"] = float(np.percentile(all_rtf, 50))
+        result["rtf_p95"] = float(np.percentile(all_rtf, 95))
+        # Audio seconds transcribed per wall-clock second
+        result["throughput"] = audio_total / busy_total if busy_total else 0.0
+        return result
+
+    def _bench_summarize(self):
+        """MeetingSummarizer against the stub LLM: blocking and streamed."""
+        from src.summarization.llm_client import AsyncLLMClient
+        from src.summarization.llm_summarizer import MeetingSummarizer
+
+        with StubLLMServer(self.llm_latency, self.llm_tokens_per_second) as server:
+            client = AsyncLLMClient(server.base_url, api_key="benchmark")
+            try:
+                summarizer = MeetingSummarizer(client, cache=DiskCache(os.path.join(self.work_dir, "cache"), 0))
+                result = self._summarize_fixtures(summarizer, stream=True)
+            finally:
+                client.close()
+            result["llm_requests"] = server.requests
+            result["llm_prompt_tokens"] = server.prompt_chars // 4
+            result["client"] = dict(client.stats)
+        return result
+
+    def _bench_summarize_offline(self):
+        """The offline extractive summarizer."""
+        from src.summarization.llm_summarizer import MeetingSummarizer
+
+        summarizer = MeetingSummarizer(None, cache=DiskCache(os.path.join(self.work_dir, "cache"), 0))
+        return self._summarize_fixtures(summarizer, stream=False)
+
+    def _summarize_fixtures(self, summarizer, stream):
+        """Time generate_summary (and stream_summary) on each transcript fixture."""
+        from src.summarization.chunking import count_tokens
+
+        result = {"fixtures": {}}
+        tokens_total, busy_total = 0, 0.0
+        for words in self.transcript_words:
+            transcript = synthetic_transcript(words, self.seed)
+            tokens = count_tokens(transcript)
+            samples, ttft = [], []
+            for _ in range(self.repeats):
+                stats = {}
+                start = time.perf_counter()
+                summary = summarizer.generate_summary(transcript, use_cache=False, stats=stats)
+                samples.append(time.perf_counter() - start)
+                if summary.startswith("Error"):
+                    raise RuntimeError(summary.splitlines()[0])
+                if stream:
+                    stream_stats = {}
+                    for _ in summarizer.stream_summary(transcript, use_cache=False, stats=stream_stats):
+                        pass
+                    ttft.append(stream_stats["ttft_seconds"])
+            tokens_total += tokens * len(samples)
+            busy_total += sum(samples)
+            fixture = dict(latency_stats(samples), transcript_tokens=tokens,
+                           compacted_tokens=stats.get("compaction", {}).get("compacted_tokens"))
+            if ttft:
+                fixture["ttft_p50_seconds"] = float(np.percentile(ttft, 50))
+                fixture["ttft_p95_seconds"] = float(np.percentile(ttft, 95))
+            result["fixtures"][f"{words}w"] = fixture
+        # Transcript tokens summarized per wall-clock second
+        result["throughput"] = tokens_total / busy_total if busy_total else 0.0
+        return result
+
+    def _bench_pipeline(self):
+        """BatchPipeline over all audio fixtures, with summaries from the stub LLM."""
+        from src.pipeline.batch import BatchPipeline
+        from src.summarization.llm_client import AsyncLLMClient
+        from src.summarization.llm_summarizer import MeetingSummarizer
+
+        paths = [path for _, path in self.audio_fixtures()]
+        transcriber, _ = self._get_transcriber()
+        samples, throughput = [], []
+        with StubLLMServer(self.llm_latency, self.llm_tokens_per_second) as server:
+            client = AsyncLLMClient(server.base_url, api_key="benchmark")
+            try:
+                summarizer = MeetingSummarizer(client, cache=DiskCache(os.path.join(self.work_dir, "cache"), 0))
+                for repeat in range(self.repeats):
+                    output_dir = os.path.join(self.work_dir, "pipeline_output")
+                    shutil.rmtree(output_dir, ignore_errors=True)
+                    stats = BatchPipeline(transcriber, summarizer, output_dir).run(paths)
+                    if stats["failed"]:
+                        raise RuntimeError(f"{stats['failed']} of {stats['files']} files failed")
+                    samples.append(stats["wall_seconds"])
+                    throughput.append(stats["throughput"])
+            finally:
+                client.close()
+        audio_seconds = float(sum(self.durations))
+        return dict(latency_stats(samples), files=len(paths), audio_seconds=audio_seconds,
+                    rtf_p50=float(np.percentile(samples, 50)) / audio_seconds,
+                    throughput=float(np.mean(throughput)))
+
+    def _bench_quantization(self):
+        """fp32 vs int8 Whisper on CPU per model size: RTF, model memory and word error rate drift."""
+        # Synthetic fixtures have no words to get right, so drift could not be checked on them
+        if not self.reference_dir:
+            raise ValueError("The quantization scenario needs reference_dir (recordings with .txt transcripts)")
+        samples = load_reference_set(self.reference_dir)
+        if not samples:
+            raise RuntimeError(f"No recordings with .txt references in {self.reference_dir}")
+
+        from src.transcription.quantization import configure_torch_threads
+
+        # The same thread pools as production, so the RTFs are the ones users get
+        configure_torch_threads(TORCH_INTRA_OP_THREADS, TORCH_INTER_OP_THREADS)
+        result = {"reference_set": self.reference_dir, "files": len(samples),
+                  "torch_threads": {"intra_op": TORCH_INTRA_OP_THREADS, "inter_op": TORCH_INTER_OP_THREADS},
+                  "fixtures": {}, "models": {}}
+        for model_size in self.model_sizes:
+            texts = {}
+            for precision in ("fp32", "int8"):
+                run, texts[precision] = self._transcribe_on_cpu(model_size, precision == "int8", samples)
+                result["fixtures"][f"{model_size} {precision}"] = run
+
+            fp32, int8 = result["fixtures"][f"{model_size} fp32"], result["fixtures"][f"{model_size} int8"]
+            comparison = {
+                "rtf_speedup": fp32["rtf_p50"] / int8["rtf_p50"] if int8["rtf_p50"] else 0.0,
+                "model_memory_ratio": int8["model_memory_bytes"] / fp32["model_memory_bytes"],
+                # How far int8 transcripts are from fp32 ones, as a word error rate
+                "agreement_wer": float(np.mean([word_error_rate(a, b)
+                                                for a, b in zip(texts["fp32"], texts["int8"])])),
+            }
+            for precision in ("fp32", "int8"):
+                comparison[f"{precision}_wer"] = float(np.mean(
+                    [word_error_rate(reference, text) for (_, reference), text in zip(samples, texts[precision])]))
+            comparison["wer_increase"] = comparison["int8_wer"] - comparison["fp32_wer"]
+            comparison["drift_ok"] = comparison["wer_increase"] <= self.max_wer_increase
+            result["models"][model_size] = comparison
+        result["drift_ok"] = all(comparison["drift_ok"] for comparison in result["models"].values())
+        return result
+
+    def _transcribe_on_cpu(self, model_size, quantize, samples):
+        """Load one model in a private CPU registry and transcribe every sample with it."""
+        from src.transcription.model_registry import ModelRegistry
+        from src.transcription.whisper_transcriber import WhisperTranscriber
+
+        registry = ModelRegistry(memory_budget_mb=0, device="cpu", quantize=quantize)
+        rss_before = current_rss_bytes()
+        start = time.perf_counter()
+        transcriber = WhisperTranscriber(model_size, registry=registry, parallel_workers=0, batching=False,
+                                         cache=DiskCache(os.path.join(self.work_dir, "cache"), 0))
+        load_seconds = time.perf_counter() - start
+        rss_growth = current_rss_bytes() - rss_before
+        try:
+            latencies, rtf, texts = [], [], []
+            for path, _ in samples:
+                for _ in range(self.repeats):
+                    transcribed = transcriber.transcribe_result(path)
+                    latencies.append(transcribed["transcribe_seconds"])
+                    rtf.append(transcribed["transcribe_seconds"] / max(transcribed["audio_seconds"], 1e-6))
+                texts.append(transcribed["text"])
+            run = dict(latency_stats(latencies), load_seconds=load_seconds,
+                       model_memory_bytes=registry.stats()["memory_used_bytes"], rss_growth_bytes=rss_growth,
+                       rtf_p50=float(np.percentile(rtf, 50)), rtf_p95=float(np.percentile(rtf, 95)))
+            return run, texts
+        finally:
+            registry.evict(model_size)
+
+
+def save_results(results, path):
+    """Write benchmark results as indented JSON."""
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+
+
+def load_results(path):
+    """Read benchmark results written by save_results()."""
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def compare_results(baseline, current):
+    """
+    Compare two runs metric by metric.
+
+    Returns:
+        list: Lines "scenario metric: baseline -> current (+x.x%, better/worse)"
+    """
+    lines = []
+    for name, result in current["results"].items():
+        before = baseline.get("results", {}).get(name)
+        if not before or "error" in before or "error" in result:
+            continue
+        for metric, key, old, new in _comparable(name, before, result):
+            if not old:
+                continue
+            change = (new - old) / old
+            higher_is_better = _COMPARED[key]
+            verdict = "better" if (change > 0) == higher_is_better else "worse"
+            if abs(change) < 0.02:
+                verdict = "same"
+            lines.append(f"{metric}: {_format(key, old)} -> {_format(key, new)} ({change:+.1%}, {verdict})")
+    return lines
+
+
+def _comparable(name, before, after):
+    """Yield (label, key, baseline, current) for metrics present in both results."""
+    for key in _COMPARED:
+        if key in before and key in after:
+            yield f"{name} {key}", key, before[key], after[key]
+    for fixture, values in after.get("fixtures", {}).items():
+        old_values = before.get("fixtures", {}).get(fixture, {})
+        for key in _COMPARED:
+            if key in values and key in old_values:
+                yield f"{name} {fixture} {key}", key, old_values[key], values[key]
+
+
+def _format(key, value):
+    """Render a metric value for compare_results()."""
+    if key.endswith("_bytes"):
+        return f"{value / (1024 * 1024):.1f} MB"
+    if key.endswith("_seconds"):
+        return f"{value:.3f}s"
+    return f"{value:.3f}"
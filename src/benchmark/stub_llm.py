@@ -0,0 +1,150 @@
+"""
+A local OpenAI-compatible chat completions server for benchmarks.
+
+Answers POST /chat/completions (and /v1/chat/completions) with a canned
+summary after a configurable latency, either as one JSON response or as
+server-sent events paced at a fixed token rate. Summarization can then be
+benchmarked end to end, including HTTP and streaming, without network
+access, API keys or provider variance.
+"""
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_REPLY = """1. Meeting topic: project status review
+2. Key discussion points:
+- Progress on the current milestones and the risks that remain
+- Dependencies on other teams and the timeline they imply
+3. Decisions made:
+- Proceed with the agreed proposal and revisit the estimate next week
+4. Action items:
+- Send the summary to the group by Friday
+5. Next steps:
+- Review the updated numbers at the next meeting"""
+
+
+class StubLLMServer:
+    """
+    Serve canned chat completions on localhost from a background thread.
+
+    Use as a context manager; base_url is what AsyncLLMClient expects.
+    """
+
+    def __init__(self, latency=0.05, tokens_per_second=200.0, reply=_REPLY, port=0):
+        """
+        Initialize the server (it starts on start() or on entering the context).
+
+        Args:
+            latency (float): Seconds before the first token
+            tokens_per_second (float): Streaming rate; non-streamed replies wait as long in total
+            reply (str): Completion text
+            port (int): Port to listen on, 0 for any free port
+        """
+        self.latency = latency
+        self.tokens_per_second = tokens_per_second
+        self.reply = reply
+        self.port = port
+        self.requests = 0
+        self.prompt_chars = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        """str: API root of the running server."""
+        return f"http://127.0.0.1:{self._server.server_address[1]}/v1"
+
+    def start(self):
+        """Start serving in a daemon thread."""
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self):
+                if not self.path.rstrip("/").endswith("/chat/completions"):
+                    self.send_error(404)
+                    return
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                stub._record(body)
+                if body.get("stream"):
+                    stub._stream(self)
+                else:
+                    stub._complete(self)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", self.port), Handler)
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(target=self._server.serve_forever, name="stub-llm", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop the server."""
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    def _record(self, body):
+        """Count a request and its prompt size."""
+        with self._lock:
+            self.requests += 1
+            self.prompt_chars += sum(len(m.get("content") or "") for m in body.get("messages", []))
+
+    def _tokens(self):
+        """The reply split into word-sized streaming tokens."""
+        words = self.reply.split(" ")
+        return [word if i == 0 else f" {word}" for i, word in enumerate(words)]
+
+    def _complete(self, handler):
+        """Answer with a single JSON response."""
+        time.sleep(self.latency + len(self._tokens()) / self.tokens_per_second)
+        data = json.dumps({
+            "object": "chat.completion",
+            "choices": [{"index": 0, "message": {"role": "assistant", "content": self.reply},
+                         "finish_reason": "stop"}],
+        }).encode("utf-8")
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def _stream(self, handler):
+        """
+        Answer with server-sent events, one token per event.
+
+        The sequence matches OpenAI-compatible servers: a role-only first
+        chunk, the content chunks, an empty delta with finish_reason, [DONE].
+        """
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Connection", "close")
+        handler.end_headers()
+
+        def send(delta, finish_reason=None):
+            chunk = {"object": "chat.completion.chunk",
+                     "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}]}
+            handler.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+            handler.wfile.flush()
+
+        time.sleep(self.latency)
+        send({"role": "assistant", "content": ""})
+        for token in self._tokens():
+            send({"content": token})
+            time.sleep(1.0 / self.tokens_per_second)
+        send({}, "stop")
+        handler.wfile.write(b"data: [DONE]\n\n")
+        handler.wfile.flush()
+        handler.close_connection = True
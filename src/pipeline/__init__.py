@@ -0,0 +1,5 @@
+"""Headless processing pipelines for AI-Wizard."""
+
+from src.pipeline.batch import BatchPipeline, find_audio_files
+
+__all__ = ['BatchPipeline', 'find_audio_files']
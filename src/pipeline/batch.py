@@ -0,0 +1,310 @@
+"""
+Batch processing of a directory of recordings.
+
+Decoding, Whisper transcription and LLM summarization run as overlapping
+stages connected by bounded queues: while one file is being transcribed
+the next ones are decoded and earlier transcripts are summarized, so the
+CPU, the model and the LLM endpoint stay busy at the same time.
+"""
+import os
+import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from src.transcription.segments import SegmentTable
+from src.utils.metrics import span
+
+AUDIO_EXTENSIONS = (".wav", ".mp3", ".m4a", ".flac", ".ogg", ".opus", ".webm", ".mp4", ".aac", ".wma")
+
+# Marks the end of a stage's input
+_DONE = object()
+
+
+def find_audio_files(directory, recursive=False):
+    """
+    List the audio files in a directory.
+
+    Args:
+        directory (str): Directory to scan
+        recursive (bool): Include subdirectories
+
+    Returns:
+        list: Sorted file paths
+    """
+    paths = []
+    for root, dirs, files in os.walk(directory):
+        paths.extend(os.path.join(root, name) for name in files
+                     if name.lower().endswith(AUDIO_EXTENSIONS))
+        if not recursive:
+            break
+    return sorted(paths)
+
+
+class BatchPipeline:
+    """
+    Stream recordings through decode -> transcribe -> summarize stages.
+    """
+
+    def __init__(self, transcriber, summarizer, output_dir, model_size=None,
+                 decode_workers=2, summary_workers=4, queue_size=4, archive=None, audio_archive=None,
+                 input_dir=None):
+        """
+        Initialize the pipeline.
+
+        Args:
+            transcriber (WhisperTranscriber): Transcriber for the Whisper stage
+            summarizer (MeetingSummarizer): Summarizer for the LLM stage, or None to skip it
+            output_dir (str): Where transcripts and summaries are written
+            model_size (str): Whisper model size; defaults to the transcriber's
+            decode_workers (int): Files decoded concurrently
+            summary_workers (int): Concurrent LLM requests
+            queue_size (int): Capacity of each queue between stages
+            archive (MeetingArchive): Also store results here, one meeting per file
+            audio_archive (AudioArchive): Also keep a compressed copy of each decoded recording
+            input_dir (str): Directory output names are made relative to; defaults
+                             to the deepest directory holding all recordings of a run
+        """
+        self.transcriber = transcriber
+        self.summarizer = summarizer
+        self.output_dir = output_dir
+        self.model_size = model_size
+        self.decode_workers = decode_workers
+        self.summary_workers = summary_workers
+        self.queue_size = queue_size
+        self.archive = archive
+        self.audio_archive = audio_archive
+        self.input_dir = input_dir
+        self.stats = {}
+        self._root = input_dir
+        self._audio_hashes = {}
+        self._lock = threading.Lock()
+
+    def output_paths(self, audio_path):
+        """
+        Get the transcript and summary paths for a recording.
+
+        Returns:
+            tuple: (transcript_path, summary_path)
+        """
+        stem = self.meeting_id(audio_path)
+        return (os.path.join(self.output_dir, f"{stem}_transcript.txt"),
+                os.path.join(self.output_dir, f"{stem}_summary.txt"))
+
+    def segments_path(self, audio_path):
+        """
+        Get the segment table path for a recording (see SegmentTable.load()).
+        """
+        return os.path.join(self.output_dir, f"{self.meeting_id(audio_path)}_segments.seg")
+
+    def meeting_id(self, audio_path):
+        """
+        Archive identifier of a recording (matches its output file names).
+
+        The path relative to the input directory, extension included and
+        directories joined with "__": "a/standup.wav" and "b/standup.wav", or
+        "x.wav" and "x.mp3", never share outputs.
+        """
+        path = os.path.abspath(audio_path)
+        if self._root is not None:
+            relative = os.path.relpath(path, os.path.abspath(self._root))
+            if not relative.startswith(os.pardir):
+                return "__".join(relative.split(os.sep))
+        return os.path.basename(path)
+
+    def run(self, audio_paths):
+        """
+        Process recordings, skipping work whose outputs already exist.
+
+        Args:
+            audio_paths (list): Audio files to process
+
+        Returns:
+            dict: Counts, audio seconds, wall-clock seconds and throughput
+        """
+        os.makedirs(self.output_dir, exist_ok=True)
+        if self.input_dir is None and audio_paths:
+            self._root = os.path.commonpath([os.path.dirname(os.path.abspath(path)) for path in audio_paths])
+        self.stats = {"files": len(audio_paths), "transcribed": 0, "summarized": 0,
+                      "skipped": 0, "failed": 0, "no_speech": 0, "audio_seconds": 0.0}
+        start = time.time()
+
+        decoded = queue.Queue(maxsize=self.queue_size)
+        transcripts = queue.Queue(maxsize=self.queue_size)
+
+        to_decode = []
+        for path in audio_paths:
+            transcript_path, summary_path = self.output_paths(path)
+            if not self._transcribed(path):
+                to_decode.append((path, None))
+                continue
+            if self.summarizer is None or _has_output(summary_path):
+                self._count("skipped")
+                continue
+            # Transcript from an earlier run; only the summary is missing
+            with open(transcript_path, "r", encoding="utf-8") as f:
+                transcript = f.read()
+            if transcript.strip():
+                to_decode.append((path, transcript))
+            else:
+                # No speech: there is nothing to summarize
+                self._count("skipped")
+
+        stages = [
+            threading.Thread(target=self._decode_stage, args=(to_decode, decoded), name="batch-decode"),
+            threading.Thread(target=self._transcribe_stage, args=(decoded, transcripts), name="batch-transcribe"),
+            threading.Thread(target=self._summary_stage, args=(transcripts,), name="batch-summarize"),
+        ]
+        for stage in stages:
+            stage.start()
+        for stage in stages:
+            stage.join()
+
+        elapsed = time.time() - start
+        self.stats["wall_seconds"] = elapsed
+        self.stats["throughput"] = self.stats["audio_seconds"] / elapsed if elapsed else 0.0
+        return self.stats
+
+    def _decode_stage(self, items, decoded):
+        """Decode files on a small thread pool, keeping input order."""
+        from src.transcription.audio import load_audio, SAMPLE_RATE
+
+        def decode(item):
+            path, transcript = item
+            if transcript is not None:
+                return path, None, transcript
+            try:
+                with span("audio_load"):
+                    audio = load_audio(path)
+                if self.audio_archive is not None:
+                    # Encoding runs on the decode pool, off the transcription path
+                    with span("audio_archive"):
+                        audio_hash, _ = self.audio_archive.store_waveform(audio, os.path.getsize(path))
+                    with self._lock:
+                        self._audio_hashes[path] = audio_hash
+                return path, audio, None
+            except Exception as e:
+                print(f"[decode] {os.path.basename(path)}: {str(e)}")
+                self._count("failed")
+                return path, None, None
+
+        with ThreadPoolExecutor(max_workers=self.decode_workers, thread_name_prefix="batch-decoder") as pool:
+            # Submit a bounded window ahead so decoded audio does not pile up in memory
+            pending = []
+            for item in items:
+                pending.append(pool.submit(decode, item))
+                if len(pending) > self.decode_workers + self.queue_size:
+                    self._forward_decoded(pending.pop(0).result(), decoded, SAMPLE_RATE)
+            for future in pending:
+                self._forward_decoded(future.result(), decoded, SAMPLE_RATE)
+        decoded.put(_DONE)
+
+    def _forward_decoded(self, item, decoded, sample_rate):
+        """Pass a decoded file on to the transcription stage."""
+        path, audio, transcript = item
+        if audio is None and transcript is None:
+            return
+        if audio is not None:
+            print(f"[decode] {os.path.basename(path)}: {len(audio) / sample_rate:.1f}s")
+        decoded.put((path, audio, transcript))
+
+    def _transcribe_stage(self, decoded, transcripts):
+        """Run Whisper on one file at a time; the model is the bottleneck resource."""
+        from src.transcription.audio import SAMPLE_RATE
+
+        while True:
+            item = decoded.get()
+            if item is _DONE:
+                break
+            path, audio, transcript = item
+            if transcript is None:
+                name = os.path.basename(path)
+                try:
+                    start = time.time()
+                    result = self.transcriber.transcribe_waveform_result(audio, self.model_size)
+                    transcript = result["text"].strip()
+                    seconds = len(audio) / SAMPLE_RATE
+                    transcript_path, _ = self.output_paths(path)
+                    with span("file_save"):
+                        with open(transcript_path, "w", encoding="utf-8") as f:
+                            f.write(transcript)
+                        SegmentTable.from_result(result).save(self.segments_path(path))
+                    if self.archive is not None:
+                        self.archive.save_meeting(
+                            self.meeting_id(path), transcript=transcript, segments=result["segments"],
+                            title=name, source="batch",
+                            model_size=self.model_size or self.transcriber.model_size,
+                            audio_seconds=seconds, transcribe_seconds=time.time() - start,
+                            created_at=os.path.getmtime(path), audio_hash=self._audio_hashes.get(path),
+                        )
+                    with self._lock:
+                        self.stats["transcribed"] += 1
+                        self.stats["audio_seconds"] += seconds
+                    print(f"[transcribe] {name}: {seconds:.1f}s audio in {time.time() - start:.1f}s")
+                except Exception as e:
+                    print(f"[transcribe] {name}: {str(e)}")
+                    self._count("failed")
+                    continue
+            if not transcript.strip():
+                print(f"[transcribe] {os.path.basename(path)}: no speech, nothing to summarize")
+                self._count("no_speech")
+            elif self.summarizer is not None:
+                transcripts.put((path, transcript))
+        transcripts.put(_DONE)
+
+    def _summary_stage(self, transcripts):
+        """Send transcripts to the LLM with several requests in flight."""
+        def summarize(path, transcript):
+            name = os.path.basename(path)
+            try:
+                start = time.time()
+                # Leave out segments Whisper was unsure about when the table is there
+                segments_path = self.segments_path(path)
+                if os.path.exists(segments_path):
+                    transcript = SegmentTable.load(segments_path).confident().text.strip() or transcript
+                # Errors raise instead of returning a fallback, so a rerun retries the LLM
+                summary = self.summarizer.generate_summary(transcript, fallback=False)
+                _, summary_path = self.output_paths(path)
+                with span("file_save"), open(summary_path, "w", encoding="utf-8") as f:
+                    f.write(summary)
+                if self.archive is not None:
+                    self.archive.save_meeting(self.meeting_id(path), summary=summary, title=name,
+                                              summarize_seconds=time.time() - start,
+                                              created_at=os.path.getmtime(path))
+                self._count("summarized")
+                print(f"[summarize] {name}: {time.time() - start:.1f}s")
+            except Exception as e:
+                print(f"[summarize] {name}: {str(e)}")
+                self._count("failed")
+
+        with ThreadPoolExecutor(max_workers=self.summary_workers, thread_name_prefix="batch-summarizer") as pool:
+            in_flight = threading.BoundedSemaphore(self.summary_workers + self.queue_size)
+            while True:
+                item = transcripts.get()
+                if item is _DONE:
+                    break
+                # Back-pressure: stop pulling transcripts while the LLM is saturated
+                in_flight.acquire()
+                future = pool.submit(summarize, *item)
+                future.add_done_callback(lambda _: in_flight.release())
+
+    def _transcribed(self, audio_path):
+        """
+        Whether an earlier run transcribed a recording.
+
+        The segment table is written after the transcript, so it also marks
+        empty transcripts (recordings without speech) as done.
+        """
+        transcript_path, _ = self.output_paths(audio_path)
+        return _has_output(transcript_path) or (os.path.exists(transcript_path)
+                                                and os.path.exists(self.segments_path(audio_path)))
+
+    def _count(self, key):
+        """Increment a stats counter."""
+        with self._lock:
+            self.stats[key] += 1
+
+
+def _has_output(path):
+    """True if an output file exists and is not empty."""
+    return os.path.exists(path) and os.path.getsize(path) > 0
@@ -0,0 +1,6 @@
+"""Persistent storage for AI-Wizard meetings."""
+
+from src.storage.meeting_archive import MeetingArchive
+from src.storage.audio_archive import AudioArchive
+
+__all__ = ['MeetingArchive', 'AudioArchive']
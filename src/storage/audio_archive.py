@@ -0,0 +1,241 @@
+"""
+Content-addressed archive of meeting recordings.
+
+Every recording is decoded to 16 kHz mono, hashed over its PCM samples and
+stored once as FLAC (lossless) or Opus (speech-tuned, much smaller) under
+its hash. Uploading the same audio again, even in another lossless container,
+returns the existing object. A small SQLite index maps
+source file digests to objects, so byte-identical uploads are not decoded
+again, and keeps the sizes and timings reported by stats().
+"""
+import os
+import time
+import hashlib
+import sqlite3
+import subprocess
+import threading
+
+import numpy as np
+
+from src.transcription.audio import SAMPLE_RATE, load_audio, load_audio_ffmpeg, read_wav
+from src.transcription.whisper_patch import resolve_ffmpeg
+from src.utils.disk_cache import file_digest
+
+# Encoder arguments per codec; WAV is the fallback when ffmpeg is missing
+CODECS = {
+    "flac": ["-c:a", "flac", "-compression_level", "8"],
+    "opus": ["-c:a", "libopus", "-application", "voip"],
+}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    hash TEXT PRIMARY KEY,
+    codec TEXT NOT NULL,
+    seconds REAL NOT NULL,
+    source_bytes INTEGER NOT NULL,
+    stored_bytes INTEGER NOT NULL,
+    encode_seconds REAL NOT NULL,
+    created_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS sources (
+    digest TEXT PRIMARY KEY,
+    hash TEXT NOT NULL
+);
+"""
+
+
+class AudioArchive:
+    """
+    Stores each distinct recording once, compressed, under the hash of its audio.
+    """
+
+    def __init__(self, root, codec="flac", opus_bitrate="24k"):
+        """
+        Open (and create if needed) the archive.
+
+        Args:
+            root (str): Archive directory
+            codec (str): "flac" or "opus"
+            opus_bitrate (str): Opus target bitrate, e.g. "24k"
+        """
+        if codec not in CODECS:
+            raise ValueError(f"Unsupported codec {codec!r}; choose from {', '.join(CODECS)}")
+        self.root = str(root)
+        self.codec = codec
+        self.opus_bitrate = opus_bitrate
+        self.dedup_hits = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        os.makedirs(os.path.join(self.root, "objects"), exist_ok=True)
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+
+    def store(self, path):
+        """
+        Archive a recording.
+
+        Args:
+            path (str): Audio file in any format load_audio understands
+
+        Returns:
+            str: Hash identifying the stored audio
+        """
+        digest = file_digest(path)
+        conn = self._connect()
+        row = conn.execute("SELECT hash FROM sources WHERE digest = ?", (digest,)).fetchone()
+        if row is not None and self._object_path(row[0]) is not None:
+            self._count_dedup_hit()
+            return row[0]
+
+        audio = load_audio(path)
+        audio_hash, _ = self.store_waveform(audio, source_bytes=os.path.getsize(path))
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO sources (digest, hash) VALUES (?, ?)", (digest, audio_hash))
+        return audio_hash
+
+    def store_waveform(self, audio, source_bytes=None):
+        """
+        Archive a 16 kHz mono float32 waveform.
+
+        Args:
+            audio (np.ndarray): float32 samples at 16 kHz
+            source_bytes (int): Size of the original upload, for the stats
+
+        Returns:
+            tuple: (hash, True if a new object was written)
+        """
+        pcm = (np.clip(audio, -1.0, 1.0) * 32767).astype("<i2")
+        audio_hash = hashlib.sha256(pcm.tobytes()).hexdigest()
+        if self._object_path(audio_hash) is not None:
+            self._count_dedup_hit()
+            return audio_hash, False
+
+        start = time.time()
+        codec = self.codec if resolve_ffmpeg() else "wav"
+        if codec != self.codec:
+            print("WARNING: ffmpeg not found; archiving audio as 16 kHz mono WAV instead of "
+                  f"{self.codec.upper()}. Run `python main.py --setup-ffmpeg` to install it.")
+        path = self._new_object_path(audio_hash, codec)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        try:
+            if codec == "wav":
+                _write_wav(tmp_path, pcm)
+            else:
+                self._encode(pcm, tmp_path, codec)
+            os.replace(tmp_path, path)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        elapsed = time.time() - start
+
+        with self._connect() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO objects VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (audio_hash, codec, len(pcm) / SAMPLE_RATE,
+                 source_bytes if source_bytes is not None else pcm.nbytes,
+                 os.path.getsize(path), elapsed, time.time()),
+            )
+        return audio_hash, True
+
+    def load(self, audio_hash):
+        """
+        Decode an archived recording for re-transcription.
+
+        Args:
+            audio_hash (str): Hash returned by store()
+
+        Returns:
+            np.ndarray: float32 samples at 16 kHz
+
+        Raises:
+            KeyError: If the hash is not in the archive
+        """
+        path = self._object_path(audio_hash)
+        if path is None:
+            raise KeyError(audio_hash)
+        if path.endswith(".wav"):
+            audio, _ = read_wav(path)
+            return audio
+        return load_audio_ffmpeg(path)
+
+    def path(self, audio_hash):
+        """Path of the archived file, or None if the hash is unknown."""
+        return self._object_path(audio_hash)
+
+    def stats(self):
+        """
+        Get archive counters.
+
+        Returns:
+            dict: Object count, stored and original bytes, compression ratio,
+                  audio hours, dedup hits and encoding throughput (audio seconds per second)
+        """
+        objects, seconds, source_bytes, stored_bytes, encode_seconds = self._connect().execute(
+            "SELECT COUNT(*), COALESCE(SUM(seconds), 0), COALESCE(SUM(source_bytes), 0), "
+            "COALESCE(SUM(stored_bytes), 0), COALESCE(SUM(encode_seconds), 0) FROM objects"
+        ).fetchone()
+        return {
+            "objects": objects,
+            "audio_hours": seconds / 3600,
+            "source_bytes": source_bytes,
+            "stored_bytes": stored_bytes,
+            "compression_ratio": source_bytes / stored_bytes if stored_bytes else 0.0,
+            "dedup_hits": self.dedup_hits,
+            "encode_throughput": seconds / encode_seconds if encode_seconds else 0.0,
+        }
+
+    def _count_dedup_hit(self):
+        """Count a recording that was already archived (store_waveform runs on several threads)."""
+        with self._lock:
+            self.dedup_hits += 1
+
+    def _encode(self, pcm, path, codec):
+        """Encode 16-bit PCM with one ffmpeg process reading from stdin."""
+        cmd = [
+            resolve_ffmpeg(), "-hide_banner", "-loglevel", "error",
+            "-f", "s16le", "-ar", str(SAMPLE_RATE), "-ac", "1", "-i", "-",
+            *CODECS[codec],
+        ]
+        if codec == "opus":
+            cmd += ["-b:a", self.opus_bitrate]
+        cmd += ["-f", "ogg" if codec == "opus" else "flac", "-y", path]
+        try:
+            subprocess.run(cmd, input=pcm.tobytes(), capture_output=True, check=True)
+        except subprocess.CalledProcessError as e:
+            raise RuntimeError(f"Failed to encode audio: {e.stderr.decode(errors='replace')}") from e
+
+    def _new_object_path(self, audio_hash, codec):
+        """Where a new object goes; two-character fan-out keeps directories small."""
+        directory = os.path.join(self.root, "objects", audio_hash[:2])
+        os.makedirs(directory, exist_ok=True)
+        extension = "opus" if codec == "opus" else codec
+        return os.path.join(directory, f"{audio_hash}.{extension}")
+
+    def _object_path(self, audio_hash):
+        """Existing file for a hash, whatever codec it was stored with."""
+        row = self._connect().execute("SELECT codec FROM objects WHERE hash = ?", (audio_hash,)).fetchone()
+        if row is None:
+            return None
+        extension = "opus" if row[0] == "opus" else row[0]
+        path = os.path.join(self.root, "objects", audio_hash[:2], f"{audio_hash}.{extension}")
+        return path if os.path.exists(path) else None
+
+    def _connect(self):
+        """One index connection per thread."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(os.path.join(self.root, "index.db"), timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            self._local.conn = conn
+        return conn
+
+
+def _write_wav(path, pcm):
+    """Write 16 kHz mono 16-bit PCM as a WAV file."""
+    import wave
+
+    with wave.open(path, "wb") as f:
+        f.setnchannels(1)
+        f.setsampwidth(2)
+        f.setframerate(SAMPLE_RATE)
+        f.writeframes(pcm.tobytes())
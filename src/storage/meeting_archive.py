@@ -0,0 +1,357 @@
+"""
+SQLite meeting archive with full-text search.
+
+Meetings (transcript, summary and metadata) and their timestamped segments
+live in one database file. FTS5 indexes over both are kept in sync by
+triggers, so searches are index lookups ranked with BM25 rather than scans
+over every transcript.
+"""
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+from datetime import datetime
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meetings (
+    id INTEGER PRIMARY KEY,
+    meeting_id TEXT NOT NULL UNIQUE,
+    title TEXT NOT NULL DEFAULT '',
+    created_at REAL NOT NULL,
+    updated_at REAL NOT NULL,
+    transcript TEXT NOT NULL DEFAULT '',
+    summary TEXT NOT NULL DEFAULT '',
+    model_size TEXT,
+    llm_model TEXT,
+    language TEXT,
+    audio_seconds REAL,
+    transcribe_seconds REAL,
+    summarize_seconds REAL,
+    source TEXT,
+    audio_hash TEXT,
+    metadata TEXT
+);
+CREATE INDEX IF NOT EXISTS meetings_created ON meetings(created_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS meetings_fts USING fts5(
+    title, transcript, summary, content='meetings', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS meetings_ai AFTER INSERT ON meetings BEGIN
+    INSERT INTO meetings_fts(rowid, title, transcript, summary)
+    VALUES (new.id, new.title, new.transcript, new.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS meetings_ad AFTER DELETE ON meetings BEGIN
+    INSERT INTO meetings_fts(meetings_fts, rowid, title, transcript, summary)
+    VALUES ('delete', old.id, old.title, old.transcript, old.summary);
+END;
+CREATE TRIGGER IF NOT EXISTS meetings_au AFTER UPDATE OF title, transcript, summary ON meetings BEGIN
+    INSERT INTO meetings_fts(meetings_fts, rowid, title, transcript, summary)
+    VALUES ('delete', old.id, old.title, old.transcript, old.summary);
+    INSERT INTO meetings_fts(rowid, title, transcript, summary)
+    VALUES (new.id, new.title, new.transcript, new.summary);
+END;
+
+CREATE TABLE IF NOT EXISTS segments (
+    id INTEGER PRIMARY KEY,
+    meeting_id TEXT NOT NULL,
+    idx INTEGER NOT NULL,
+    start REAL NOT NULL,
+    end REAL NOT NULL,
+    text TEXT NOT NULL,
+    UNIQUE(meeting_id, idx)
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS segments_fts USING fts5(
+    text, content='segments', content_rowid='id', tokenize='porter unicode61'
+);
+CREATE TRIGGER IF NOT EXISTS segments_ai AFTER INSERT ON segments BEGIN
+    INSERT INTO segments_fts(rowid, text) VALUES (new.id, new.text);
+END;
+CREATE TRIGGER IF NOT EXISTS segments_ad AFTER DELETE ON segments BEGIN
+    INSERT INTO segments_fts(segments_fts, rowid, text) VALUES ('delete', old.id, old.text);
+END;
+"""
+
+# Columns save_meeting() accepts besides the text fields
+METADATA_COLUMNS = ("title", "model_size", "llm_model", "language", "audio_seconds",
+                    "transcribe_seconds", "summarize_seconds", "source", "audio_hash")
+
+# "{meeting_id}_transcript.txt" / "{meeting_id}_summary.txt" (sessions and batch runs)
+_SESSION_FILE = re.compile(r"^(?P<id>.+)_(?P<kind>transcript|summary)\.txt$")
+# "transcript_{timestamp}.txt" / "summary_{timestamp}.txt" (the UI's save buttons)
+_EXPORT_FILE = re.compile(r"^(?P<kind>transcript|summary)_(?P<stamp>\d{8}-\d{6})\.txt$")
+_STAMP = re.compile(r"(\d{8}-\d{6})")
+_QUERY_TERM = re.compile(r"\w+\*?")
+
+
+class MeetingArchive:
+    """
+    Stores meetings in SQLite and searches them through FTS5.
+    """
+
+    def __init__(self, db_path):
+        """
+        Open (and create if needed) the archive.
+
+        Args:
+            db_path (str): SQLite database file
+        """
+        self.db_path = str(db_path)
+        directory = os.path.dirname(self.db_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._local = threading.local()
+        with self._connect() as conn:
+            conn.executescript(_SCHEMA)
+            # Databases created before recordings were archived lack the column
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(meetings)")}
+            if "audio_hash" not in columns:
+                conn.execute("ALTER TABLE meetings ADD COLUMN audio_hash TEXT")
+
+    def save_meeting(self, meeting_id, transcript=None, summary=None, segments=None, metadata=None,
+                     created_at=None, **fields):
+        """
+        Insert a meeting or update the fields given for an existing one.
+
+        Args:
+            meeting_id (str): Session or file identifier
+            transcript (str): Transcript text
+            summary (str): Summary text
+            segments (list): Whisper-style segments ({"start", "end", "text"}); replaces stored ones
+            metadata (dict): Extra JSON metadata
+            created_at (float): Unix time the meeting took place, defaults to now for new meetings
+            **fields: Any of METADATA_COLUMNS
+        """
+        unknown = set(fields) - set(METADATA_COLUMNS)
+        if unknown:
+            raise ValueError(f"Unknown meeting fields: {', '.join(sorted(unknown))}")
+
+        values = {key: value for key, value in fields.items() if value is not None}
+        if transcript is not None:
+            values["transcript"] = transcript
+        if summary is not None:
+            values["summary"] = summary
+        if metadata is not None:
+            values["metadata"] = json.dumps(metadata)
+        now = time.time()
+
+        with self._connect() as conn:
+            self._upsert(conn, meeting_id, values, created_at or now, now)
+            if segments is not None:
+                self._replace_segments(conn, meeting_id, segments)
+
+    def get_meeting(self, meeting_id):
+        """
+        Retrieve one meeting with its segments.
+
+        Returns:
+            dict: The meeting's fields plus "segments", or None if unknown
+        """
+        conn = self._connect()
+        row = conn.execute("SELECT * FROM meetings WHERE meeting_id = ?", (meeting_id,)).fetchone()
+        if row is None:
+            return None
+        meeting = dict(row)
+        meeting.pop("id")
+        meeting["metadata"] = json.loads(meeting["metadata"]) if meeting["metadata"] else {}
+        meeting["segments"] = [
+            dict(segment) for segment in conn.execute(
+                "SELECT start, end, text FROM segments WHERE meeting_id = ? ORDER BY idx", (meeting_id,))
+        ]
+        return meeting
+
+    def delete_meeting(self, meeting_id):
+        """Remove a meeting and its segments."""
+        with self._connect() as conn:
+            conn.execute("DELETE FROM segments WHERE meeting_id = ?", (meeting_id,))
+            conn.execute("DELETE FROM meetings WHERE meeting_id = ?", (meeting_id,))
+
+    def search(self, query, limit=20):
+        """
+        Full-text search over titles, transcripts and summaries.
+
+        Every word of the query must match (a trailing * matches prefixes).
+
+        Args:
+            query (str): Words to look for
+            limit (int): Most results returned
+
+        Returns:
+            list: Dicts with meeting_id, title, created_at, snippet and score, best first
+        """
+        match = _fts_query(query)
+        if not match:
+            return []
+        rows = self._connect().execute(
+            """
+            SELECT m.meeting_id, m.title, m.created_at,
+                   snippet(meetings_fts, -1, '**', '**', ' … ', 16) AS snippet,
+                   bm25(meetings_fts, 5.0, 1.0, 2.0) AS score
+            FROM meetings_fts JOIN meetings m ON m.id = meetings_fts.rowid
+            WHERE meetings_fts MATCH ?
+            ORDER BY score
+            LIMIT ?
+            """,
+            (match, limit),
+        )
+        return [dict(row) for row in rows]
+
+    def search_segments(self, query, limit=50, meeting_id=None):
+        """
+        Find the timestamped segments that mention the query.
+
+        Args:
+            query (str): Words to look for
+            limit (int): Most results returned
+            meeting_id (str): Only search this meeting
+
+        Returns:
+            list: Dicts with meeting_id, start, end and text, best first
+        """
+        match = _fts_query(query)
+        if not match:
+            return []
+        sql = """
+            SELECT s.meeting_id, s.start, s.end, s.text
+            FROM segments_fts JOIN segments s ON s.id = segments_fts.rowid
+            WHERE segments_fts MATCH ?
+        """
+        params = [match]
+        if meeting_id is not None:
+            sql += " AND s.meeting_id = ?"
+            params.append(meeting_id)
+        sql += " ORDER BY bm25(segments_fts) LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._connect().execute(sql, params)]
+
+    def recent(self, limit=20):
+        """
+        List the latest meetings.
+
+        Returns:
+            list: Dicts with meeting_id, title and created_at, newest first
+        """
+        rows = self._connect().execute(
+            "SELECT meeting_id, title, created_at FROM meetings ORDER BY created_at DESC LIMIT ?", (limit,))
+        return [dict(row) for row in rows]
+
+    def import_directory(self, directory):
+        """
+        Bulk import the .txt transcripts and summaries of a save directory.
+
+        "{id}_transcript.txt" and "{id}_summary.txt" become one meeting;
+        exported "transcript_{timestamp}.txt" files become one meeting each.
+        Importing the same directory again updates rather than duplicates.
+
+        Args:
+            directory (str): Directory with the text files
+
+        Returns:
+            int: Meetings imported
+        """
+        meetings = {}
+        for name in sorted(os.listdir(directory)):
+            path = os.path.join(directory, name)
+            match = _EXPORT_FILE.match(name)
+            if match:
+                meeting_id, kind = name[:-len(".txt")], match.group("kind")
+            else:
+                match = _SESSION_FILE.match(name)
+                if not match:
+                    continue
+                meeting_id, kind = match.group("id"), match.group("kind")
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    text = f.read()
+                mtime = os.path.getmtime(path)
+            except (OSError, UnicodeDecodeError) as e:
+                print(f"Skipping {name}: {str(e)}")
+                continue
+            meeting = meetings.setdefault(meeting_id, {"created_at": _created_at(meeting_id, mtime)})
+            meeting[kind] = text
+
+        now = time.time()
+        with self._connect() as conn:
+            for meeting_id, meeting in meetings.items():
+                values = {key: meeting[key] for key in ("transcript", "summary") if key in meeting}
+                values["source"] = "import"
+                self._upsert(conn, meeting_id, values, meeting["created_at"], now)
+        return len(meetings)
+
+    def stats(self):
+        """
+        Get archive counters.
+
+        Returns:
+            dict: Meeting and segment counts, total audio seconds and database size
+        """
+        conn = self._connect()
+        meetings, audio_seconds = conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(audio_seconds), 0) FROM meetings").fetchone()
+        segments = conn.execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+        return {
+            "meetings": meetings,
+            "segments": segments,
+            "audio_seconds": audio_seconds,
+            "size_bytes": os.path.getsize(self.db_path),
+        }
+
+    def _connect(self):
+        """One connection per thread; sqlite3 connections must not be shared."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            # WAL lets searches run while a meeting is being written
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @staticmethod
+    def _upsert(conn, meeting_id, values, created_at, updated_at):
+        """Insert the meeting or update only the given columns."""
+        columns = list(values)
+        assignments = ", ".join(f"{column} = excluded.{column}" for column in columns + ["updated_at"])
+        conn.execute(
+            f"""
+            INSERT INTO meetings (meeting_id, created_at, updated_at{''.join(', ' + c for c in columns)})
+            VALUES (?, ?, ?{', ?' * len(columns)})
+            ON CONFLICT(meeting_id) DO UPDATE SET {assignments}
+            """,
+            [meeting_id, created_at, updated_at] + [values[column] for column in columns],
+        )
+
+    @staticmethod
+    def _replace_segments(conn, meeting_id, segments):
+        """Swap a meeting's segments for new ones."""
+        conn.execute("DELETE FROM segments WHERE meeting_id = ?", (meeting_id,))
+        conn.executemany(
+            "INSERT INTO segments (meeting_id, idx, start, end, text) VALUES (?, ?, ?, ?, ?)",
+            [(meeting_id, index, float(segment["start"]), float(segment["end"]), segment["text"].strip())
+             for index, segment in enumerate(segments)],
+        )
+
+
+def _fts_query(query):
+    """Turn free text into an FTS5 query of quoted terms, so user input cannot break the syntax."""
+    terms = []
+    for term in _QUERY_TERM.findall(query or ""):
+        if term.endswith("*"):
+            terms.append(f'"{term[:-1]}"*')
+        else:
+            terms.append(f'"{term}"')
+    return " ".join(terms)
+
+
+def _created_at(meeting_id, fallback):
+    """Read the timestamp embedded in a session or export name, else use the fallback."""
+    match = _STAMP.search(meeting_id)
+    if match:
+        try:
+            return datetime.strptime(match.group(1), "%Y%m%d-%H%M%S").timestamp()
+        except ValueError:
+            pass
+    return fallback
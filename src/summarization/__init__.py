@@ -1,4 +1,5 @@
 # Summarization module initialization
 from .llm_summarizer import MeetingSummarizer
+from .llm_client import AsyncLLMClient, LLMError, TokenBucket
 
-__all__ = ['MeetingSummarizer']
\ No newline at end of file
+__all__ = ['MeetingSummarizer', 'AsyncLLMClient', 'LLMError', 'TokenBucket']
\ No newline at end of file
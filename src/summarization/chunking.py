@@ -0,0 +1,101 @@
+"""
+Token-budgeted splitting of long transcripts for map-reduce summarization.
+"""
+import re
+
+# Rough tokens-per-character ratio of LLaMA-style tokenizers on English text
+CHARS_PER_TOKEN = 4
+
+# CJK ideographs, kana, Hangul and full-width forms cost about one token per character
+_WIDE_CHARS = re.compile(r"[\u3000-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff\uff00-\uffef]")
+
+# Sentence ends (CJK ones need no space after them), or newlines between transcript segments
+_SENTENCE_BOUNDARY = re.compile(r"(?<=[.!?])\s+|(?<=[。！？])\s*|\n+")
+
+
+def count_tokens(text):
+    """
+    Estimate the number of tokens in a text without loading a tokenizer.
+
+    Args:
+        text (str): Text to measure
+
+    Returns:
+        int: Approximate token count (one per CJK character, one per
+             CHARS_PER_TOKEN characters of other text)
+    """
+    wide = len(_WIDE_CHARS.findall(text))
+    return wide + (len(text) - wide + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def split_sentences(text):
+    """
+    Split a transcript into sentences (or segments, one per line).
+
+    Args:
+        text (str): Transcript text
+
+    Returns:
+        list: Non-empty sentences
+    """
+    return [sentence.strip() for sentence in _SENTENCE_BOUNDARY.split(text) if sentence.strip()]
+
+
+def chunk_text(text, max_tokens):
+    """
+    Pack whole sentences into chunks of at most `max_tokens` tokens.
+
+    A single sentence longer than the budget is split between words, and a
+    run of text without spaces (e.g. Chinese or Japanese) between characters.
+
+    Args:
+        text (str): Transcript text
+        max_tokens (int): Token budget per chunk
+
+    Returns:
+        list: Chunk strings in transcript order
+    """
+    chunks = []
+    current = []
+    current_tokens = 0
+    for sentence in split_sentences(text):
+        for piece in _split_long(sentence, max_tokens):
+            tokens = count_tokens(piece) + 1
+            if current and current_tokens + tokens > max_tokens:
+                chunks.append(" ".join(current))
+                current, current_tokens = [], 0
+            current.append(piece)
+            current_tokens += tokens
+    if current:
+        chunks.append(" ".join(current))
+    return chunks
+
+
+def _split_long(sentence, max_tokens):
+    """Split a sentence that does not fit in one chunk between words (or characters)."""
+    if count_tokens(sentence) <= max_tokens:
+        return [sentence]
+    pieces = []
+    current = []
+    current_tokens = 0
+    for word in _words(sentence, max_tokens):
+        tokens = count_tokens(word) + 1
+        if current and current_tokens + tokens > max_tokens:
+            pieces.append(" ".join(current))
+            current, current_tokens = [], 0
+        current.append(word)
+        current_tokens += tokens
+    if current:
+        pieces.append(" ".join(current))
+    return pieces
+
+
+def _words(sentence, max_tokens):
+    """Whitespace-separated words, with words over the budget cut into fixed-width slices."""
+    # No character is estimated at more than one token, so these slices always fit
+    width = max(1, max_tokens - 1)
+    for word in sentence.split():
+        if count_tokens(word) + 1 <= max_tokens:
+            yield word
+        else:
+            yield from (word[start:start + width] for start in range(0, len(word), width))
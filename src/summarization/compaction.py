@@ -0,0 +1,115 @@
+"""
+Transcript compaction before summarization.
+
+Whisper output carries filler words, stutters ("I I I think") and, on
+noisy audio, loops where a phrase is repeated many times. None of it helps
+the summary, but all of it costs prompt tokens. Compaction removes fillers,
+collapses consecutive repeats of the same n-gram and normalizes whitespace.
+"""
+import re
+
+import numpy as np
+
+from src.summarization.chunking import count_tokens
+
+# Filler words, lowercase ("um", "uhh", "erm", "ahh", "hmm", "mm", "mhm")
+_FILLER_WORDS = ("u+m+", "u+h+", "uhm", "e+r+m*", "a+h+", "h+m+", "m+h?m+")
+# A filler starting an utterance, capitalized or not, with its own punctuation ("Mm." or "Um,")
+_LEADING_FILLERS = re.compile(
+    r"(?:^|(?<=[.!?]))(\s*)(?:%s)(?![\w'-])[,.!?]*(?=\s|$)"
+    % "|".join(f"[{word[0].upper()}{word[0]}]{word[1:]}" for word in _FILLER_WORDS),
+    re.MULTILINE)
+# A lowercase filler inside a sentence, with the commas that usually surround it;
+# "ER" or "HMM" in capitals are names or acronyms
+_FILLERS = re.compile(r"(?:,\s*)?(?<![\w'-])(?:%s)(?![\w'-]),?" % "|".join(_FILLER_WORDS))
+_LEADING_PUNCT = re.compile(r"^[,.;:!?]+\s*", re.MULTILINE)
+_SPACE_BEFORE_PUNCT = re.compile(r"\s+([,.!?;:])")
+_REPEATED_PUNCT = re.compile(r"([,.!?;:])(?:\s*[,;:])+")
+_WHITESPACE = re.compile(r"[ \t]+")
+_NORMALIZE = re.compile(r"[^\w']+")
+_WORD_WITH_SPACE = re.compile(r"\S+\s*")
+
+
+def normalize_whitespace(text):
+    """
+    Collapse runs of spaces, drop spaces before punctuation and blank lines.
+    """
+    text = _WHITESPACE.sub(" ", text)
+    text = _SPACE_BEFORE_PUNCT.sub(r"\1", text)
+    text = _REPEATED_PUNCT.sub(r"\1", text)
+    lines = (_LEADING_PUNCT.sub("", line.strip()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def remove_fillers(text):
+    """
+    Remove filler words such as "um", "uh" and "hmm".
+
+    Whole filler utterances ("Mm.") go with their punctuation, so none is left
+    dangling; run normalize_whitespace() afterwards to tidy the spacing.
+    """
+    return _FILLERS.sub("", _LEADING_FILLERS.sub(r"\1", text))
+
+
+def collapse_repeats(words, max_ngram=30):
+    """
+    Collapse consecutive repeats of the same n-gram to one copy.
+
+    Words are compared case- and punctuation-insensitively. Single words are
+    collapsed only when they occur three or more times in a row, since
+    "very very" or "no no" can be deliberate.
+
+    Args:
+        words (list): Words of the transcript (surrounding whitespace is ignored)
+        max_ngram (int): Longest repeated phrase looked for
+
+    Returns:
+        list: Words with the repeats removed
+    """
+    vocabulary = {}
+    ids = np.array([vocabulary.setdefault(_NORMALIZE.sub("", w.lower()), len(vocabulary)) for w in words],
+                   dtype=np.int64)
+    words = list(words)
+    for n in range(1, max_ngram + 1):
+        if len(ids) <= n:
+            break
+        # A run of L matches ids[i] == ids[i + n] means the span is periodic with period n
+        matches = np.concatenate(([False], ids[:-n] == ids[n:], [False]))
+        edges = np.flatnonzero(np.diff(matches.astype(np.int8)))
+        min_copies = 3 if n == 1 else 2
+        drop = np.zeros(len(ids), dtype=bool)
+        for start, end in zip(edges[::2], edges[1::2]):
+            copies = (end - start + n) // n
+            if copies >= min_copies:
+                # Keep the last full copy, which carries the closing punctuation;
+                # a trailing partial copy may begin the next phrase
+                drop[start:start + n * (copies - 1)] = True
+        if drop.any():
+            ids = ids[~drop]
+            words = [w for w, dropped in zip(words, drop) if not dropped]
+    return words
+
+
+def compact_transcript(transcript):
+    """
+    Compact a transcript and measure the saving.
+
+    Args:
+        transcript (str): Raw transcript text
+
+    Returns:
+        tuple: (compacted text, dict with "original_tokens", "compacted_tokens" and "saved_ratio")
+    """
+    text = normalize_whitespace(remove_fillers(transcript))
+    # Words keep their trailing space or newline so line breaks survive
+    words = _WORD_WITH_SPACE.findall(text)
+    compacted = normalize_whitespace("".join(collapse_repeats(words)))
+
+    original_tokens = count_tokens(transcript)
+    compacted_tokens = count_tokens(compacted)
+    stats = {
+        "original_tokens": original_tokens,
+        "compacted_tokens": compacted_tokens,
+        "saved_ratio": 1 - compacted_tokens / original_tokens if original_tokens else 0.0,
+    }
+    return compacted, stats
@@ -0,0 +1,258 @@
+"""
+Offline extractive summarization: TF-IDF sentence vectors ranked with TextRank.
+
+Used when no LLM endpoint is configured (or it fails). Everything is NumPy:
+sentences become L2-normalized TF-IDF rows, their cosine similarities form
+the TextRank graph, and the highest ranked sentences that are not
+near-duplicates of each other are returned in transcript order. Action
+items and decisions are picked from sentences with typical cue phrases.
+
+Words are matched in any script; Chinese and Japanese, which are written
+without spaces, are indexed as overlapping character pairs instead. Text
+without sentence punctuation is cut into pieces of at most
+MAX_SENTENCE_CHARS characters so a key point is never a whole transcript.
+"""
+import re
+
+import numpy as np
+
+from src.summarization.chunking import split_sentences
+
+# Letters and digits of any script, with an apostrophe inside ("don't")
+_WORD = re.compile(r"[^\W_]+(?:'[^\W_]+)?")
+# Han ideographs and kana: no spaces between words
+_CJK_RUN = re.compile(r"[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+")
+
+# Longest "sentence" quoted as a key point; longer ones are cut, at a space if possible
+MAX_SENTENCE_CHARS = 300
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing don't down during each few for from further
+get got had has have having he her here hers herself him himself his how i i'm if in into is it it's
+its itself just know like let's me more most my myself no nor not now of off oh ok okay on once only
+or other our ours ourselves out over own really right same she should so some such than that that's
+the their theirs them themselves then there there's these they they're think this those through to
+too um uh under until up us very was we we're were what when where which while who whom why will
+with would yeah yes you you're your yours yourself yourselves going gonna want
+""".split())
+
+_ACTION_CUES = re.compile(
+    r"\b(will|i'll|we'll|you'll|going to|need to|needs to|have to|has to|should|must|action item|"
+    r"follow up|follow-up|take care of|responsible for|assign|deadline|by (?:monday|tuesday|wednesday|"
+    r"thursday|friday|tomorrow|next week|end of))\b", re.IGNORECASE)
+_DECISION_CUES = re.compile(
+    r"\b(decided|decide to|agreed|agree to|approved|we'll go with|go ahead with|settled on|"
+    r"final decision|conclusion|concluded)\b", re.IGNORECASE)
+_NEXT_STEP_CUES = re.compile(
+    r"\b(next step|next steps|next week|next meeting|next time|moving forward|going forward|"
+    r"follow up|follow-up|plan to|schedule)\b", re.IGNORECASE)
+
+
+def split_units(transcript, max_chars=MAX_SENTENCE_CHARS):
+    """
+    Split a transcript into sentences no longer than `max_chars`.
+
+    Returns:
+        list: Non-empty sentences, long ones cut at the last space of their
+              second half (or at `max_chars` when there is none)
+    """
+    units = []
+    for sentence in split_sentences(transcript):
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", max_chars // 2, max_chars + 1)
+            if cut <= 0:
+                cut = max_chars
+            units.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if sentence:
+            units.append(sentence)
+    return units
+
+
+def index_terms(sentence):
+    """
+    Index terms of a sentence: words that are not stopwords, and character pairs of CJK text.
+
+    Returns:
+        list: Lowercase terms in order
+    """
+    text = sentence.lower()
+    found = [run[i:i + 2] for run in _CJK_RUN.findall(text) for i in range(len(run) - 1)]
+    found.extend(word for word in _WORD.findall(_CJK_RUN.sub(" ", text))
+                 if word not in STOPWORDS and len(word) >= 3)
+    return found
+
+
+def word_count(text):
+    """Approximate number of words, counting two CJK characters as one word."""
+    cjk = sum(len(run) for run in _CJK_RUN.findall(text))
+    return len(_CJK_RUN.sub(" ", text).split()) + (cjk + 1) // 2
+
+
+def tfidf_matrix(sentences, max_terms=5000):
+    """
+    Build L2-normalized TF-IDF vectors for sentences.
+
+    Args:
+        sentences (list): Sentence strings
+        max_terms (int): Keep only this many most frequent terms
+
+    Returns:
+        tuple: (matrix of shape (n_sentences, n_terms), list of terms)
+    """
+    vocabulary = {}
+    rows, cols = [], []
+    for row, sentence in enumerate(sentences):
+        for word in index_terms(sentence):
+            rows.append(row)
+            cols.append(vocabulary.setdefault(word, len(vocabulary)))
+    terms = list(vocabulary)
+    if not terms:
+        return np.zeros((len(sentences), 0), dtype=np.float32), []
+
+    counts = np.zeros((len(sentences), len(terms)), dtype=np.float32)
+    np.add.at(counts, (np.array(rows), np.array(cols)), 1.0)
+
+    document_frequency = np.count_nonzero(counts, axis=0)
+    if len(terms) > max_terms:
+        keep = np.sort(np.argsort(-document_frequency, kind="stable")[:max_terms])
+        counts = counts[:, keep]
+        document_frequency = document_frequency[keep]
+        terms = [terms[i] for i in keep]
+
+    idf = np.log((1 + len(sentences)) / (1 + document_frequency)) + 1.0
+    matrix = np.log1p(counts) * idf.astype(np.float32)
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    matrix /= np.maximum(norms, 1e-12)
+    return matrix, terms
+
+
+def textrank(similarity, damping=0.85, iterations=50, tolerance=1e-6):
+    """
+    Rank graph nodes by PageRank over a weighted similarity matrix.
+
+    Args:
+        similarity (np.ndarray): Symmetric (n, n) non-negative weights
+        damping (float): PageRank damping factor
+        iterations (int): Maximum power iterations
+        tolerance (float): Stop once scores change less than this (L1)
+
+    Returns:
+        np.ndarray: Scores summing to 1
+    """
+    n = len(similarity)
+    if n == 0:
+        return np.zeros(0)
+    weights = similarity.astype(np.float64)
+    np.fill_diagonal(weights, 0.0)
+    out_degree = weights.sum(axis=1, keepdims=True)
+    # Sentences with no neighbours spread their rank evenly
+    transition = np.where(out_degree > 0, weights / np.maximum(out_degree, 1e-12), 1.0 / n)
+
+    scores = np.full(n, 1.0 / n)
+    for _ in range(iterations):
+        updated = (1 - damping) / n + damping * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < tolerance:
+            return updated
+        scores = updated
+    return scores
+
+
+def select_sentences(scores, similarity, count, redundancy=0.6):
+    """
+    Pick the best scored sentences, skipping near-duplicates of ones already picked.
+
+    Sentences with a negative score are never picked.
+
+    Returns:
+        list: Sentence indices in transcript order
+    """
+    chosen = []
+    for index in np.argsort(-scores, kind="stable"):
+        if len(chosen) >= count or scores[index] < 0:
+            break
+        if chosen and similarity[index, chosen].max() > redundancy:
+            continue
+        chosen.append(int(index))
+    return sorted(chosen)
+
+
+def extract_summary(transcript, max_points=None, max_items=5):
+    """
+    Summarize a transcript by extracting its most central sentences.
+
+    Args:
+        transcript (str): Meeting transcript text
+        max_points (int): Key discussion points to return, default scales with length
+        max_items (int): Action items, decisions and next steps to return, each
+
+    Returns:
+        dict: "topics", "key_points", "decisions", "action_items", "next_steps",
+              "word_count" and "sentence_count"
+    """
+    sentences = split_units(transcript)
+    result = {"topics": [], "key_points": [], "decisions": [], "action_items": [], "next_steps": [],
+              "word_count": word_count(transcript), "sentence_count": len(sentences)}
+    if not sentences:
+        return result
+
+    matrix, vocabulary = tfidf_matrix(sentences)
+    similarity = matrix @ matrix.T
+    scores = textrank(similarity)
+    # Very short utterances ("Yes.", "Okay, thanks.") are rarely worth quoting
+    lengths = np.array([word_count(s) for s in sentences])
+    scores = np.where(lengths >= 5, scores, scores * 0.1)
+
+    if vocabulary:
+        # Terms that carry the most central sentences
+        weights = scores @ matrix
+        result["topics"] = [vocabulary[i] for i in np.argsort(-weights, kind="stable")[:5]]
+
+    if max_points is None:
+        max_points = int(np.clip(np.sqrt(len(sentences)), 3, 12))
+    result["key_points"] = [sentences[i] for i in select_sentences(scores, similarity, max_points)]
+
+    for key, cues in (("action_items", _ACTION_CUES), ("decisions", _DECISION_CUES),
+                      ("next_steps", _NEXT_STEP_CUES)):
+        candidates = np.array([bool(cues.search(s)) and lengths[i] >= 4 for i, s in enumerate(sentences)])
+        if candidates.any():
+            picked = select_sentences(np.where(candidates, scores, -1.0), similarity,
+                                      min(max_items, int(candidates.sum())))
+            result[key] = [sentences[i] for i in picked]
+    return result
+
+
+def format_summary(summary):
+    """
+    Render an extract_summary result in the same layout as LLM summaries.
+
+    Returns:
+        str: Markdown summary
+    """
+    def bullets(items, empty):
+        return "\n".join(f"- {item}" for item in items) if items else f"- {empty}"
+
+    topics = ", ".join(summary["topics"]) or "general discussion"
+    actions = "\n".join(f"{i}. {item}" for i, item in enumerate(summary["action_items"], 1)) \
+        or "- No explicit action items were detected"
+    return f"""
+# Meeting Summary
+
+## Meeting Overview
+This meeting transcript contains approximately {summary['word_count']} words in {summary['sentence_count']} sentences. Main topics: {topics}.
+
+## Key Discussion Points
+{bullets(summary['key_points'], 'No key points could be extracted')}
+
+## Decisions Made
+{bullets(summary['decisions'], 'No explicit decisions were detected')}
+
+## Action Items
+{actions}
+
+## Next Steps
+{bullets(summary['next_steps'], 'No next steps were mentioned explicitly')}
+
+*Note: This is an extractive summary generated offline from the transcript's key sentences. Set up an LLM API key for an abstractive summary.*
+        """
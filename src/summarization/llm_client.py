@@ -0,0 +1,338 @@
+"""
+Async client for OpenAI-compatible chat completion endpoints.
+
+One pooled httpx.AsyncClient runs on a background event loop. Requests get
+a timeout and are retried on 429/5xx and connection errors with jittered
+exponential backoff (honouring Retry-After). Token buckets keep requests
+and tokens per minute under the provider's limits. The `chat.completions.create`
+facade mirrors the Together/OpenAI SDKs, so MeetingSummarizer can call it
+from worker threads while all I/O is multiplexed on the one loop.
+"""
+import json
+import time
+import random
+import asyncio
+import threading
+from types import SimpleNamespace
+
+from config import (
+    DEFAULT_LLM_MODEL, LLM_TIMEOUT, LLM_MAX_RETRIES, LLM_MAX_CONNECTIONS,
+    LLM_REQUESTS_PER_MINUTE, LLM_TOKENS_PER_MINUTE
+)
+from src.summarization.chunking import count_tokens
+
+# httpx is imported lazily so that importing this module stays cheap
+
+# Status codes worth retrying
+RETRY_STATUS = {408, 409, 429, 500, 502, 503, 504}
+
+
+class LLMError(Exception):
+    """Raised when a completion request fails for good."""
+
+    def __init__(self, message, status_code=None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class TokenBucket:
+    """
+    An asyncio token bucket refilled continuously at `rate_per_minute`.
+    """
+
+    def __init__(self, rate_per_minute, capacity=None):
+        """
+        Initialize the bucket full.
+
+        Args:
+            rate_per_minute (float): Refill rate; 0 disables limiting
+            capacity (float): Largest burst, defaults to one minute's worth
+        """
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity or rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self, amount=1):
+        """
+        Wait until `amount` tokens are available and take them.
+
+        Returns:
+            float: Seconds spent waiting
+        """
+        if not self.rate:
+            return 0.0
+        # A request larger than the bucket would wait forever; let it drain the bucket instead
+        amount = min(amount, self.capacity)
+        waited = 0.0
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return waited
+                delay = (amount - self.tokens) / self.rate
+                waited += delay
+                await asyncio.sleep(delay)
+
+
+class AsyncLLMClient:
+    """
+    Chat completions against any OpenAI-compatible endpoint.
+    """
+
+    def __init__(self, base_url, api_key=None, model=DEFAULT_LLM_MODEL, timeout=LLM_TIMEOUT,
+                 max_retries=LLM_MAX_RETRIES, max_connections=LLM_MAX_CONNECTIONS,
+                 requests_per_minute=LLM_REQUESTS_PER_MINUTE, tokens_per_minute=LLM_TOKENS_PER_MINUTE):
+        """
+        Initialize the client; the connection pool and event loop start on first use.
+
+        Args:
+            base_url (str): API root, e.g. "https://api.together.xyz/v1"
+            api_key (str): Bearer token, or None for unauthenticated local servers
+            model (str): Default model name
+            timeout (float): Seconds per attempt
+            max_retries (int): Retries after the first attempt
+            max_connections (int): Size of the connection pool
+            requests_per_minute (float): Request rate limit, 0 for none
+            tokens_per_minute (float): Prompt + completion token rate limit, 0 for none
+        """
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.model = model
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.max_connections = max_connections
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.stats = {"requests": 0, "retries": 0, "failures": 0, "rate_limited": 0, "throttle_seconds": 0.0}
+        self._http = None
+        self._request_bucket = None
+        self._token_bucket = None
+        self._loop = None
+        self._lock = threading.Lock()
+
+        # SDK-style facade: client.chat.completions.create(...)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    async def acomplete(self, messages, model=None, max_tokens=None, **params):
+        """
+        Request one chat completion.
+
+        Args:
+            messages (list): Chat messages
+            model (str): Model name, defaults to the client's
+            max_tokens (int): Completion length limit
+            **params: Further request fields (temperature, ...)
+
+        Returns:
+            SimpleNamespace: Response with `choices[0].message.content`
+        """
+        body = self._body(messages, model, max_tokens, stream=False, **params)
+        await self._throttle(messages, max_tokens)
+        response, _ = await self._send(body)
+        return _namespace(response.json())
+
+    async def astream(self, messages, model=None, max_tokens=None, **params):
+        """
+        Request a chat completion as server-sent events.
+
+        Yields:
+            SimpleNamespace: Chunks with `choices[0].delta.content`
+        """
+        body = self._body(messages, model, max_tokens, stream=True, **params)
+        await self._throttle(messages, max_tokens)
+        response, deadline = await self._send(body, stream=True)
+        loop = asyncio.get_running_loop()
+        lines = response.aiter_lines()
+        try:
+            while True:
+                # The attempt's timeout also covers reading the stream
+                try:
+                    line = await asyncio.wait_for(lines.__anext__(), max(0.0, deadline - loop.time()))
+                except StopAsyncIteration:
+                    break
+                except asyncio.TimeoutError:
+                    self.stats["failures"] += 1
+                    raise LLMError(f"Stream not finished after {self.timeout:.0f}s") from None
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                yield _namespace(json.loads(data))
+        finally:
+            await response.aclose()
+
+    def create(self, model=None, messages=None, stream=False, **params):
+        """
+        Blocking facade matching the Together/OpenAI SDKs.
+
+        Returns:
+            SimpleNamespace or iterator: The response, or chunks when streaming
+        """
+        if stream:
+            return self._iterate(self.astream(messages, model=model, **params))
+        return self._run(self.acomplete(messages, model=model, **params))
+
+    def close(self):
+        """Close pooled connections and stop the event loop."""
+        with self._lock:
+            if self._loop is None:
+                return
+            loop = self._loop
+            self._loop = None
+            if self._http is not None:
+                asyncio.run_coroutine_threadsafe(self._http.aclose(), loop).result()
+                self._http = None
+            # Finalize streams that were abandoned mid-iteration before the loop stops
+            asyncio.run_coroutine_threadsafe(loop.shutdown_asyncgens(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+
+    async def _send(self, body, stream=False):
+        """
+        POST with retries.
+
+        Each attempt is limited to `timeout` seconds in total; a streamed
+        body must be read by the returned deadline.
+
+        Returns:
+            tuple: (successful response, event loop time the attempt ends)
+        """
+        import httpx
+
+        http = self._get_http()
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.max_retries + 1):
+            self.stats["requests"] += 1
+            delay = None
+            deadline = loop.time() + self.timeout
+            try:
+                request = http.build_request("POST", "/chat/completions", json=body)
+                response = await asyncio.wait_for(http.send(request, stream=stream), self.timeout)
+                if response.status_code < 400:
+                    return response, deadline
+                if stream:
+                    await asyncio.wait_for(response.aread(), max(0.0, deadline - loop.time()))
+                if response.status_code not in RETRY_STATUS or attempt == self.max_retries:
+                    self.stats["failures"] += 1
+                    raise LLMError(f"HTTP {response.status_code}: {response.text[:200]}", response.status_code)
+                if response.status_code == 429:
+                    self.stats["rate_limited"] += 1
+                delay = _retry_after(response)
+                error = f"HTTP {response.status_code}"
+            except (asyncio.TimeoutError, httpx.TimeoutException, httpx.TransportError) as e:
+                if attempt == self.max_retries:
+                    self.stats["failures"] += 1
+                    raise LLMError(f"{type(e).__name__}: {str(e)}") from e
+                error = type(e).__name__
+
+            # Full jitter keeps clients that failed together from retrying together
+            if delay is None:
+                delay = random.uniform(0, min(30.0, 0.5 * 2 ** attempt))
+            self.stats["retries"] += 1
+            print(f"LLM request failed ({error}), retrying in {delay:.1f}s "
+                  f"(attempt {attempt + 1}/{self.max_retries})")
+            await asyncio.sleep(delay)
+
+    async def _throttle(self, messages, max_tokens):
+        """Wait for both rate limiters."""
+        if self._request_bucket is None:
+            self._request_bucket = TokenBucket(self.requests_per_minute)
+            self._token_bucket = TokenBucket(self.tokens_per_minute)
+        tokens = sum(count_tokens(m.get("content") or "") for m in messages) + (max_tokens or 0)
+        waited = await self._request_bucket.acquire(1)
+        waited += await self._token_bucket.acquire(tokens)
+        self.stats["throttle_seconds"] += waited
+
+    def _body(self, messages, model, max_tokens, stream, **params):
+        """Build the request JSON."""
+        body = {"model": model or self.model, "messages": messages, "stream": stream}
+        if max_tokens is not None:
+            body["max_tokens"] = max_tokens
+        body.update(params)
+        return body
+
+    def _get_http(self):
+        """Create the pooled HTTP client (on the event loop thread)."""
+        if self._http is None:
+            import httpx
+
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._http = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=httpx.Timeout(self.timeout, connect=min(10.0, self.timeout)),
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections),
+            )
+        return self._http
+
+    def _get_loop(self):
+        """Start the background event loop once."""
+        with self._lock:
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                threading.Thread(target=_run_loop, args=(loop,), name="llm-client", daemon=True).start()
+                self._loop = loop
+            return self._loop
+
+    def _run(self, coroutine):
+        """Run a coroutine on the background loop and wait for its result."""
+        return asyncio.run_coroutine_threadsafe(coroutine, self._get_loop()).result()
+
+    def _iterate(self, agen):
+        """Iterate an async generator from synchronous code."""
+        loop = self._get_loop()
+        try:
+            while True:
+                try:
+                    yield asyncio.run_coroutine_threadsafe(agen.__anext__(), loop).result()
+                except StopAsyncIteration:
+                    return
+        finally:
+            # After close() the loop has finalized the generator already
+            if self._loop is loop:
+                asyncio.run_coroutine_threadsafe(agen.aclose(), loop).result()
+
+
+def _run_loop(loop):
+    """Event loop thread: run until close() stops the loop, then release it."""
+    try:
+        loop.run_forever()
+    finally:
+        loop.close()
+
+
+def _retry_after(response):
+    """Seconds from a Retry-After header, if the server sent one."""
+    try:
+        return min(60.0, float(response.headers.get("retry-after")))
+    except (TypeError, ValueError):
+        return None
+
+
+class _Record(SimpleNamespace):
+    """
+    Decoded JSON object whose absent fields read as None, like the SDKs' models.
+
+    Streaming servers omit fields freely: the first chunk's delta often has
+    only "role" and the last one is empty ({"delta": {}, "finish_reason": "stop"}).
+    """
+
+    def __getattr__(self, name):
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return None
+
+
+def _namespace(value):
+    """Turn decoded JSON into attribute-accessible objects."""
+    if isinstance(value, dict):
+        return _Record(**{key: _namespace(item) for key, item in value.items()})
+    if isinstance(value, list):
+        return [_namespace(item) for item in value]
+    return value
@@ -1,21 +1,49 @@
 import time
-from datetime import datetime
-from config import DEFAULT_LLM_MODEL
+import hashlib
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from config import (
+    DEFAULT_LLM_MODEL, SUMMARY_CHUNK_TOKENS, SUMMARY_MAP_CONCURRENCY,
+    SUMMARY_CACHE_DIR, SUMMARY_CACHE_MAX_MB, SUMMARY_CACHE_TTL_HOURS, TRANSCRIPT_COMPACTION
+)
+from src.summarization.chunking import CHARS_PER_TOKEN, count_tokens, chunk_text
+from src.summarization.compaction import compact_transcript
+from src.summarization.extractive import extract_summary, format_summary
+from src.utils.disk_cache import DiskCache
+from src.utils.metrics import ERRORS, LLM_TOKENS, SUMMARY_CACHE_LOOKUPS, SUMMARY_TTFT, span, track
+
+# Sessions whose rolling summary state is kept
+ROLLING_SESSIONS = 256
 
 class MeetingSummarizer:
     """
     A class to generate summaries of meeting transcripts using LLMs.
     """
     
-    def __init__(self, client=None):
+    def __init__(self, client=None, chunk_tokens=SUMMARY_CHUNK_TOKENS, concurrency=SUMMARY_MAP_CONCURRENCY,
+                 cache=None, compact=TRANSCRIPT_COMPACTION):
         """
         Initialize the Meeting Summarizer.
         
         Args:
-            client: The Together API client instance. If None, use placeholder summarization.
+            client: An AsyncLLMClient (or Together/OpenAI SDK client). If None, summarize offline (extractive).
+            chunk_tokens (int): Longest transcript summarized in one request; longer
+                                ones are split into chunks of this many tokens
+            concurrency (int): Chunk requests sent at the same time
+            cache (DiskCache): Summary cache; defaults to one in SUMMARY_CACHE_DIR
+            compact (bool): Remove fillers and repeated phrases before summarizing
         """
         self.client = client
         self.model = DEFAULT_LLM_MODEL
+        self.chunk_tokens = chunk_tokens
+        self.concurrency = max(1, concurrency)
+        self.cache = cache or DiskCache(SUMMARY_CACHE_DIR, SUMMARY_CACHE_MAX_MB * 1024 * 1024,
+                                        ttl_seconds=SUMMARY_CACHE_TTL_HOURS * 3600)
+        self.compact = compact
+        # Rolling summary state per session: the transcript summarized so far and its summary
+        self._rolling = OrderedDict()
+        self._rolling_lock = threading.Lock()
         
         # Prompt template for meeting summarization
         self.prompt_template = """
@@ -39,118 +67,451 @@ class MeetingSummarizer:
         4. Action items (with responsible persons and deadlines, if any)
         5. Next steps
         """
+        
+        # Map step for long meetings: notes on one part of the transcript
+        self.map_prompt_template = """
+        SYSTEM: You are a professional meeting assistant taking notes on one part of a long meeting.
+        
+        INSTRUCTIONS:
+        • List the topics discussed in this part
+        • Extract decisions and action items, with responsible persons and deadlines if mentioned
+        • Keep names, numbers and dates exactly as stated
+        • Use concise bullet points and do not add anything that is not in the text
+        
+        Meeting transcript or notes (part {index} of {count}): {content}
+        """
+        
+        # Rolling update: fold newly transcribed text into an existing summary
+        self.update_prompt_template = """
+        SYSTEM: You are a professional meeting assistant keeping a running summary of a meeting in progress.
+        
+        INSTRUCTIONS:
+        • Below is the current summary, followed by what was said since it was written
+        • Update the summary with the new content: add topics, decisions and action items, and
+          revise earlier points if the new content changes them
+        • Keep everything from the current summary that is still accurate
+        • Keep the same structure and a concise, objective tone
+        
+        Current summary: {summary}
+        
+        New transcript: {content}
+        
+        Please provide the complete updated meeting summary including:
+        1. Meeting topic
+        2. Key discussion points
+        3. Decisions made
+        4. Action items (with responsible persons and deadlines, if any)
+        5. Next steps
+        """
+        
+        # Reduce step: merge the notes of all parts into the final summary
+        self.reduce_prompt_template = """
+        SYSTEM: You are a professional meeting assistant specialized in summarizing meeting content.
+        
+        INSTRUCTIONS:
+        • The notes below were taken on consecutive parts of one meeting, in order
+        • Merge them into one summary, removing repetition between parts
+        • Organize information into concise bullet points, ordered by importance
+        • Maintain an objective and neutral tone
+        
+        Meeting notes: {content}
+        
+        Please provide a structured meeting summary including:
+        1. Meeting topic
+        2. Key discussion points
+        3. Decisions made
+        4. Action items (with responsible persons and deadlines, if any)
+        5. Next steps
+        """
     
-    def generate_summary(self, transcript):
+    def generate_summary(self, transcript, use_cache=True, fallback=True, stats=None):
         """
         Generate a meeting summary from the transcript.
         
         Args:
             transcript (str): Meeting transcript text
+            use_cache (bool): Return a cached summary if there is one; when False
+                              a fresh summary is generated (and replaces the cached one)
+            fallback (bool): On an empty transcript or an LLM error, return a message
+                             (and an offline summary) instead of raising
+            stats (dict): If given, receives this call's "compaction" token counts and,
+                          for LLM summaries, "ttft_seconds", "total_seconds" and "cached"
             
         Returns:
             str: Generated meeting summary
+            
+        Raises:
+            ValueError: If the transcript is empty and `fallback` is False
+            Exception: The LLM client's error if the request fails and `fallback` is False
         """
+        with track("summarize"):
+            return self._generate_summary(transcript, use_cache, fallback, {} if stats is None else stats)
+    
+    def _generate_summary(self, transcript, use_cache, fallback, stats):
+        """generate_summary() without the request metrics."""
         if not transcript or transcript.strip() == "":
+            if not fallback:
+                raise ValueError("Transcript is empty")
             return "Error: Transcript is empty. Please record and transcribe a meeting first."
         
-        # Format the prompt with the transcript
-        prompt = self.prompt_template.format(content=transcript)
+        transcript = self._compact(transcript, stats)
         
-        # If no client provided, use placeholder summarization
+        # If no client provided, summarize offline
         if self.client is None:
-            return self._generate_placeholder_summary(transcript)
+            return self._generate_offline_summary(transcript)
         
-        # Use Together API for real summarization
+        start = time.time()
+        cache_key = self._cache_key(transcript)
+        if use_cache:
+            cached = self._cached_summary(cache_key)
+            if cached is not None:
+                print("Summary cache hit")
+                stats.update(cached=True, total_seconds=time.time() - start)
+                return cached
+        
+        # Use the LLM for real summarization
         try:
+            if count_tokens(transcript) <= self.chunk_tokens:
+                # Format the prompt with the transcript
+                summary = self._complete(self.prompt_template.format(content=transcript))
+            else:
+                summary = self._map_reduce(transcript)
+        except Exception as e:
+            print(f"Error generating summary: {str(e)}")
+            ERRORS.inc(operation="summarize")
+            if not fallback:
+                raise
+            # Fall back to the offline summary if the API fails
+            return f"Error using API: {str(e)}\n\n" + self._generate_offline_summary(transcript)
+        
+        stats.update(cached=False, total_seconds=time.time() - start)
+        if summary:
+            self.cache.put(cache_key, {"summary": summary})
+        return summary
+    
+    def stream_summary(self, transcript, use_cache=True, stats=None):
+        """
+        Generate a meeting summary as it is written.
+        
+        Long transcripts are first reduced to notes (see _map_reduce); only
+        the final request is streamed. A cached summary is yielded in one piece.
+        
+        Args:
+            transcript (str): Meeting transcript text
+            use_cache (bool): See generate_summary
+            stats (dict): See generate_summary
+            
+        Yields:
+            str: Pieces of the summary, in order
+        """
+        with track("summarize"):
+            yield from self._summarize_stream(transcript, use_cache, [], {} if stats is None else stats)
+    
+    def stream_rolling_summary(self, session_id, transcript, full=False, stats=None):
+        """
+        Keep a per-session summary up to date as the transcript grows.
+        
+        When the transcript extends the one summarized last time for this
+        session, only the new text is sent, together with the previous
+        summary, in a small update prompt. Otherwise (first call, edited
+        transcript, or `full`) the whole transcript is summarized.
+        
+        Args:
+            session_id (str): Session the rolling state belongs to
+            transcript (str): The session's full transcript so far
+            full (bool): Re-summarize everything, ignoring state and cache
+            stats (dict): See generate_summary
+            
+        Yields:
+            str: Pieces of the summary, in order
+        """
+        with track("summarize"):
+            yield from self._stream_rolling(session_id, transcript, full, {} if stats is None else stats)
+    
+    def _stream_rolling(self, session_id, transcript, full, stats):
+        """stream_rolling_summary() without the request metrics."""
+        with self._rolling_lock:
+            state = self._rolling.get(session_id)
+            if state is not None:
+                self._rolling.move_to_end(session_id)
+        
+        if (full or state is None or self.client is None or not transcript
+                or not transcript.startswith(state["transcript"])):
+            pieces = []
+            if (yield from self._summarize_stream(transcript, not full, pieces, stats)):
+                self._remember(session_id, transcript, "".join(pieces))
+            return
+        
+        new_text = transcript[len(state["transcript"]):]
+        if not new_text.strip():
+            yield state["summary"]
+            return
+        
+        def build_prompt():
+            content = self._compact(new_text, stats)
+            if count_tokens(content) > self.chunk_tokens:
+                content = "\n\n".join(self._collect_notes(content))
+            print(f"Updating rolling summary with {count_tokens(content)} new tokens")
+            return self.update_prompt_template.format(summary=state["summary"], content=content)
+        
+        pieces = []
+        if (yield from self._stream_prompt(build_prompt, transcript, pieces, stats)):
+            self._remember(session_id, transcript, "".join(pieces))
+    
+    def _summarize_stream(self, transcript, use_cache, pieces, stats):
+        """
+        Stream a summary of the whole transcript.
+        
+        Args:
+            transcript (str): Meeting transcript text
+            use_cache (bool): See generate_summary
+            pieces (list): Receives the summary text as it is yielded
+            stats (dict): Receives this call's statistics, see generate_summary
+            
+        Returns:
+            bool: True if an LLM summary was produced (not an error or fallback)
+        """
+        if not transcript or transcript.strip() == "":
+            yield "Error: Transcript is empty. Please record and transcribe a meeting first."
+            return False
+        
+        transcript = self._compact(transcript, stats)
+        
+        if self.client is None:
+            yield self._generate_offline_summary(transcript)
+            return False
+        
+        start = time.time()
+        cache_key = self._cache_key(transcript)
+        if use_cache:
+            cached = self._cached_summary(cache_key)
+            if cached is not None:
+                elapsed = time.time() - start
+                stats.update(cached=True, ttft_seconds=elapsed, total_seconds=elapsed)
+                print("Summary cache hit")
+                pieces.append(cached)
+                yield cached
+                return True
+        
+        def build_prompt():
+            if count_tokens(transcript) <= self.chunk_tokens:
+                return self.prompt_template.format(content=transcript)
+            return self.reduce_prompt_template.format(content="\n\n".join(self._collect_notes(transcript)))
+        
+        completed = yield from self._stream_prompt(build_prompt, transcript, pieces, stats)
+        if completed:
+            self.cache.put(cache_key, {"summary": "".join(pieces)})
+        return completed
+    
+    def _stream_prompt(self, build_prompt, transcript, pieces, stats):
+        """
+        Stream one completion, timing the first token and falling back offline on errors.
+        
+        Args:
+            build_prompt (callable): Returns the prompt; may call the LLM itself (map step)
+            transcript (str): Transcript for the offline fallback
+            pieces (list): Receives the streamed deltas
+            stats (dict): Receives "ttft_seconds" and "total_seconds"
+            
+        Returns:
+            bool: True if the stream completed with some output
+        """
+        start = time.time()
+        first_token = None
+        try:
+            for delta in self._stream(build_prompt()):
+                if first_token is None:
+                    first_token = time.time() - start
+                    SUMMARY_TTFT.observe(first_token)
+                pieces.append(delta)
+                yield delta
+        except Exception as e:
+            print(f"Error generating summary: {str(e)}")
+            ERRORS.inc(operation="summarize")
+            if first_token is None:
+                # Fall back to the offline summary if the API fails before anything was written
+                yield f"Error using API: {str(e)}\n\n" + self._generate_offline_summary(transcript)
+            else:
+                yield f"\n\n[Summary interrupted: {str(e)}]"
+            return False
+        
+        total = time.time() - start
+        stats.update(cached=False, ttft_seconds=first_token, total_seconds=total)
+        if first_token is not None:
+            print(f"Streamed summary: first token after {first_token:.2f}s, complete after {total:.2f}s")
+        return bool(pieces)
+    
+    def _remember(self, session_id, transcript, summary):
+        """Store a session's rolling summary state, evicting the least recently used sessions."""
+        with self._rolling_lock:
+            self._rolling[session_id] = {"transcript": transcript, "summary": summary}
+            self._rolling.move_to_end(session_id)
+            while len(self._rolling) > ROLLING_SESSIONS:
+                self._rolling.popitem(last=False)
+    
+    def _stream(self, prompt):
+        """
+        Send one prompt to the LLM in streaming mode.
+        
+        Args:
+            prompt (str): User message
+            
+        Yields:
+            str: Non-empty content deltas
+        """
+        LLM_TOKENS.inc(count_tokens(prompt), direction="sent")
+        received = 0
+        try:
+            with span("llm"):
+                stream = self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[{"role": "user", "content": prompt}],
+                    stream=True,
+                )
+                for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta.content
+                    if delta:
+                        received += len(delta)
+                        yield delta
+        finally:
+            LLM_TOKENS.inc(received / CHARS_PER_TOKEN, direction="received")
+    
+    def _compact(self, transcript, stats):
+        """
+        Compact the transcript if enabled and log the token saving.
+        
+        Args:
+            transcript (str): Raw transcript text
+            stats (dict): Receives the token counts as "compaction"
+            
+        Returns:
+            str: Transcript to summarize
+        """
+        if not self.compact:
+            return transcript
+        with span("prompt_build"):
+            compacted, compaction = compact_transcript(transcript)
+        stats["compaction"] = compaction
+        print(f"Compacted transcript: {compaction['original_tokens']} -> {compaction['compacted_tokens']} tokens "
+              f"({compaction['saved_ratio']:.0%} fewer)")
+        # Never send an empty prompt because everything looked like filler
+        return compacted or transcript
+    
+    def _cached_summary(self, cache_key):
+        """Look a summary up in the cache, counting the hit or miss in the metrics."""
+        cached = self.cache.get(cache_key)
+        SUMMARY_CACHE_LOOKUPS.inc(result="miss" if cached is None else "hit")
+        return None if cached is None else cached["summary"]
+    
+    def _cache_key(self, transcript):
+        """
+        Build the summary cache key.
+        
+        Whitespace differences in the transcript do not matter; any change to
+        the prompts, the chunk budget or the LLM model does.
+        """
+        normalized = " ".join(transcript.split())
+        digest = hashlib.sha256()
+        for part in (normalized, self.prompt_template, self.map_prompt_template,
+                     self.reduce_prompt_template, str(self.chunk_tokens), self.model):
+            digest.update(part.encode("utf-8"))
+            digest.update(b"\0")
+        return digest.hexdigest()
+    
+    def _complete(self, prompt):
+        """
+        Send one prompt to the LLM.
+        
+        Args:
+            prompt (str): User message
+            
+        Returns:
+            str: Completion text
+        """
+        LLM_TOKENS.inc(count_tokens(prompt), direction="sent")
+        with span("llm"):
             response = self.client.chat.completions.create(
                 model=self.model,
                 messages=[{"role": "user", "content": prompt}],
             )
-            return response.choices[0].message.content
-        except Exception as e:
-            print(f"Error generating summary: {str(e)}")
-            # Fallback to placeholder if API fails
-            return f"Error using API: {str(e)}\n\n" + self._generate_placeholder_summary(transcript)
+        content = response.choices[0].message.content
+        LLM_TOKENS.inc(count_tokens(content or ""), direction="received")
+        return content
     
-    def _generate_placeholder_summary(self, transcript):
+    def _map_reduce(self, transcript):
         """
-        Generate a placeholder summary when no API client is available.
-        This is used for testing or when API keys aren't configured.
+        Summarize a long transcript: take notes on chunks in parallel, then merge them.
+        
+        Notes that together still exceed the token budget are merged in
+        groups first, so transcripts of any length fit the final request.
         
         Args:
             transcript (str): Meeting transcript text
             
         Returns:
-            str: A simple placeholder summary
+            str: Generated meeting summary
         """
-        # Extract some content for the summary
-        words = transcript.split()
-        word_count = len(words)
+        start = time.time()
+        notes = self._collect_notes(transcript)
+        summary = self._complete(self.reduce_prompt_template.format(content="\n\n".join(notes)))
+        print(f"Generated summary of {count_tokens(transcript)} transcript tokens in {time.time() - start:.1f}s")
+        return summary
+    
+    def _collect_notes(self, transcript):
+        """
+        Map step: notes on transcript chunks, merged until they fit one request.
         
-        # Get some "topics" (just the most frequent words for this placeholder)
-        common_words = self._get_common_words(transcript)
+        Args:
+            transcript (str): Meeting transcript text
+            
+        Returns:
+            list: Notes in transcript order
+        """
+        start = time.time()
+        chunks = chunk_text(transcript, self.chunk_tokens)
+        notes = self._map(chunks)
+        print(f"Summarized {len(chunks)} transcript chunks in {time.time() - start:.1f}s "
+              f"({min(self.concurrency, len(chunks))} concurrent requests)")
         
-        # Simulated processing time based on transcript length
-        processing_time = min(2.0, 0.01 * word_count)
-        time.sleep(processing_time)
+        while len(notes) > 1 and count_tokens("\n\n".join(notes)) > self.chunk_tokens:
+            groups = chunk_text("\n".join(notes), self.chunk_tokens)
+            if len(groups) >= len(notes):
+                # Each note alone fills the budget; merging cannot shrink them further
+                break
+            notes = self._map(groups)
+        return notes
+    
+    def _map(self, parts):
+        """
+        Take notes on each part concurrently.
         
-        # Create a simple summary
-        return f"""
-# Meeting Summary
-
-## Meeting Overview
-This meeting transcript contains approximately {word_count} words and appears to discuss topics related to {', '.join(common_words[:3])}.
-
-## Key Discussion Points
-- The discussion covered topics including {', '.join(common_words[:5])}
-- The meeting participants exchanged views on various aspects of the project
-- Several points were raised regarding implementation details
-
-## Decisions Made
-- Further discussion may be needed to reach concrete decisions
-- The team should continue working on the current tasks
-
-## Action Items
-1. Review the full transcript for more detailed information
-2. Consider scheduling a follow-up meeting
-3. Prepare any necessary documents related to {common_words[0] if common_words else "the project"}
-
-## Next Steps
-- Determine priorities based on the discussion
-- Allocate resources accordingly
-- Plan follow-up meetings as needed
-
-*Note: This is a placeholder summary. For a more accurate and detailed summary, please set up the Together API key.*
+        Args:
+            parts (list): Transcript chunks or groups of notes
+            
+        Returns:
+            list: Notes in the same order
         """
+        prompts = [
+            self.map_prompt_template.format(index=index, count=len(parts), content=part)
+            for index, part in enumerate(parts, 1)
+        ]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(prompts))) as pool:
+            return list(pool.map(self._complete, prompts))
     
-    def _get_common_words(self, text, min_length=4, max_words=10):
+    def _generate_offline_summary(self, transcript):
         """
-        Get the most common words in the text for the placeholder summary.
+        Generate an extractive summary locally when no LLM is available.
         
         Args:
-            text (str): The text to analyze
-            min_length (int): Minimum length of words to consider
-            max_words (int): Maximum number of words to return
+            transcript (str): Meeting transcript text
             
         Returns:
-            list: List of common words
-        """
-        # Simple word frequency analysis
-        words = text.lower().split()
-        word_freq = {}
-        
-        # Common English stopwords to exclude
-        stopwords = set([
-            "the", "and", "that", "this", "with", "for", "was", "were", "have", 
-            "from", "they", "their", "what", "when", "where", "which", "there"
-        ])
-        
-        for word in words:
-            # Clean the word of punctuation
-            clean_word = ''.join(c for c in word if c.isalnum())
-            if len(clean_word) >= min_length and clean_word not in stopwords:
-                word_freq[clean_word] = word_freq.get(clean_word, 0) + 1
-        
-        # Sort by frequency
-        sorted_words = sorted(word_freq.items(), key=lambda x: x[1], reverse=True)
-        return [word for word, _ in sorted_words[:max_words]]
\ No newline at end of file
+            str: Summary built from the transcript's key sentences
+        """
+        start = time.time()
+        with span("offline_summary"):
+            summary = format_summary(extract_summary(transcript))
+        print(f"Generated offline extractive summary in {time.time() - start:.2f}s")
+        return summary
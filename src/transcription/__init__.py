@@ -1,6 +1,11 @@
 """Transcription module for AI-Wizard."""
 
 from src.transcription.whisper_transcriber import WhisperTranscriber
-from src.transcription.whisper_patch import patch_whisper_ffmpeg, install_ffmpeg
+from src.transcription.model_registry import ModelRegistry, get_default_registry, MODEL_SIZES
+from src.transcription.segments import SegmentTable
+from src.transcription.whisper_patch import patch_whisper_ffmpeg, install_ffmpeg, resolve_ffmpeg
 
-__all__ = ['WhisperTranscriber', 'patch_whisper_ffmpeg', 'install_ffmpeg']
\ No newline at end of file
+__all__ = [
+    'WhisperTranscriber', 'ModelRegistry', 'get_default_registry', 'MODEL_SIZES',
+    'SegmentTable', 'patch_whisper_ffmpeg', 'install_ffmpeg', 'resolve_ffmpeg'
+]
@@ -0,0 +1,228 @@
+"""
+Audio decoding for transcription.
+
+WAV files (what Gradio's microphone recorder writes) are memory-mapped and
+converted to 16 kHz mono float32 with NumPy, without any subprocess. Other
+formats fall back to a single ffmpeg process streaming raw PCM.
+"""
+import os
+import struct
+import subprocess
+
+import numpy as np
+
+from src.transcription.whisper_patch import resolve_ffmpeg
+
+# Whisper's fixed input rate
+SAMPLE_RATE = 16000
+
+_WAVE_FORMAT_PCM = 0x0001
+_WAVE_FORMAT_IEEE_FLOAT = 0x0003
+_WAVE_FORMAT_EXTENSIBLE = 0xFFFE
+
+
+def load_audio(path, sr=SAMPLE_RATE):
+    """
+    Decode an audio file to a mono float32 waveform.
+
+    Args:
+        path (str): Path to the audio file
+        sr (int): Target sample rate
+
+    Returns:
+        np.ndarray: float32 samples in [-1, 1] at `sr` Hz
+    """
+    try:
+        audio, source_sr = read_wav(path)
+    except ValueError:
+        return load_audio_ffmpeg(path, sr)
+    return resample(audio, source_sr, sr)
+
+
+def read_wav(path):
+    """
+    Read an uncompressed WAV file through a memory map.
+
+    Supports 8/16/24/32-bit integer PCM and 32/64-bit float, including
+    WAVE_FORMAT_EXTENSIBLE headers. Multi-channel audio is averaged to mono.
+
+    Args:
+        path (str): Path to the WAV file
+
+    Returns:
+        tuple: (float32 mono samples, sample rate)
+
+    Raises:
+        ValueError: If the file is not a WAV file this reader understands
+    """
+    file_size = os.path.getsize(path)
+    fmt = None
+    data_offset = data_size = None
+
+    with open(path, "rb") as f:
+        header = f.read(12)
+        if len(header) < 12 or header[:4] != b"RIFF" or header[8:12] != b"WAVE":
+            raise ValueError("not a RIFF/WAVE file")
+
+        while True:
+            chunk_header = f.read(8)
+            if len(chunk_header) < 8:
+                break
+            chunk_id, chunk_size = struct.unpack("<4sI", chunk_header)
+            if chunk_id == b"fmt ":
+                fmt = f.read(chunk_size)
+            elif chunk_id == b"data":
+                data_offset = f.tell()
+                # Streaming writers may leave the size unset; trust the file length
+                data_size = min(chunk_size, file_size - data_offset)
+                break
+            else:
+                f.seek(chunk_size, os.SEEK_CUR)
+            if chunk_size % 2:
+                f.seek(1, os.SEEK_CUR)
+
+    if fmt is None or len(fmt) < 16 or data_offset is None:
+        raise ValueError("missing fmt or data chunk")
+
+    format_tag, channels, sample_rate, _, block_align, bits = struct.unpack("<HHIIHH", fmt[:16])
+    if format_tag == _WAVE_FORMAT_EXTENSIBLE and len(fmt) >= 26:
+        format_tag = struct.unpack("<H", fmt[24:26])[0]
+    if channels < 1 or sample_rate < 1:
+        raise ValueError("invalid WAV header")
+    if bits not in (8, 16, 24, 32, 64) or block_align != channels * (bits // 8):
+        raise ValueError(f"unsupported WAV layout ({bits} bits, block align {block_align})")
+
+    sample_width = bits // 8
+    n_frames = data_size // (sample_width * channels)
+    if n_frames == 0:
+        return np.zeros(0, dtype=np.float32), sample_rate
+    count = n_frames * channels
+
+    if format_tag == _WAVE_FORMAT_IEEE_FLOAT and bits in (32, 64):
+        raw = np.memmap(path, dtype=f"<f{sample_width}", mode="r", offset=data_offset, shape=(count,))
+        samples = raw.astype(np.float32)
+    elif format_tag == _WAVE_FORMAT_PCM and bits == 8:
+        raw = np.memmap(path, dtype=np.uint8, mode="r", offset=data_offset, shape=(count,))
+        samples = (raw.astype(np.float32) - 128.0) / 128.0
+    elif format_tag == _WAVE_FORMAT_PCM and bits in (16, 32):
+        raw = np.memmap(path, dtype=f"<i{sample_width}", mode="r", offset=data_offset, shape=(count,))
+        samples = raw.astype(np.float32) / float(2 ** (bits - 1))
+    elif format_tag == _WAVE_FORMAT_PCM and bits == 24:
+        raw = np.memmap(path, dtype=np.uint8, mode="r", offset=data_offset, shape=(count, 3))
+        # Place the 3 bytes in the top of an int32 and shift back to sign-extend
+        widened = np.zeros((count, 4), dtype=np.uint8)
+        widened[:, 1:] = raw
+        samples = (widened.view("<i4").ravel() >> 8).astype(np.float32) / float(2 ** 23)
+    else:
+        raise ValueError(f"unsupported WAV encoding (format {format_tag}, {bits} bits)")
+
+    if channels > 1:
+        samples = samples.reshape(n_frames, channels).mean(axis=1, dtype=np.float32)
+    return np.ascontiguousarray(samples, dtype=np.float32), sample_rate
+
+
+def to_float32_mono(samples):
+    """
+    Convert integer or float samples, mono or (frames, channels), to float32 mono.
+
+    Args:
+        samples (np.ndarray): Raw samples, e.g. a Gradio microphone chunk
+
+    Returns:
+        np.ndarray: float32 samples in [-1, 1]
+    """
+    samples = np.asarray(samples)
+    if np.issubdtype(samples.dtype, np.integer):
+        info = np.iinfo(samples.dtype)
+        samples = (samples.astype(np.float32) - (info.max + info.min + 1) / 2) / ((info.max - info.min + 1) / 2)
+    else:
+        samples = samples.astype(np.float32, copy=False)
+    if samples.ndim > 1:
+        samples = samples.mean(axis=1, dtype=np.float32)
+    return samples
+
+
+def resample(audio, orig_sr, target_sr=SAMPLE_RATE):
+    """
+    Resample a mono waveform with a windowed-sinc low-pass and linear interpolation.
+
+    Args:
+        audio (np.ndarray): float32 samples
+        orig_sr (int): Sample rate of `audio`
+        target_sr (int): Desired sample rate
+
+    Returns:
+        np.ndarray: float32 samples at `target_sr`
+    """
+    if orig_sr == target_sr or len(audio) == 0:
+        return audio.astype(np.float32, copy=False)
+
+    if target_sr < orig_sr:
+        # Anti-aliasing filter at the new Nyquist frequency
+        audio = _lowpass(audio, cutoff=0.5 * target_sr / orig_sr)
+
+    n_out = int(round(len(audio) * target_sr / orig_sr))
+    positions = np.arange(n_out, dtype=np.float64) * (orig_sr / target_sr)
+    return np.interp(positions, np.arange(len(audio), dtype=np.float64), audio).astype(np.float32)
+
+
+def _lowpass(audio, cutoff, num_taps=101, block_size=1 << 13):
+    """
+    Apply a Hann-windowed sinc FIR filter using blockwise FFT convolution.
+
+    Args:
+        audio (np.ndarray): float32 samples
+        cutoff (float): Cutoff frequency as a fraction of the sample rate (< 0.5)
+        num_taps (int): Filter length (odd)
+        block_size (int): Samples per FFT block
+
+    Returns:
+        np.ndarray: Filtered float32 samples, same length as `audio`
+    """
+    n = np.arange(num_taps) - (num_taps - 1) / 2
+    taps = 2 * cutoff * np.sinc(2 * cutoff * n) * np.hanning(num_taps)
+    taps /= taps.sum()
+
+    fft_size = 1 << int(np.ceil(np.log2(block_size + num_taps - 1)))
+    taps_fft = np.fft.rfft(taps, fft_size)
+
+    # Overlap-add keeps memory bounded for hour-long recordings
+    out = np.zeros(len(audio) + num_taps - 1, dtype=np.float32)
+    for start in range(0, len(audio), block_size):
+        block = audio[start:start + block_size]
+        filtered = np.fft.irfft(np.fft.rfft(block, fft_size) * taps_fft, fft_size)
+        end = start + len(block) + num_taps - 1
+        out[start:end] += filtered[:len(block) + num_taps - 1]
+
+    delay = (num_taps - 1) // 2
+    return out[delay:delay + len(audio)]
+
+
+def load_audio_ffmpeg(path, sr=SAMPLE_RATE):
+    """
+    Decode a compressed audio file with one ffmpeg process.
+
+    Args:
+        path (str): Path to the audio file
+        sr (int): Target sample rate
+
+    Returns:
+        np.ndarray: float32 samples at `sr` Hz
+    """
+    ffmpeg_path = resolve_ffmpeg()
+    if ffmpeg_path is None:
+        raise RuntimeError("ffmpeg is required to decode this file. "
+                           "Run `python main.py --setup-ffmpeg` to install it.")
+
+    cmd = [
+        ffmpeg_path, "-nostdin", "-threads", "0",
+        "-i", path,
+        "-f", "s16le", "-ac", "1", "-acodec", "pcm_s16le", "-ar", str(sr),
+        "-"
+    ]
+    try:
+        out = subprocess.run(cmd, capture_output=True, check=True).stdout
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to load audio: {e.stderr.decode(errors='replace')}") from e
+
+    return np.frombuffer(out, np.int16).astype(np.float32) / 32768.0
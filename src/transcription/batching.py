@@ -0,0 +1,283 @@
+"""
+Cross-request dynamic batching of Whisper inference.
+
+Each request is cut into windows of at most 30 seconds whose log-mel
+spectrograms are queued. A scheduler thread collects windows from all
+concurrent requests for up to `max_wait` seconds (or until `max_batch_size`
+windows are waiting), runs the encoder and decoder on them as one batch and
+hands every result back to its request.
+
+Batched windows decode without timestamps, one segment per window. Like
+model.transcribe, windows whose text looks repetitive (compression ratio) or
+unlikely (average log-probability) are decoded again at rising temperatures;
+those retries are batched too.
+"""
+import time
+import queue
+import threading
+from collections import Counter
+from concurrent.futures import Future
+
+import numpy as np
+
+from config import WHISPER_BATCH_SIZE, WHISPER_BATCH_WAIT_MS
+from src.transcription.audio import SAMPLE_RATE
+from src.transcription.guardrails import guarded
+from src.transcription.vad import detect_speech
+from src.utils.metrics import QUEUE_WAIT, span
+
+# Whisper's fixed input window
+WINDOW_SECONDS = 30
+
+# Same thresholds model.transcribe uses to call a window silent or retry it
+_NO_SPEECH_THRESHOLD = 0.6
+_LOGPROB_THRESHOLD = -1.0
+_COMPRESSION_RATIO_THRESHOLD = 2.4
+# Temperatures of the retries after the greedy (0.0) pass, as in model.transcribe
+_FALLBACK_TEMPERATURES = (0.2, 0.4, 0.6, 0.8, 1.0)
+
+
+def plan_windows(audio, sr=SAMPLE_RATE, max_seconds=WINDOW_SECONDS, min_seconds=15):
+    """
+    Cut a waveform into windows no longer than `max_seconds`, at silence where possible.
+
+    Args:
+        audio (np.ndarray): float32 mono samples
+        sr (int): Sample rate
+        max_seconds (float): Longest window
+        min_seconds (float): Shortest window when cutting at silence
+
+    Returns:
+        list: (start, end) sample indices
+    """
+    total = len(audio)
+    longest = int(max_seconds * sr)
+    if total <= longest:
+        return [(0, total)] if total else []
+
+    regions = detect_speech(audio, sr)
+    gaps = np.array([(end + next_start) // 2
+                     for (_, end), (next_start, _) in zip(regions, regions[1:])
+                     if next_start > end], dtype=np.int64)
+
+    windows = []
+    position = 0
+    while total - position > longest:
+        candidates = gaps[(gaps >= position + int(min_seconds * sr)) & (gaps <= position + longest)]
+        cut = int(candidates[-1]) if len(candidates) else position + longest
+        windows.append((position, cut))
+        position = cut
+    windows.append((position, total))
+    return windows
+
+
+class _WindowRequest:
+    """One queued mel window."""
+
+    def __init__(self, model_size, mel, fp16, guard=None, temperature=0.0):
+        self.model_size = model_size
+        self.mel = mel
+        self.fp16 = fp16
+        self.guard = guard
+        self.temperature = temperature
+        self.future = Future()
+        self.enqueued = time.perf_counter()
+
+
+class BatchScheduler:
+    """
+    Collects mel windows from concurrent requests and decodes them in batches.
+    """
+
+    def __init__(self, registry, max_batch_size=WHISPER_BATCH_SIZE, max_wait_ms=WHISPER_BATCH_WAIT_MS):
+        """
+        Initialize the scheduler; its thread starts on first use.
+
+        Args:
+            registry (ModelRegistry): Source of the models
+            max_batch_size (int): Most windows decoded together
+            max_wait_ms (float): How long the first window of a batch waits for company
+        """
+        self.registry = registry
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.batch_sizes = Counter()
+        self.windows = 0
+        self.fallbacks = 0
+        self.total_queue_wait = 0.0
+        self._queue = queue.Queue()
+        self._held = []
+        self._thread = None
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio, model_size, fp16=False, guard=None):
+        """
+        Transcribe a waveform through the shared batch queue.
+
+        Args:
+            audio (np.ndarray): float32 mono samples at 16 kHz
+            model_size (str): Model size to use
+            fp16 (bool): Decode in half precision
+            guard (DecodeGuard): Decode limits for this request's windows
+
+        Returns:
+            dict: Whisper-style result with one segment per window
+        """
+        import whisper
+
+        n_mels = self.registry.get(model_size).dims.n_mels
+        windows = plan_windows(audio)
+        requests = []
+        for start, end in windows:
+            with span("mel"):
+                mel = whisper.log_mel_spectrogram(whisper.pad_or_trim(audio[start:end]), n_mels)
+            requests.append(self.submit(model_size, mel, fp16, guard))
+
+        results = [request.future.result() for request in requests]
+        for temperature in _FALLBACK_TEMPERATURES:
+            # Past a time limit every retry would be cut off at once
+            if guard is not None and guard.time_limit():
+                break
+            retry = [i for i, result in enumerate(results) if _needs_fallback(result)]
+            if not retry:
+                break
+            with self._lock:
+                self.fallbacks += len(retry)
+            retried = [(i, self.submit(model_size, requests[i].mel, fp16, guard, temperature)) for i in retry]
+            for i, request in retried:
+                results[i] = request.future.result()
+
+        segments = []
+        language = None
+        for (start, end), result in zip(windows, results):
+            language = language or result.language
+            if result.no_speech_prob > _NO_SPEECH_THRESHOLD and result.avg_logprob < _LOGPROB_THRESHOLD:
+                continue
+            segments.append({
+                "id": len(segments),
+                "start": start / SAMPLE_RATE,
+                "end": end / SAMPLE_RATE,
+                "text": " " + result.text.strip(),
+                "avg_logprob": result.avg_logprob,
+                "no_speech_prob": result.no_speech_prob,
+                "compression_ratio": result.compression_ratio,
+                "temperature": result.temperature,
+            })
+        return {"text": "".join(s["text"] for s in segments), "segments": segments, "language": language}
+
+    def submit(self, model_size, mel, fp16=False, guard=None, temperature=0.0):
+        """
+        Queue one (n_mels, 3000) mel window.
+
+        Returns:
+            _WindowRequest: Its `future` resolves to a whisper DecodingResult
+        """
+        request = _WindowRequest(model_size, mel, fp16, guard, temperature)
+        self._ensure_thread()
+        self._queue.put(request)
+        return request
+
+    def stats(self):
+        """
+        Get queue and batch statistics.
+
+        Returns:
+            dict: Queue depth, batch count, mean batch size, batch size histogram,
+                  temperature fallbacks and mean queue wait
+        """
+        with self._lock:
+            batches = sum(self.batch_sizes.values())
+            return {
+                "queue_depth": self._queue.qsize() + len(self._held),
+                "batches": batches,
+                "windows": self.windows,
+                "fallbacks": self.fallbacks,
+                "mean_batch_size": self.windows / batches if batches else 0.0,
+                "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+                "mean_queue_wait_ms": 1000 * self.total_queue_wait / self.windows if self.windows else 0.0,
+                "max_batch_size": self.max_batch_size,
+                "max_wait_ms": self.max_wait * 1000,
+            }
+
+    def _ensure_thread(self):
+        """Start the scheduler thread once."""
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="whisper-batcher", daemon=True)
+                self._thread.start()
+
+    def _next_batch(self):
+        """Block for a first window, then gather compatible ones until full or timed out."""
+        with self._lock:
+            first = self._held.pop(0) if self._held else None
+        if first is None:
+            first = self._queue.get()
+        batch = [first]
+        key = _batch_key(first)
+
+        # Windows for another model (or temperature) held back earlier may join now
+        with self._lock:
+            for request in list(self._held):
+                if len(batch) >= self.max_batch_size:
+                    break
+                if _batch_key(request) == key:
+                    self._held.remove(request)
+                    batch.append(request)
+
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0:
+                break
+            try:
+                request = self._queue.get(timeout=remaining)
+            except queue.Empty:
+                break
+            if _batch_key(request) == key:
+                batch.append(request)
+            else:
+                with self._lock:
+                    self._held.append(request)
+        return batch
+
+    def _run(self):
+        """Scheduler loop."""
+        import torch
+        import whisper
+
+        while True:
+            batch = self._next_batch()
+            started = time.perf_counter()
+            try:
+                with self.registry.acquire(batch[0].model_size) as model:
+                    mels = torch.stack([request.mel for request in batch]).to(model.device)
+                    options = whisper.DecodingOptions(fp16=batch[0].fp16, temperature=batch[0].temperature,
+                                                      without_timestamps=True)
+                    with guarded([request.guard for request in batch]):
+                        results = whisper.decode(model, mels, options)
+            except Exception as e:
+                for request in batch:
+                    request.future.set_exception(e)
+                continue
+
+            with self._lock:
+                self.batch_sizes[len(batch)] += 1
+                self.windows += len(batch)
+                self.total_queue_wait += sum(started - request.enqueued for request in batch)
+            for request in batch:
+                QUEUE_WAIT.observe(started - request.enqueued, queue="whisper_batch")
+            for request, result in zip(batch, results):
+                request.future.set_result(result)
+
+
+def _batch_key(request):
+    """Windows decoded together share a model, precision and temperature."""
+    return request.model_size, request.fp16, request.temperature
+
+
+def _needs_fallback(result):
+    """Whether model.transcribe would decode this window again at a higher temperature."""
+    # A silent window is dropped later anyway
+    if result.no_speech_prob > _NO_SPEECH_THRESHOLD and result.avg_logprob < _LOGPROB_THRESHOLD:
+        return False
+    return result.compression_ratio > _COMPRESSION_RATIO_THRESHOLD or result.avg_logprob < _LOGPROB_THRESHOLD
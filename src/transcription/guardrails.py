@@ -0,0 +1,214 @@
+"""
+Guardrails for Whisper's decode loop.
+
+On long silent or noisy stretches Whisper can fall into a repetition loop
+("Thank you. Thank you. ..."), after which model.transcribe retries the
+window at higher temperatures. A single request can then take many times
+longer than real time and still return garbage. A DecodeGuard looks at every
+decoding step through an extra logit filter and ends a window early, by
+forcing the end-of-text token, when:
+
+- "repetition": the text ends in one phrase repeated `repeat_limit` times
+- "window_budget": the window, including its retries, has run for `window_budget` seconds
+- "rtf_ceiling": the request has run for `max_rtf` times its audio duration;
+  every later window is skipped as well
+
+Each intervention is counted in aiwizard_guardrail_interventions_total.
+"""
+import time
+import threading
+from collections import Counter
+from contextlib import contextmanager
+
+from config import WHISPER_REPEAT_LIMIT, WHISPER_WINDOW_BUDGET_SECONDS, WHISPER_MAX_RTF
+from src.utils.metrics import GUARDRAIL_INTERVENTIONS
+
+# Interventions that depend on how busy the machine was, not on the audio
+TIME_LIMITS = ("window_budget", "rtf_ceiling")
+
+# Longest repeated phrase looked for, in tokens
+_MAX_NGRAM = 16
+# Short phrases must repeat over at least this many tokens ("no, no, no" is speech)
+_MIN_REPEAT_TOKENS = 16
+# Decode time every request gets, however short (covers warm-up of the first window)
+_MIN_REQUEST_SECONDS = 10.0
+
+_local = threading.local()
+_patch_lock = threading.Lock()
+_patched = False
+
+
+class DecodeGuard:
+    """
+    Limits for one transcription request, shared by all of its windows.
+    """
+
+    def __init__(self, audio_seconds, repeat_limit=WHISPER_REPEAT_LIMIT,
+                 window_budget=WHISPER_WINDOW_BUDGET_SECONDS, max_rtf=WHISPER_MAX_RTF):
+        """
+        Initialize the guard; its clock starts when the first window is decoded.
+
+        Args:
+            audio_seconds (float): Duration of the audio being decoded
+            repeat_limit (int): Repeats of one phrase that end a window (0 = off)
+            window_budget (float): Seconds one window may take, retries included (0 = off)
+            max_rtf (float): Highest real-time factor of the whole request (0 = off)
+        """
+        self.audio_seconds = audio_seconds
+        self.repeat_limit = repeat_limit
+        self.window_budget = window_budget
+        self.max_rtf = max_rtf
+        self.interventions = Counter()
+        self._deadline = None
+        self._window_mel = None
+        self._window_deadline = None
+
+    @property
+    def enabled(self):
+        """bool: Whether any limit is set."""
+        return self.repeat_limit > 0 or self.window_budget > 0 or self.max_rtf > 0
+
+    def begin_window(self, mel):
+        """
+        Called when a decode attempt starts on a (n_mels, 3000) mel window.
+
+        Temperature retries decode the same tensor again and keep the window's budget.
+        """
+        now = time.perf_counter()
+        if self._deadline is None and self.max_rtf > 0:
+            self._deadline = now + max(self.max_rtf * self.audio_seconds, _MIN_REQUEST_SECONDS)
+        if self._window_mel is not None and mel.data_ptr() == self._window_mel.data_ptr():
+            return
+        # Holding the tensor keeps its memory from being reused by the next window
+        self._window_mel = mel
+        self._window_deadline = now + self.window_budget if self.window_budget > 0 else None
+
+    def time_limit(self):
+        """
+        Returns:
+            str or None: The time limit that has been reached, if any
+        """
+        now = time.perf_counter()
+        if self._deadline is not None and now > self._deadline:
+            return "rtf_ceiling"
+        if self._window_deadline is not None and now > self._window_deadline:
+            return "window_budget"
+        return None
+
+    def is_looping(self, text_tokens):
+        """Whether decoded text tokens end in a phrase repeated `repeat_limit` times."""
+        return self.repeat_limit > 0 and ends_in_repeats(text_tokens, self.repeat_limit)
+
+    def record(self, reason, count=1):
+        """Count an intervention here and in the metrics."""
+        self.interventions[reason] += count
+        GUARDRAIL_INTERVENTIONS.inc(count, reason=reason)
+
+
+def ends_in_repeats(tokens, limit):
+    """
+    Check whether a token list ends in one n-gram repeated back to back.
+
+    Args:
+        tokens (list): Token ids
+        limit (int): Repeats needed; single tokens and other short n-grams
+                     must also span at least _MIN_REPEAT_TOKENS tokens
+
+    Returns:
+        bool: True for a run like "a b c a b c a b c a b c" (limit 4)
+    """
+    for n in range(1, _MAX_NGRAM + 1):
+        copies = max(limit, -(-_MIN_REPEAT_TOKENS // n))
+        if n * copies > len(tokens):
+            continue
+        if tokens[-n * copies:] == tokens[-n:] * copies:
+            return True
+    return False
+
+
+@contextmanager
+def guarded(guards):
+    """
+    Apply guards to Whisper decoding on the current thread.
+
+    Args:
+        guards (list): One DecodeGuard (or None) per audio in each decode
+                       batch; model.transcribe decodes one audio at a time
+    """
+    if not any(guard is not None and guard.enabled for guard in guards):
+        yield
+        return
+    _patch_decoding()
+    previous = getattr(_local, "guards", None)
+    _local.guards = guards
+    try:
+        yield
+    finally:
+        _local.guards = previous
+
+
+class _GuardFilter:
+    """
+    Logit filter (whisper.decoding.LogitFilter interface) that ends rows early.
+    """
+
+    def __init__(self, guards, tokenizer, sample_begin, n_group):
+        self.guards = guards
+        self.eot = tokenizer.eot
+        self.sample_begin = sample_begin
+        self.n_group = n_group
+        self._ended = set()
+        self._recorded = set()
+
+    def apply(self, logits, tokens):
+        """Force end-of-text on rows whose guard says stop."""
+        rows = tokens.tolist()
+        for row, row_tokens in enumerate(rows):
+            audio = row // self.n_group
+            guard = self.guards[audio] if audio < len(self.guards) else None
+            generated = row_tokens[self.sample_begin:]
+            if guard is None or row in self._ended or (generated and generated[-1] == self.eot):
+                continue
+            reason = guard.time_limit()
+            # Timestamps and special tokens sort after end-of-text; only text can loop
+            if reason is None and guard.is_looping([token for token in generated if token < self.eot]):
+                reason = "repetition"
+            if reason is None:
+                continue
+            self._ended.add(row)
+            # Beams and best-of samples of one audio count as one intervention
+            if (audio, reason) not in self._recorded:
+                self._recorded.add((audio, reason))
+                guard.record(reason)
+            logits[row] = float("-inf")
+            logits[row, self.eot] = 0.0
+
+
+def _patch_decoding():
+    """Make whisper's DecodingTask pick up the current thread's guards (once per process)."""
+    global _patched
+    with _patch_lock:
+        if _patched:
+            return
+        from whisper.decoding import DecodingTask
+
+        original_init = DecodingTask.__init__
+        original_run = DecodingTask.run
+
+        def __init__(self, model, options):
+            original_init(self, model, options)
+            guards = getattr(_local, "guards", None)
+            if guards:
+                self.logit_filters.append(_GuardFilter(guards, self.tokenizer, self.sample_begin, self.n_group))
+
+        def run(self, mel):
+            guards = getattr(_local, "guards", None)
+            if guards:
+                for guard, window in zip(guards, mel if mel.ndim == 3 else mel.unsqueeze(0)):
+                    if guard is not None:
+                        guard.begin_window(window)
+            return original_run(self, mel)
+
+        DecodingTask.__init__ = __init__
+        DecodingTask.run = run
+        _patched = True
@@ -0,0 +1,318 @@
+import gc
+import time
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+from config import (
+    WHISPER_WARMUP, WHISPER_MEMORY_BUDGET_MB, WHISPER_CPU_INT8, TORCH_INTRA_OP_THREADS, TORCH_INTER_OP_THREADS
+)
+from src.utils.metrics import STAGE_SECONDS
+
+MODEL_SIZES = ["tiny", "base", "small", "medium", "large"]
+
+# Approximate parameter counts, used to reserve memory before a model is loaded
+ESTIMATED_PARAMETERS = {
+    "tiny": 39_000_000,
+    "base": 74_000_000,
+    "small": 244_000_000,
+    "medium": 769_000_000,
+    "large": 1_550_000_000,
+}
+
+
+class LoadedModel:
+    """
+    A loaded Whisper model together with its measured footprint.
+    """
+
+    def __init__(self, model_size, model, parameters, memory_bytes, load_seconds):
+        self.model_size = model_size
+        self.model = model
+        self.parameters = parameters
+        self.memory_bytes = memory_bytes
+        self.load_seconds = load_seconds
+        self.in_use = 0
+        self.last_used = time.time()
+
+
+class ModelRegistry:
+    """
+    Loads Whisper models on first use and shares them between sessions.
+
+    Loaded models are kept in least-recently-used order. When loading another
+    model would exceed the memory budget, idle models are evicted starting
+    with the least recently used one.
+    """
+
+    def __init__(self, memory_budget_mb=WHISPER_MEMORY_BUDGET_MB, device=None, warmup=WHISPER_WARMUP,
+                 quantize=WHISPER_CPU_INT8):
+        """
+        Initialize the registry.
+
+        Args:
+            memory_budget_mb (float): RAM budget for all loaded models, 0 for unlimited
+            device (str): Torch device, detected on first load if None
+            warmup (bool): Run one dummy inference after each load
+            quantize (bool): Quantize Linear layers to int8 when running on CPU
+        """
+        self.memory_budget = int(memory_budget_mb * 1024 * 1024) if memory_budget_mb else None
+        self.device = device
+        self.warmup = warmup
+        self.quantize = quantize
+        self.loads = 0
+        self.evictions = 0
+        self._models = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks = {}
+
+    def get(self, model_size):
+        """
+        Get a model, loading it first if needed.
+
+        Args:
+            model_size (str): One of MODEL_SIZES
+
+        Returns:
+            whisper.model.Whisper: The loaded model
+        """
+        return self._get_entry(model_size).model
+
+    @contextmanager
+    def acquire(self, model_size):
+        """
+        Use a model for the duration of the block; it will not be evicted meanwhile.
+
+        Args:
+            model_size (str): One of MODEL_SIZES
+        """
+        entry = self._get_entry(model_size, pin=True)
+        try:
+            yield entry.model
+        finally:
+            with self._lock:
+                entry.in_use -= 1
+                entry.last_used = time.time()
+
+    def peek(self, model_size):
+        """
+        Get a model only if it is already loaded, without touching LRU order.
+
+        Returns:
+            LoadedModel or None
+        """
+        with self._lock:
+            return self._models.get(model_size)
+
+    def is_loaded(self, model_size):
+        """bool: True if the model is currently in memory."""
+        return self.peek(model_size) is not None
+
+    def evict(self, model_size):
+        """
+        Drop a model from the registry.
+
+        Returns:
+            bool: True if the model was loaded
+        """
+        with self._lock:
+            entry = self._models.pop(model_size, None)
+        if entry is None:
+            return False
+        self._release(entry)
+        return True
+
+    def stats(self):
+        """
+        Describe the loaded models and memory use.
+
+        Returns:
+            dict: Budget, usage, load/eviction counts and per-model details in LRU order
+        """
+        with self._lock:
+            models = [
+                {
+                    "model_size": entry.model_size,
+                    "parameters": entry.parameters,
+                    "memory_bytes": entry.memory_bytes,
+                    "in_use": entry.in_use,
+                    "load_seconds": entry.load_seconds,
+                    "int8": self.quantize and self.device == "cpu",
+                }
+                for entry in self._models.values()
+            ]
+        return {
+            "memory_budget_bytes": self.memory_budget,
+            "memory_used_bytes": sum(m["memory_bytes"] for m in models),
+            "loads": self.loads,
+            "evictions": self.evictions,
+            "models": models,
+        }
+
+    @property
+    def quantized(self):
+        """bool: True if models are (or will be) loaded as int8."""
+        return self.quantize and self.resolve_device() == "cpu"
+
+    def resolve_device(self):
+        """
+        Detect the torch device if it is not known yet.
+
+        Returns:
+            str: "cuda" or "cpu"
+        """
+        if self.device is None:
+            import torch
+            from src.transcription.quantization import configure_torch_threads
+            configure_torch_threads(TORCH_INTRA_OP_THREADS, TORCH_INTER_OP_THREADS)
+            self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        return self.device
+
+    def _get_entry(self, model_size, pin=False):
+        """Return the registry entry for a model, loading it if necessary."""
+        if model_size not in MODEL_SIZES:
+            raise ValueError(f"Unknown Whisper model size: {model_size}")
+
+        with self._lock:
+            entry = self._lookup(model_size, pin)
+            if entry is not None:
+                return entry
+            load_lock = self._load_locks.setdefault(model_size, threading.Lock())
+
+        # Only one thread loads a given size; others wait and reuse its result
+        with load_lock:
+            with self._lock:
+                entry = self._lookup(model_size, pin)
+                if entry is not None:
+                    return entry
+                # int8 Linear weights are most of the model; embeddings and convolutions stay fp32
+                estimate = ESTIMATED_PARAMETERS[model_size] * (2 if self.quantized else 4)
+                evicted = self._make_room(estimate)
+            for old in evicted:
+                self._release(old)
+
+            entry = self._load(model_size)
+
+            with self._lock:
+                self._models[model_size] = entry
+                if pin:
+                    entry.in_use += 1
+                evicted = self._make_room(0, keep=model_size)
+            for old in evicted:
+                self._release(old)
+            return entry
+
+    def _lookup(self, model_size, pin):
+        """Return a loaded entry and mark it most recently used. Caller holds the lock."""
+        entry = self._models.get(model_size)
+        if entry is not None:
+            self._models.move_to_end(model_size)
+            entry.last_used = time.time()
+            if pin:
+                entry.in_use += 1
+        return entry
+
+    def _make_room(self, extra_bytes, keep=None):
+        """
+        Pop idle models in LRU order until `extra_bytes` more fit in the budget.
+        The model named by `keep` is never evicted. Caller holds the lock.
+
+        Returns:
+            list: Entries removed from the registry
+        """
+        if self.memory_budget is None:
+            return []
+        used = sum(entry.memory_bytes for entry in self._models.values())
+        evicted = []
+        for size in list(self._models.keys()):
+            if used + extra_bytes <= self.memory_budget:
+                break
+            entry = self._models[size]
+            if entry.in_use or size == keep:
+                continue
+            del self._models[size]
+            used -= entry.memory_bytes
+            evicted.append(entry)
+        if used + extra_bytes > self.memory_budget:
+            print(f"WARNING: Whisper models exceed the memory budget "
+                  f"({(used + extra_bytes) / 2**20:,.0f} MB > {self.memory_budget / 2**20:,.0f} MB)")
+        return evicted
+
+    def _load(self, model_size):
+        """Load and optionally warm up a model."""
+        import whisper
+
+        self.resolve_device()
+
+        start = time.time()
+        print(f"Loading Whisper {model_size} model on {self.device}{' (int8)' if self.quantized else ''}...")
+        model = whisper.load_model(model_size, device=self.device)
+        if self.quantized:
+            from src.transcription.quantization import quantize_int8
+            model = quantize_int8(model)
+
+        if self.warmup:
+            # One second of silence is enough to compile kernels and fill caches
+            import numpy as np
+            model.transcribe(np.zeros(whisper.audio.SAMPLE_RATE, dtype=np.float32),
+                             fp16=self.device == "cuda")
+
+        _time_encoder(model)
+        from src.transcription.quantization import model_footprint
+        parameters, memory_bytes = model_footprint(model)
+        load_seconds = time.time() - start
+        self.loads += 1
+        print(f"Whisper {model_size} model loaded in {load_seconds:.1f}s "
+              f"({parameters:,} parameters, {memory_bytes / 2**20:,.0f} MB)")
+        return LoadedModel(model_size, model, parameters, memory_bytes, load_seconds)
+
+    def _release(self, entry):
+        """Free the memory held by an evicted model."""
+        self.evictions += 1
+        print(f"Evicting Whisper {entry.model_size} model ({entry.memory_bytes / 2**20:,.0f} MB)")
+        entry.model = None
+        gc.collect()
+        if self.device == "cuda":
+            import torch
+            torch.cuda.empty_cache()
+
+
+def _time_encoder(model):
+    """
+    Record every audio encoder pass as the "encode" stage.
+    
+    Whisper runs the encoder inside model.transcribe and whisper.decode, so
+    forward hooks are the only place to time it separately from decoding.
+    On CUDA the time is when the kernels were queued, not when they finished.
+    """
+    local = threading.local()
+    
+    def before(module, inputs):
+        local.start = time.perf_counter()
+    
+    def after(module, inputs, output):
+        start = getattr(local, "start", None)
+        if start is not None:
+            STAGE_SECONDS.observe(time.perf_counter() - start, stage="encode")
+            local.start = None
+    
+    model.encoder.register_forward_pre_hook(before)
+    model.encoder.register_forward_hook(after)
+
+
+_default_registry = None
+_default_registry_lock = threading.Lock()
+
+
+def get_default_registry():
+    """
+    Get the process-wide registry shared by all transcribers and sessions.
+
+    Returns:
+        ModelRegistry: The shared registry
+    """
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = ModelRegistry()
+        return _default_registry
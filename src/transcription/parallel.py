@@ -0,0 +1,215 @@
+"""
+Parallel chunked transcription of long recordings on CPU.
+
+Long audio is split at silence into chunks that are transcribed by a pool
+of worker processes, each holding its own copy of the model and a fixed
+number of torch threads. Segments are shifted back to absolute time and
+stitched in order, dropping duplicates where chunks overlap.
+"""
+import os
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from config import PARALLEL_WORKERS, PARALLEL_TORCH_THREADS, PARALLEL_CHUNK_SECONDS, WHISPER_CPU_INT8
+from src.transcription.audio import SAMPLE_RATE
+from src.transcription.vad import detect_speech
+
+# Model held by each worker process
+_worker_model = None
+
+
+def _init_worker(model_size, torch_threads, quantize=False):
+    """Load the model once per worker process."""
+    global _worker_model
+    import torch
+    import whisper
+
+    torch.set_num_threads(torch_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Already set in this process
+        pass
+    _worker_model = whisper.load_model(model_size, device="cpu")
+    if quantize:
+        from src.transcription.quantization import quantize_int8
+        _worker_model = quantize_int8(_worker_model)
+
+
+def _transcribe_chunk(audio, offset_seconds, decode_options):
+    """Worker: transcribe one chunk and shift its timestamps to absolute time."""
+    from src.transcription.guardrails import DecodeGuard, guarded
+
+    # Each chunk gets its own limits; interventions are counted by the parent process
+    guard = DecodeGuard(len(audio) / SAMPLE_RATE)
+    with guarded([guard]):
+        result = _worker_model.transcribe(audio, **decode_options)
+    segments = []
+    for segment in result.get("segments", []):
+        segment = {key: value for key, value in segment.items() if key != "tokens"}
+        segment["start"] += offset_seconds
+        segment["end"] += offset_seconds
+        for word in segment.get("words", []):
+            word["start"] += offset_seconds
+            word["end"] += offset_seconds
+        segments.append(segment)
+    return {"segments": segments, "language": result.get("language"), "guardrails": dict(guard.interventions)}
+
+
+def plan_chunks(audio, sr=SAMPLE_RATE, chunk_seconds=PARALLEL_CHUNK_SECONDS, overlap_seconds=2.0):
+    """
+    Choose chunk boundaries, preferring silence near every `chunk_seconds`.
+
+    Where no silence is found within half a chunk of the target, the audio is
+    cut hard and neighbouring chunks overlap by `overlap_seconds`.
+
+    Args:
+        audio (np.ndarray): float32 mono samples
+        sr (int): Sample rate
+        chunk_seconds (float): Target chunk length
+        overlap_seconds (float): Overlap used for hard cuts
+
+    Returns:
+        list: (start, end, keep_start, keep_end) sample indices per chunk; a
+              segment belongs to the chunk whose keep range holds its midpoint
+    """
+    total = len(audio)
+    chunk = int(chunk_seconds * sr)
+    overlap = int(overlap_seconds * sr)
+    if total <= chunk * 1.5:
+        return [(0, total, 0, total)]
+
+    regions = detect_speech(audio, sr)
+    gaps = np.array([(end + next_start) // 2
+                     for (_, end), (next_start, _) in zip(regions, regions[1:])
+                     if next_start > end], dtype=np.int64)
+
+    cuts = []
+    position = 0
+    while total - position > chunk * 1.5:
+        target = position + chunk
+        nearby = gaps[(gaps > position + chunk // 2) & (gaps < position + chunk + chunk // 2)]
+        if len(nearby):
+            cuts.append((int(nearby[np.argmin(np.abs(nearby - target))]), False))
+        else:
+            cuts.append((target, True))
+        position = cuts[-1][0]
+
+    chunks = []
+    start = keep_start = 0
+    for cut, hard in cuts:
+        end = min(total, cut + overlap // 2) if hard else cut
+        chunks.append((start, end, keep_start, cut))
+        start = max(0, cut - overlap // 2) if hard else cut
+        keep_start = cut
+    chunks.append((start, total, keep_start, total))
+    return chunks
+
+
+def stitch(chunk_results, chunks, sr=SAMPLE_RATE):
+    """
+    Merge per-chunk segments into one Whisper-style result.
+
+    Args:
+        chunk_results (list): Worker results in chunk order
+        chunks (list): The plan from plan_chunks
+        sr (int): Sample rate
+
+    Returns:
+        dict: {"text", "segments", "language"}
+    """
+    segments = []
+    for result, (_, _, keep_start, keep_end) in zip(chunk_results, chunks):
+        for segment in result["segments"]:
+            midpoint = (segment["start"] + segment["end"]) / 2 * sr
+            if not keep_start <= midpoint < keep_end:
+                continue
+            # The same words decoded on both sides of an overlap
+            if segments and segment["text"].strip() == segments[-1]["text"].strip():
+                continue
+            segments.append(segment)
+    for index, segment in enumerate(segments):
+        segment["id"] = index
+    language = next((r["language"] for r in chunk_results if r.get("language")), None)
+    return {"text": "".join(s["text"] for s in segments), "segments": segments, "language": language}
+
+
+class ParallelTranscriber:
+    """
+    A pool of worker processes that transcribe chunks of one recording in parallel.
+    """
+
+    def __init__(self, workers=PARALLEL_WORKERS, torch_threads=PARALLEL_TORCH_THREADS,
+                 chunk_seconds=PARALLEL_CHUNK_SECONDS, quantize=WHISPER_CPU_INT8):
+        """
+        Initialize the pool settings; processes start on first use.
+
+        Args:
+            workers (int): Number of worker processes
+            torch_threads (int): torch intra-op threads per worker, 0 to split the CPUs evenly
+            chunk_seconds (float): Target chunk length
+            quantize (bool): Workers quantize their model's Linear layers to int8
+        """
+        self.workers = workers
+        self.torch_threads = torch_threads or max(1, (os.cpu_count() or 1) // max(1, workers))
+        self.chunk_seconds = chunk_seconds
+        self.quantize = quantize
+        self._pool = None
+        self._pool_model_size = None
+        self._lock = threading.Lock()
+
+    def transcribe(self, audio, model_size, guard=None, **decode_options):
+        """
+        Transcribe a long waveform across the worker pool.
+
+        Args:
+            audio (np.ndarray): float32 mono samples at 16 kHz
+            model_size (str): Model size the workers load
+            guard (DecodeGuard): Receives the interventions of the workers' own guards
+            **decode_options: Passed through to model.transcribe
+
+        Returns:
+            dict: Whisper-style result with absolute segment timestamps
+        """
+        chunks = plan_chunks(audio, SAMPLE_RATE, self.chunk_seconds)
+        pool = self._get_pool(model_size)
+        futures = [
+            pool.submit(_transcribe_chunk, audio[start:end], start / SAMPLE_RATE, decode_options)
+            for start, end, _, _ in chunks
+        ]
+        print(f"Transcribing {len(audio) / SAMPLE_RATE:.1f}s in {len(chunks)} chunks "
+              f"across {self.workers} workers ({self.torch_threads} torch threads each)")
+        chunk_results = [future.result() for future in futures]
+        if guard is not None:
+            for result in chunk_results:
+                for reason, count in result["guardrails"].items():
+                    guard.record(reason, count)
+        return stitch(chunk_results, chunks)
+
+    def shutdown(self):
+        """Stop the worker processes."""
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=True, cancel_futures=True)
+                self._pool = None
+                self._pool_model_size = None
+
+    def _get_pool(self, model_size):
+        """Start (or restart for a different model size) the worker pool."""
+        with self._lock:
+            if self._pool is not None and self._pool_model_size == model_size:
+                return self._pool
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+            # spawn: forking a process that already runs torch threads is unsafe
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(model_size, self.torch_threads, self.quantize),
+            )
+            self._pool_model_size = model_size
+            return self._pool
@@ -0,0 +1,94 @@
+"""
+CPU inference acceleration for Whisper: int8 dynamic quantization and torch threads.
+
+Dynamic quantization stores the weights of every Linear layer as int8 and
+quantizes activations on the fly, which cuts those layers' memory by 4x and
+runs them through int8 GEMM kernels (fbgemm on x86, qnnpack on ARM). The
+attention and MLP projections hold most of Whisper's weights, so this is
+where CPU time goes. Convolutions, layer norms and the embeddings stay in
+fp32. Quantization is CPU-only; CUDA models are left untouched.
+"""
+import threading
+
+_threads_lock = threading.Lock()
+_threads_configured = False
+
+
+def configure_torch_threads(intra_op_threads=0, inter_op_threads=0):
+    """
+    Set torch's thread pools once per process.
+
+    Args:
+        intra_op_threads (int): Threads used inside one op (GEMMs, convolutions); 0 keeps the default
+        inter_op_threads (int): Threads running independent ops concurrently; 0 keeps the default
+    """
+    global _threads_configured
+    with _threads_lock:
+        if _threads_configured:
+            return
+        _threads_configured = True
+    import torch
+
+    if intra_op_threads > 0:
+        torch.set_num_threads(intra_op_threads)
+    if inter_op_threads > 0:
+        try:
+            torch.set_num_interop_threads(inter_op_threads)
+        except RuntimeError:
+            # Only possible before the first parallel op of the process
+            print(f"WARNING: could not set {inter_op_threads} inter-op threads; "
+                  f"torch already uses {torch.get_num_interop_threads()}")
+    print(f"Torch threads: {torch.get_num_threads()} intra-op, {torch.get_num_interop_threads()} inter-op")
+
+
+def quantize_int8(model):
+    """
+    Quantize a CPU Whisper model's Linear layers to int8.
+
+    Args:
+        model (whisper.model.Whisper): fp32 model on the CPU
+
+    Returns:
+        whisper.model.Whisper: The quantized model (the input is modified too)
+    """
+    import torch
+
+    # Whisper subclasses nn.Linear only to cast weights to the input dtype, which
+    # fp32 CPU inference never needs; quantize_dynamic matches exact types
+    for module in model.modules():
+        if isinstance(module, torch.nn.Linear) and type(module) is not torch.nn.Linear:
+            module.__class__ = torch.nn.Linear
+
+    if torch.backends.quantized.engine == "none":
+        engines = torch.backends.quantized.supported_engines
+        torch.backends.quantized.engine = "fbgemm" if "fbgemm" in engines else "qnnpack"
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+
+
+def model_footprint(model):
+    """
+    Count parameters and bytes of a model, including int8 packed weights.
+
+    parameters() does not include quantized weights, so the state dict is
+    walked instead.
+
+    Returns:
+        tuple: (parameter count, bytes)
+    """
+    import torch
+
+    count = 0
+    size = 0
+
+    def visit(value):
+        nonlocal count, size
+        if isinstance(value, torch.Tensor):
+            count += value.numel()
+            size += value.numel() * value.element_size()
+        elif isinstance(value, (tuple, list)):
+            for item in value:
+                visit(item)
+
+    for value in model.state_dict().values():
+        visit(value)
+    return count, size
@@ -0,0 +1,267 @@
+"""
+Columnar storage of Whisper segments.
+
+A SegmentTable keeps one NumPy array per field (start, end, avg_logprob,
+no_speech_prob) and all segment texts in one UTF-8 blob addressed by byte
+offsets. Saved tables are a small JSON header followed by the raw arrays,
+each aligned to 64 bytes, so loading maps the file instead of parsing it:
+opening a multi-hour meeting costs a few page faults, and seeking to a
+time is a binary search over the start column.
+"""
+import os
+import json
+
+import numpy as np
+
+from config import SEGMENT_MIN_AVG_LOGPROB, SEGMENT_MAX_NO_SPEECH_PROB
+
+_MAGIC = b"AIWSEG1\0"
+_ALIGN = 64
+_COLUMNS = {
+    "start": np.float64,
+    "end": np.float64,
+    "avg_logprob": np.float32,
+    "no_speech_prob": np.float32,
+    "text_offsets": np.int64,
+    "text": np.uint8,
+}
+
+
+class SegmentTable:
+    """
+    Whisper segments as parallel arrays plus a text blob.
+
+    Segment i spans start[i]..end[i] seconds and its text is
+    text[text_offsets[i]:text_offsets[i + 1]]. Confidence values missing
+    from the source segments are NaN.
+    """
+
+    def __init__(self, start, end, avg_logprob, no_speech_prob, text_offsets, text, language=None):
+        """
+        Wrap existing columns (see from_segments() to build a table).
+
+        Args:
+            start (np.ndarray): Segment start times in seconds, ascending
+            end (np.ndarray): Segment end times in seconds
+            avg_logprob (np.ndarray): Mean token log probability per segment
+            no_speech_prob (np.ndarray): Probability that the segment is not speech
+            text_offsets (np.ndarray): len + 1 byte offsets into `text`
+            text (np.ndarray): uint8 UTF-8 text of all segments, concatenated
+            language (str): Detected language
+        """
+        self.start = start
+        self.end = end
+        self.avg_logprob = avg_logprob
+        self.no_speech_prob = no_speech_prob
+        self.text_offsets = text_offsets
+        self.text_blob = text
+        self.language = language
+
+    @classmethod
+    def from_segments(cls, segments, language=None):
+        """
+        Build a table from Whisper-style segment dicts.
+
+        Args:
+            segments (list): Dicts with "start", "end", "text" and optionally
+                             "avg_logprob" and "no_speech_prob"
+            language (str): Detected language
+
+        Returns:
+            SegmentTable: The table
+        """
+        encoded = [segment.get("text", "").encode("utf-8") for segment in segments]
+        offsets = np.zeros(len(segments) + 1, dtype=np.int64)
+        np.cumsum([len(data) for data in encoded], out=offsets[1:])
+
+        def column(key, dtype):
+            return np.array([segment.get(key, np.nan) for segment in segments], dtype=dtype)
+
+        return cls(
+            start=column("start", np.float64),
+            end=column("end", np.float64),
+            avg_logprob=column("avg_logprob", np.float32),
+            no_speech_prob=column("no_speech_prob", np.float32),
+            text_offsets=offsets,
+            text=np.frombuffer(b"".join(encoded), dtype=np.uint8),
+            language=language,
+        )
+
+    @classmethod
+    def from_result(cls, result):
+        """Build a table from a transcription result dict ("segments", "language")."""
+        return cls.from_segments(result.get("segments", []), language=result.get("language"))
+
+    def __len__(self):
+        return len(self.start)
+
+    def __getitem__(self, index):
+        """One segment as a dict, like Whisper's."""
+        if index < 0:
+            index += len(self)
+        return {
+            "start": float(self.start[index]),
+            "end": float(self.end[index]),
+            "text": self.segment_text(index),
+            "avg_logprob": float(self.avg_logprob[index]),
+            "no_speech_prob": float(self.no_speech_prob[index]),
+        }
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    @property
+    def text(self):
+        """str: The full transcript (all segment texts concatenated)."""
+        return self._decode(self.text_offsets[0], self.text_offsets[-1]) if len(self) else ""
+
+    @property
+    def duration(self):
+        """float: End time of the last segment in seconds."""
+        return float(self.end[-1]) if len(self) else 0.0
+
+    def segment_text(self, index):
+        """Text of one segment."""
+        return self._decode(self.text_offsets[index], self.text_offsets[index + 1])
+
+    def to_segments(self):
+        """
+        Convert back to segment dicts (for JSON or the archive).
+
+        Returns:
+            list: Dicts with start, end, text, avg_logprob and no_speech_prob
+        """
+        return list(self)
+
+    def index_at(self, seconds):
+        """
+        Find the segment playing at a time.
+
+        Returns:
+            int: Index of the last segment starting at or before `seconds` (0 if none)
+        """
+        return max(int(np.searchsorted(self.start, seconds, side="right")) - 1, 0)
+
+    def between(self, start, end):
+        """
+        Segments overlapping a time range, e.g. to re-transcribe one region.
+
+        Returns:
+            SegmentTable: The overlapping segments
+        """
+        # Starts are ascending, so only the slice from the segment playing at
+        # `start` up to the first one starting at `end` needs checking
+        first = self.index_at(start)
+        last = int(np.searchsorted(self.start, end, side="left"))
+        candidates = np.arange(first, max(first, last))
+        return self.select(candidates[np.asarray(self.end[first:max(first, last)]) > start])
+
+    def confident(self, min_avg_logprob=SEGMENT_MIN_AVG_LOGPROB, max_no_speech_prob=SEGMENT_MAX_NO_SPEECH_PROB):
+        """
+        Drop segments Whisper was unsure about or that are probably not speech.
+
+        A segment is dropped if its avg_logprob is below `min_avg_logprob` or
+        its no_speech_prob is above `max_no_speech_prob`. Missing values keep it.
+
+        Returns:
+            SegmentTable: The remaining segments
+        """
+        with np.errstate(invalid="ignore"):
+            unsure = self.avg_logprob < min_avg_logprob
+            silent = self.no_speech_prob > max_no_speech_prob
+        return self.select(~(unsure | silent))
+
+    def select(self, mask):
+        """
+        Segments where a boolean mask (or index array) is set, as a new table.
+
+        Returns:
+            SegmentTable: The selected segments, text copied into a new blob
+        """
+        indices = np.flatnonzero(mask) if np.asarray(mask).dtype == bool else np.asarray(mask, dtype=np.int64)
+        lengths = self.text_offsets[indices + 1] - self.text_offsets[indices]
+        offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        if len(indices):
+            # Byte positions of every selected character, gathered in one step
+            positions = np.repeat(self.text_offsets[indices] - offsets[:-1], lengths) + np.arange(offsets[-1])
+            text = np.asarray(self.text_blob)[positions]
+        else:
+            text = np.zeros(0, dtype=np.uint8)
+        return SegmentTable(self.start[indices], self.end[indices], self.avg_logprob[indices],
+                            self.no_speech_prob[indices], offsets, text, self.language)
+
+    def save(self, path):
+        """
+        Write the table to one file that load() can memory-map.
+
+        Args:
+            path (str): Destination, conventionally "*.seg"
+        """
+        columns = {
+            "start": self.start, "end": self.end, "avg_logprob": self.avg_logprob,
+            "no_speech_prob": self.no_speech_prob, "text_offsets": self.text_offsets, "text": self.text_blob,
+        }
+        layout = {}
+        position = 0
+        for name, dtype in _COLUMNS.items():
+            array = np.ascontiguousarray(columns[name], dtype=dtype)
+            columns[name] = array
+            layout[name] = {"offset": position, "count": int(array.size)}
+            position = _aligned(position + array.nbytes)
+        header = json.dumps({"rows": len(self), "language": self.language, "columns": layout}).encode("utf-8")
+        data_start = _aligned(len(_MAGIC) + 8 + len(header))
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_MAGIC)
+            f.write(np.uint64(len(header)).tobytes())
+            f.write(header)
+            for name in _COLUMNS:
+                f.seek(data_start + layout[name]["offset"])
+                f.write(columns[name].tobytes())
+            f.truncate(data_start + position)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path, mmap=True):
+        """
+        Open a table written by save().
+
+        Args:
+            path (str): Table file
+            mmap (bool): Map the columns read-only instead of reading them into memory
+
+        Returns:
+            SegmentTable: The table
+        """
+        with open(path, "rb") as f:
+            if f.read(len(_MAGIC)) != _MAGIC:
+                raise ValueError(f"{path} is not a segment table")
+            header_size = int(np.frombuffer(f.read(8), dtype=np.uint64)[0])
+            header = json.loads(f.read(header_size).decode("utf-8"))
+            data_start = _aligned(len(_MAGIC) + 8 + header_size)
+            columns = {}
+            for name, dtype in _COLUMNS.items():
+                spec = header["columns"][name]
+                offset = data_start + spec["offset"]
+                if mmap and spec["count"]:
+                    columns[name] = np.memmap(path, dtype=dtype, mode="r", offset=offset, shape=(spec["count"],))
+                else:
+                    f.seek(offset)
+                    columns[name] = np.fromfile(f, dtype=dtype, count=spec["count"])
+        return cls(language=header.get("language"), **columns)
+
+    def _decode(self, begin, end):
+        """Decode a byte range of the text blob."""
+        return bytes(self.text_blob[int(begin):int(end)]).decode("utf-8", errors="replace")
+
+
+def _aligned(position):
+    """Round up to the column alignment."""
+    return (position + _ALIGN - 1) // _ALIGN * _ALIGN
+
@@ -0,0 +1,183 @@
+"""
+Incremental transcription of a recording that is still in progress.
+"""
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from config import STREAM_WINDOW_SECONDS, STREAM_PROMPT_CHARS
+from src.transcription.audio import SAMPLE_RATE, resample, to_float32_mono
+from src.utils.job_queue import QueueFull
+
+# Longest pause before asking a full job queue again
+_MAX_BACKOFF_SECONDS = 2.0
+
+
+class StreamingTranscriber:
+    """
+    Transcribe microphone chunks in the background while recording continues.
+
+    Chunks are appended to a rolling buffer. Each time the buffer holds a full
+    window it is cut at the quietest point near the end of the window and
+    transcribed on a worker thread, with the tail of the text so far as the
+    prompt. When recording stops only the remaining partial window is left.
+
+    With a job queue, every window waits for a slot like any other
+    transcription, so live sessions and uploads share the same model slots.
+    """
+
+    def __init__(self, transcriber, model_size=None, job_queue=None,
+                 window_seconds=STREAM_WINDOW_SECONDS, prompt_chars=STREAM_PROMPT_CHARS):
+        """
+        Initialize a live transcription session.
+
+        Args:
+            transcriber (WhisperTranscriber): Transcriber running the model
+            model_size (str): Model size; defaults to the transcriber's model size
+            job_queue (JobQueue): Queue each window decode goes through (None = decode directly)
+            window_seconds (float): Seconds of audio per background window
+            prompt_chars (int): Characters of previous text passed as the prompt
+        """
+        self.transcriber = transcriber
+        self.model_size = model_size
+        self.job_queue = job_queue
+        self.window_seconds = window_seconds
+        self.prompt_chars = prompt_chars
+        self.received_seconds = 0.0
+        self.transcribed_seconds = 0.0
+        self._sample_rate = None
+        self._pending = []
+        self._pending_samples = 0
+        self._texts = []
+        self._lock = threading.Lock()
+        # One worker keeps windows in order, so each prompt sees all earlier text
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="live-transcribe")
+        self._finished = False
+
+    @property
+    def text(self):
+        """str: Transcript of all windows finished so far."""
+        with self._lock:
+            return " ".join(self._texts)
+
+    @property
+    def lag_seconds(self):
+        """float: Seconds of received audio that are not transcribed yet."""
+        return max(0.0, self.received_seconds - self.transcribed_seconds)
+
+    def add_chunk(self, samples, sample_rate):
+        """
+        Append a recorded chunk and start transcribing any complete window.
+
+        Args:
+            samples (np.ndarray): Chunk samples, integer or float, mono or (frames, channels)
+            sample_rate (int): Sample rate of the chunk
+        """
+        if self._finished:
+            raise RuntimeError("Live transcription session already finished")
+        samples = to_float32_mono(samples)
+        if len(samples) == 0:
+            return
+
+        with self._lock:
+            if self._sample_rate is not None and sample_rate != self._sample_rate:
+                self._submit(self._take_pending(self._pending_samples))
+            self._sample_rate = sample_rate
+            self._pending.append(samples)
+            self._pending_samples += len(samples)
+            self.received_seconds += len(samples) / sample_rate
+
+            window = int(self.window_seconds * sample_rate)
+            while self._pending_samples >= window:
+                buffer = np.concatenate(self._pending)
+                self._pending = [buffer]
+                cut = self._quiet_cut(buffer[:window], sample_rate)
+                self._submit(self._take_pending(cut))
+
+    def finish(self):
+        """
+        Transcribe the remaining audio and wait for all windows.
+
+        Returns:
+            str: The complete transcript
+        """
+        with self._lock:
+            if not self._finished:
+                self._finished = True
+                # Less than a third of a second is not worth a model call
+                if self._sample_rate and self._pending_samples > 0.3 * self._sample_rate:
+                    self._submit(self._take_pending(self._pending_samples))
+                self._pending = []
+                self._pending_samples = 0
+        self._executor.shutdown(wait=True)
+        return self.text
+
+    def _take_pending(self, num_samples):
+        """Remove and return the first `num_samples` buffered samples. Caller holds the lock."""
+        buffer = np.concatenate(self._pending) if len(self._pending) > 1 else self._pending[0]
+        head, tail = buffer[:num_samples], buffer[num_samples:]
+        self._pending = [tail] if len(tail) else []
+        self._pending_samples = len(tail)
+        return resample(head, self._sample_rate, SAMPLE_RATE)
+
+    def _submit(self, audio):
+        """Queue a window for transcription."""
+        if len(audio):
+            self._executor.submit(self._transcribe_window, audio)
+
+    def _transcribe_window(self, audio):
+        """Worker: transcribe one window with the previous text as prompt."""
+        with self._lock:
+            prompt = " ".join(self._texts)[-self.prompt_chars:] or None
+        ticket = self._wait_for_slot()
+        try:
+            text = self.transcriber.transcribe_waveform(audio, self.model_size, initial_prompt=prompt)
+        except Exception as e:
+            print(f"Error during live transcription: {str(e)}")
+            text = ""
+        finally:
+            if ticket is not None:
+                self.job_queue.leave(ticket)
+        with self._lock:
+            if text.strip():
+                self._texts.append(text.strip())
+            self.transcribed_seconds += len(audio) / SAMPLE_RATE
+
+    def _wait_for_slot(self):
+        """
+        Worker: hold a job queue slot for one window, backing off while the queue is full.
+
+        Audio keeps buffering meanwhile; the delay shows up as lag_seconds.
+
+        Returns:
+            int or None: Ticket to leave the queue with (None without a queue)
+        """
+        if self.job_queue is None:
+            return None
+        while True:
+            try:
+                ticket = self.job_queue.join()
+                break
+            except QueueFull as e:
+                time.sleep(min(e.retry_after, _MAX_BACKOFF_SECONDS))
+        self.job_queue.wait_turn(ticket)
+        return ticket
+
+    @staticmethod
+    def _quiet_cut(window, sample_rate, search_seconds=2.0, frame_seconds=0.1):
+        """
+        Find the quietest frame near the end of a window, to avoid cutting words.
+
+        Returns:
+            int: Sample index to cut at
+        """
+        frame = max(1, int(frame_seconds * sample_rate))
+        search = min(len(window), int(search_seconds * sample_rate)) // frame * frame
+        if search < frame:
+            return len(window)
+        tail = window[len(window) - search:].reshape(-1, frame)
+        energy = np.einsum("ij,ij->i", tail, tail)
+        quietest = int(np.argmin(energy))
+        return len(window) - search + quietest * frame + frame // 2
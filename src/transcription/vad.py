@@ -0,0 +1,174 @@
+"""
+Lightweight voice activity detection used to skip silence before Whisper.
+
+Frames are scored with NumPy only: speech-band level (dBFS) relative to a
+noise floor estimated from the quieter half of the recording, an absolute
+level gate, and spectral flatness to reject broadband noise. Loud, tonal
+frames start a region; neighbouring frames that are only somewhat above
+the floor extend it, so quiet word endings and soft speakers survive.
+"""
+import numpy as np
+
+from config import VAD_THRESHOLD_DB, VAD_PAD_MS, VAD_MIN_SILENCE_MS, VAD_MIN_SPEECH_MS
+from src.transcription.audio import SAMPLE_RATE
+
+
+def detect_speech(audio, sr=SAMPLE_RATE, frame_ms=30, threshold_db=VAD_THRESHOLD_DB,
+                  max_flatness=0.35, min_level_db=-55.0, pad_ms=VAD_PAD_MS,
+                  min_silence_ms=VAD_MIN_SILENCE_MS, min_speech_ms=VAD_MIN_SPEECH_MS):
+    """
+    Find the speech regions of a waveform.
+
+    Args:
+        audio (np.ndarray): float32 mono samples
+        sr (int): Sample rate
+        frame_ms (int): Analysis frame length
+        threshold_db (float): Speech-band level above the noise floor that starts a
+                              region; half of it is enough to extend one
+        max_flatness (float): Frames flatter than this (noise-like) cannot start a region
+        min_level_db (float): Frames quieter than this (dBFS) are never speech
+        pad_ms (int): Padding kept around each region so word edges survive
+        min_silence_ms (int): Shorter gaps between regions are merged
+        min_speech_ms (int): Shorter regions are dropped
+
+    Returns:
+        list: (start_sample, end_sample) tuples in ascending order
+    """
+    frame = int(sr * frame_ms / 1000)
+    n_frames = len(audio) // frame
+    if n_frames == 0:
+        return []
+
+    frames = audio[:n_frames * frame].reshape(n_frames, frame)
+    window = np.hanning(frame).astype(np.float32)
+    freqs = np.fft.rfftfreq(frame, 1.0 / sr)
+    in_band = (freqs >= 200) & (freqs <= 4000)
+
+    # Parseval: band power of the windowed frame -> mean square of the signal (0 dB = full scale)
+    scale = 2.0 / (frame * float(np.sum(window.astype(np.float64) ** 2)))
+    band_db = np.empty(n_frames, dtype=np.float64)
+    flatness = np.empty(n_frames, dtype=np.float64)
+    # Blocks of frames keep the spectrogram small for hour-long recordings
+    for start in range(0, n_frames, 8192):
+        block = frames[start:start + 8192]
+        band = np.abs(np.fft.rfft(block * window, axis=1)[:, in_band]) ** 2 + 1e-20
+        band_db[start:start + len(block)] = 10 * np.log10(band.sum(axis=1) * scale)
+        flatness[start:start + len(block)] = np.exp(np.log(band).mean(axis=1)) / band.mean(axis=1)
+
+    # Speech rarely fills more than half of a recording's quiet frames, so a low
+    # percentile of the quieter half is the noise floor whether speech is sparse or dense
+    quiet = band_db[band_db <= np.median(band_db)]
+    noise_floor = np.percentile(quiet, 20)
+    audible = band_db > min_level_db
+    starts_speech = audible & (band_db > noise_floor + threshold_db) & (flatness < max_flatness)
+    continues_speech = audible & (band_db > noise_floor + threshold_db / 2)
+    is_speech = _grow(starts_speech, continues_speech)
+
+    is_speech = _close_gaps(is_speech, int(min_silence_ms / frame_ms))
+    is_speech = _dilate(is_speech, int(pad_ms / frame_ms))
+
+    edges = np.diff(np.concatenate(([0], is_speech.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    min_frames = max(1, int(min_speech_ms / frame_ms))
+    keep = (ends - starts) >= min_frames
+    return [(int(s) * frame, min(len(audio), int(e) * frame)) for s, e in zip(starts[keep], ends[keep])]
+
+
+def _grow(seeds, mask):
+    """Keep the True runs of `mask` that contain at least one `seeds` frame."""
+    edges = np.diff(np.concatenate(([0], mask.astype(np.int8), [0])))
+    starts = np.flatnonzero(edges == 1)
+    ends = np.flatnonzero(edges == -1)
+    seeded = np.concatenate(([0], np.cumsum(seeds & mask)))
+    keep = seeded[ends] > seeded[starts]
+    marks = np.zeros(len(mask) + 1, dtype=np.int32)
+    np.add.at(marks, starts[keep], 1)
+    np.add.at(marks, ends[keep], -1)
+    return np.cumsum(marks[:-1]) > 0
+
+
+def _dilate(mask, width):
+    """Extend every True run by `width` frames on both sides."""
+    if width <= 0 or not mask.any():
+        return mask
+    kernel = np.ones(2 * width + 1, dtype=np.int32)
+    return np.convolve(mask.astype(np.int32), kernel, mode="same") > 0
+
+
+def _close_gaps(mask, max_gap):
+    """Fill False runs of at most `max_gap` frames that lie between True runs."""
+    if max_gap <= 0 or not mask.any():
+        return mask
+    edges = np.diff(np.concatenate(([1], mask.astype(np.int8), [1])))
+    gap_starts = np.flatnonzero(edges == -1)
+    gap_ends = np.flatnonzero(edges == 1)
+    filled = mask.copy()
+    for start, end in zip(gap_starts, gap_ends):
+        if 0 < start and end < len(mask) and end - start <= max_gap:
+            filled[start:end] = True
+    return filled
+
+
+class SpeechTimeline:
+    """
+    Maps times in the speech-only audio back to the original recording.
+    """
+
+    def __init__(self, regions, sr=SAMPLE_RATE, gap_seconds=0.0):
+        """
+        Args:
+            regions (list): (start_sample, end_sample) speech regions of the original audio
+            sr (int): Sample rate
+            gap_seconds (float): Silence inserted between regions in the compact audio
+        """
+        self.sr = sr
+        self.gap = gap_seconds
+        lengths = np.array([(end - start) / sr for start, end in regions], dtype=np.float64)
+        self.original_starts = np.array([start / sr for start, _ in regions], dtype=np.float64)
+        self.lengths = lengths
+        self.compact_starts = np.concatenate(([0.0], np.cumsum(lengths + gap_seconds)[:-1])) if len(regions) else lengths
+
+    @property
+    def speech_seconds(self):
+        """float: Seconds of speech kept."""
+        return float(self.lengths.sum())
+
+    def to_original(self, t):
+        """
+        Convert a time (or array of times) in the compact audio to the original timeline.
+
+        Times falling into an inserted gap snap to the end of the preceding region.
+        """
+        if len(self.lengths) == 0:
+            return t
+        t = np.asarray(t, dtype=np.float64)
+        index = np.clip(np.searchsorted(self.compact_starts, t, side="right") - 1, 0, len(self.lengths) - 1)
+        offset = np.clip(t - self.compact_starts[index], 0.0, self.lengths[index])
+        original = self.original_starts[index] + offset
+        return float(original) if original.ndim == 0 else original
+
+
+def trim_silence(audio, sr=SAMPLE_RATE, gap_seconds=0.2):
+    """
+    Keep only the speech regions of a waveform.
+
+    Args:
+        audio (np.ndarray): float32 mono samples
+        sr (int): Sample rate
+        gap_seconds (float): Silence kept between consecutive regions
+
+    Returns:
+        tuple: (compact float32 audio, SpeechTimeline)
+    """
+    regions = detect_speech(audio, sr)
+    timeline = SpeechTimeline(regions, sr, gap_seconds)
+    if not regions:
+        return np.zeros(0, dtype=np.float32), timeline
+
+    gap = np.zeros(int(gap_seconds * sr), dtype=np.float32)
+    pieces = []
+    for start, end in regions:
+        pieces.append(audio[start:end])
+        pieces.append(gap)
+    return np.concatenate(pieces[:-1]).astype(np.float32, copy=False), timeline
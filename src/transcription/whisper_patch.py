@@ -1,71 +1,123 @@
 """
 修补whisper库以使用指定的ffmpeg路径
+
+Nothing in this module runs at import time. The ffmpeg binary is resolved
+once on first use and cached; installing it is an explicit opt-in step
+(`python main.py --setup-ffmpeg`).
 """
 import os
 import sys
+import shutil
 import subprocess
-from pathlib import Path
+
+from config import FFMPEG_BINARY
+
+# Resolved ffmpeg executable, cached after the first lookup
+_FFMPEG_PATH = None
+_FFMPEG_RESOLVED = False
+_WHISPER_PATCHED = False
+
+
+def resolve_ffmpeg(refresh=False):
+    """
+    Locate the ffmpeg executable without spawning any process.
+
+    The lookup order is the FFMPEG_BINARY setting, `ffmpeg` on PATH and
+    finally the binary bundled with imageio-ffmpeg. The result is cached.
+
+    Args:
+        refresh (bool): Ignore the cached result and look again
+
+    Returns:
+        str or None: Absolute path to ffmpeg, or None if it cannot be found
+    """
+    global _FFMPEG_PATH, _FFMPEG_RESOLVED
+    if _FFMPEG_RESOLVED and not refresh:
+        return _FFMPEG_PATH
+
+    path = None
+    if FFMPEG_BINARY:
+        path = shutil.which(FFMPEG_BINARY) or (FFMPEG_BINARY if os.path.isfile(FFMPEG_BINARY) else None)
+    if path is None:
+        path = shutil.which("ffmpeg")
+    if path is None:
+        try:
+            import imageio_ffmpeg
+            candidate = imageio_ffmpeg.get_ffmpeg_exe()
+            if os.path.exists(candidate):
+                path = candidate
+        except Exception:
+            path = None
+
+    _FFMPEG_PATH = path
+    _FFMPEG_RESOLVED = True
+    return path
+
 
 def patch_whisper_ffmpeg():
     """
     修补whisper库以使用我们指定的ffmpeg路径
+
+    Only needed when ffmpeg is not on PATH under its plain name (e.g. the
+    imageio-ffmpeg binary). Safe to call repeatedly; the patch is applied once.
+
+    Returns:
+        bool: True if whisper will find a working ffmpeg
     """
-    try:
-        # 尝试从imageio_ffmpeg获取ffmpeg路径
-        import imageio_ffmpeg
-        ffmpeg_path = imageio_ffmpeg.get_ffmpeg_exe()
-        
-        if os.path.exists(ffmpeg_path):
-            print(f"Found ffmpeg at: {ffmpeg_path}")
-            
-            # 直接修改whisper库中的ffmpeg路径
-            import whisper
-            import whisper.audio
-            
-            # 保存原始函数
-            original_run_cmd = whisper.audio._run_cmd
-            
-            # 创建一个新函数，替换命令中的ffmpeg
-            def patched_run_cmd(cmd, **kwargs):
-                if cmd[0] == "ffmpeg":
-                    cmd[0] = ffmpeg_path
-                    print(f"Patched ffmpeg command: {cmd}")
-                return original_run_cmd(cmd, **kwargs)
-            
-            # 替换函数
-            whisper.audio._run_cmd = patched_run_cmd
-            
-            print("Successfully patched whisper to use imageio_ffmpeg")
-            return True
-        else:
-            print(f"ffmpeg not found at {ffmpeg_path}")
-            return False
-    except ImportError:
-        print("imageio_ffmpeg not installed, cannot patch whisper")
+    global _WHISPER_PATCHED
+    if _WHISPER_PATCHED:
+        return True
+
+    ffmpeg_path = resolve_ffmpeg()
+    if ffmpeg_path is None:
+        print("WARNING: ffmpeg not found. Run `python main.py --setup-ffmpeg` to install it.")
         return False
+
+    if shutil.which("ffmpeg") == ffmpeg_path:
+        _WHISPER_PATCHED = True
+        return True
+
+    try:
+        import whisper.audio
+
+        # whisper.audio calls subprocess.run as `run(cmd, ...)`
+        original_run = whisper.audio.run
+
+        # 创建一个新函数，替换命令中的ffmpeg
+        def patched_run(cmd, *args, **kwargs):
+            if cmd and cmd[0] == "ffmpeg":
+                cmd = [ffmpeg_path] + list(cmd[1:])
+            return original_run(cmd, *args, **kwargs)
+
+        whisper.audio.run = patched_run
+        _WHISPER_PATCHED = True
+        print(f"Patched whisper to use ffmpeg at: {ffmpeg_path}")
+        return True
     except Exception as e:
         print(f"Error patching whisper: {str(e)}")
         return False
 
+
 # 尝试安装ffmpeg
 def install_ffmpeg():
     """
-    尝试安装ffmpeg
+    Install the imageio-ffmpeg package, which bundles an ffmpeg binary.
+
+    This is an explicit setup step and is never called implicitly.
+
+    Returns:
+        bool: True if ffmpeg can be resolved afterwards
     """
     try:
-        # 检查系统是否有pip
-        subprocess.run([sys.executable, "-m", "pip", "--version"], check=True)
-        
-        # 安装ffmpeg-python
-        print("Installing ffmpeg-python...")
-        subprocess.run([sys.executable, "-m", "pip", "install", "ffmpeg-python"], check=True)
-        
-        # 安装imageio-ffmpeg
         print("Installing imageio-ffmpeg...")
         subprocess.run([sys.executable, "-m", "pip", "install", "imageio-ffmpeg"], check=True)
-        
-        print("ffmpeg packages installed successfully")
-        return True
     except Exception as e:
         print(f"Error installing ffmpeg: {str(e)}")
-        return False 
\ No newline at end of file
+        return False
+
+    ffmpeg_path = resolve_ffmpeg(refresh=True)
+    if ffmpeg_path is None:
+        print("imageio-ffmpeg installed, but no ffmpeg binary was found")
+        return False
+    print(f"ffmpeg available at: {ffmpeg_path}")
+    return True
@@ -1,48 +1,141 @@
 import os
-import torch
-import whisper
-import numpy as np
-from datetime import datetime
+import time
+import json
+import threading
 
-# 导入我们的修补模块
-from src.transcription.whisper_patch import patch_whisper_ffmpeg, install_ffmpeg
+from config import (
+    MODEL_LOAD_TIMEOUT, TRANSCRIPT_CACHE_DIR, TRANSCRIPT_CACHE_MAX_MB, VAD_ENABLED,
+    VAD_THRESHOLD_DB, VAD_PAD_MS, VAD_MIN_SILENCE_MS, VAD_MIN_SPEECH_MS,
+    PARALLEL_WORKERS, PARALLEL_MIN_SECONDS, PARALLEL_CHUNK_SECONDS, WHISPER_BATCHING, WHISPER_REPEAT_LIMIT
+)
+from src.transcription.guardrails import DecodeGuard, guarded, TIME_LIMITS
+from src.transcription.model_registry import get_default_registry
+from src.utils.disk_cache import DiskCache, file_digest
+from src.utils.memory import current_rss_bytes, format_bytes
+from src.utils.metrics import AUDIO_SECONDS, span, track
 
-# 尝试安装和修补ffmpeg
-install_ffmpeg()
-WHISPER_PATCHED = patch_whisper_ffmpeg()
+# torch and whisper are imported lazily so that importing this module stays cheap
 
 class WhisperTranscriber:
     """
     A class for transcribing audio using OpenAI's Whisper model.
     """
     
-    def __init__(self, model_size="base"):
+    def __init__(self, model_size="base", background=False, registry=None, cache=None,
+                 parallel_workers=PARALLEL_WORKERS, batching=WHISPER_BATCHING):
         """
         Initialize the Whisper transcriber with a specified model size.
         
         Args:
-            model_size (str): Size of the Whisper model to use.
+            model_size (str): Default size of the Whisper model to use.
                              Options: "tiny", "base", "small", "medium", "large"
+            background (bool): Load (and warm up) the default model in a
+                               background thread instead of blocking the caller
+            registry (ModelRegistry): Registry to load models from; defaults
+                                      to the process-wide shared registry
+            cache (DiskCache): Transcription cache; defaults to one in
+                               TRANSCRIPT_CACHE_DIR
+            parallel_workers (int): Worker processes for long recordings on
+                                    CPU; 0 or 1 transcribes in a single pass
+            batching (bool): Decode windows of concurrent requests together
+                             through a shared BatchScheduler
         """
         self.model_size = model_size
-        self.device = "cuda" if torch.cuda.is_available() else "cpu"
+        self.registry = registry or get_default_registry()
+        self.cache = cache or DiskCache(TRANSCRIPT_CACHE_DIR, TRANSCRIPT_CACHE_MAX_MB * 1024 * 1024)
+        self.parallel_workers = parallel_workers
+        self._parallel = None
+        self.batching = batching
+        self._batcher = None
+        self.load_error = None
+        self.load_seconds = None
+        self._load_started = None
+        self._ready = threading.Event()
+        self._load_thread = None
         
-        # 检查是否成功修补了whisper
-        if WHISPER_PATCHED:
-            print("Whisper has been patched to use the correct ffmpeg path")
+        if background:
+            self.start_loading()
         else:
-            print("WARNING: Failed to patch Whisper. Transcription may fail.")
+            self._load_model()
+    
+    @property
+    def device(self):
+        """str: Torch device models are loaded on (None until the first load)."""
+        return self.registry.device
+    
+    @property
+    def model(self):
+        """The default model if it is loaded, else None."""
+        entry = self.registry.peek(self.model_size)
+        return entry.model if entry is not None else None
+    
+    @property
+    def is_ready(self):
+        """bool: True once the default model is loaded and warmed up."""
+        return self._ready.is_set() and self.load_error is None
+    
+    def start_loading(self):
+        """
+        Start loading the default model in a daemon thread. Calling it again
+        while a load is in progress (or finished) does nothing.
+        """
+        if self._load_thread is not None or self._ready.is_set():
+            return
+        self._load_thread = threading.Thread(
+            target=self._load_model, name=f"whisper-load-{self.model_size}", daemon=True
+        )
+        self._load_thread.start()
+    
+    def wait_until_ready(self, timeout=None):
+        """
+        Block until the default model has finished loading.
         
-        print(f"Loading Whisper {model_size} model on {self.device}...")
-        self.model = whisper.load_model(model_size, device=self.device)
-        print(f"Whisper {model_size} model loaded successfully!")
+        Args:
+            timeout (float): Maximum seconds to wait, None to wait forever
+            
+        Returns:
+            bool: True if the model is ready to transcribe
+        """
+        self._ready.wait(timeout)
+        return self.is_ready
+    
+    def loading_status(self):
+        """
+        Describe the current loading state for the UI.
+        
+        Returns:
+            str: Human readable loading state
+        """
+        if self.is_ready:
+            return f"ready (loaded in {self.load_seconds:.1f}s)"
+        if self.load_error is not None:
+            return f"failed to load: {self.load_error}"
+        if self._load_started is None:
+            return "not loaded"
+        return f"loading... ({time.time() - self._load_started:.0f}s elapsed)"
+    
+    def _load_model(self):
+        """Load the default model through the registry and mark it ready."""
+        self._load_started = time.time()
+        try:
+            self.registry.get(self.model_size)
+            self.load_seconds = time.time() - self._load_started
+        except Exception as e:
+            self.load_error = str(e)
+            print(f"Error loading Whisper {self.model_size} model: {str(e)}")
+            if self._load_thread is None:
+                raise
+        finally:
+            self._ready.set()
     
-    def transcribe(self, audio_path):
+    def transcribe(self, audio_path, model_size=None):
         """
         Transcribe audio from a file path.
         
         Args:
             audio_path (str): Path to the audio file
+            model_size (str): Model size for this request; defaults to the
+                              transcriber's model size. Loaded on first use.
             
         Returns:
             str: Transcribed text
@@ -51,38 +144,249 @@ class WhisperTranscriber:
             raise FileNotFoundError(f"Audio file not found: {audio_path}")
         
         try:
-            # 直接设置ffmpeg路径
-            try:
-                import imageio_ffmpeg
-                ffmpeg_path = imageio_ffmpeg.get_ffmpeg_exe()
-                print(f"Setting ffmpeg path to: {ffmpeg_path}")
-                # 设置环境变量
-                os.environ["PATH"] = os.path.dirname(ffmpeg_path) + os.pathsep + os.environ["PATH"]
-                # 直接尝试运行ffmpeg
-                import subprocess
-                subprocess.run([ffmpeg_path, "-version"], check=True, capture_output=True)
-                print("ffmpeg is available and working!")
-            except Exception as e:
-                print(f"Warning: Could not set ffmpeg path: {e}")
-            
-            # Transcribe using Whisper
-            result = self.model.transcribe(audio_path, fp16=torch.cuda.is_available())
-            return result["text"]
+            return self.transcribe_result(audio_path, model_size)["text"]
         except Exception as e:
             print(f"Error during transcription: {str(e)}")
             import traceback
             traceback.print_exc()
             return f"Error during transcription: {str(e)}"
     
-    def get_model_info(self):
+    def transcribe_result(self, audio_path, model_size=None):
+        """
+        Transcribe audio from a file path, keeping segments and timing.
+        
+        Unlike transcribe(), errors are raised.
+        
+        Args:
+            audio_path (str): Path to the audio file
+            model_size (str): Model size; defaults to the transcriber's model size
+            
+        Returns:
+            dict: "text", "segments" (start, end, text), "language",
+                  "audio_seconds" and "transcribe_seconds"
         """
-        Get information about the current model.
+        with track("transcribe"):
+            return self._transcribe_file(audio_path, model_size or self.model_size)
+    
+    def _transcribe_file(self, audio_path, model_size):
+        """transcribe_result() without the request metrics."""
+        decode_options = {"fp16": self.registry.resolve_device() == "cuda"}
+        start = time.time()
         
+        # Same audio bytes + model + options always give the same transcript
+        cache_key = None
+        if self.cache.enabled:
+            cache_options = dict(decode_options, vad=VAD_ENABLED, batched=self.batching)
+            if VAD_ENABLED:
+                # Other VAD settings find other speech regions, so other transcripts
+                cache_options["vad"] = [VAD_THRESHOLD_DB, VAD_PAD_MS, VAD_MIN_SILENCE_MS, VAD_MIN_SPEECH_MS]
+            if self.registry.quantized:
+                # int8 output can differ slightly from fp32; keep their cache entries apart
+                cache_options["int8"] = True
+            if self._use_parallel(float("inf")):
+                # Long recordings are cut into chunks decoded separately, which changes the
+                # text at the cuts; whether a file is long enough is only known after VAD
+                cache_options["parallel"] = [PARALLEL_MIN_SECONDS, PARALLEL_CHUNK_SECONDS]
+            if WHISPER_REPEAT_LIMIT:
+                # Windows cut for repeating themselves decode differently
+                cache_options["repeat_limit"] = WHISPER_REPEAT_LIMIT
+            cache_key = self._cache_key(file_digest(audio_path), model_size, cache_options)
+            cached = self.cache.get(cache_key)
+            if cached is not None:
+                print(f"Transcription cache hit for {os.path.basename(audio_path)} ({model_size})")
+                return dict(cached, transcribe_seconds=time.time() - start)
+        
+        if model_size == self.model_size and not self.wait_until_ready(timeout=MODEL_LOAD_TIMEOUT):
+            raise RuntimeError(f"Whisper model is {self.loading_status()}")
+        
+        # Decode in-process (ffmpeg is only used for compressed formats)
+        from src.transcription.audio import load_audio, SAMPLE_RATE
+        with span("audio_load"):
+            audio = load_audio(audio_path)
+        
+        # Transcribe using Whisper
+        result = self._cacheable_result(self._run_model(audio, model_size, **decode_options))
+        result["audio_seconds"] = len(audio) / SAMPLE_RATE
+        
+        # Windows cut for time depend on how busy the machine was; do not reuse those
+        if cache_key is not None and not set(result.get("guardrails", {})) & set(TIME_LIMITS):
+            self.cache.put(cache_key, result)
+        return dict(result, transcribe_seconds=time.time() - start)
+    
+    def transcribe_waveform(self, audio, model_size=None, initial_prompt=None):
+        """
+        Transcribe an in-memory waveform (used for live streaming windows).
+        
+        Unlike transcribe(), results are not cached and errors are raised.
+        
+        Args:
+            audio (np.ndarray): float32 mono samples at 16 kHz
+            model_size (str): Model size; defaults to the transcriber's model size
+            initial_prompt (str): Preceding text used to condition the decoder
+            
+        Returns:
+            str: Transcribed text
+        """
+        return self.transcribe_waveform_result(audio, model_size, initial_prompt)["text"]
+    
+    def transcribe_waveform_result(self, audio, model_size=None, initial_prompt=None):
+        """
+        Transcribe an in-memory waveform, keeping segments.
+        
+        Args:
+            audio (np.ndarray): float32 mono samples at 16 kHz
+            model_size (str): Model size; defaults to the transcriber's model size
+            initial_prompt (str): Preceding text used to condition the decoder
+            
+        Returns:
+            dict: "text", "segments" (start, end, text, avg_logprob,
+                  no_speech_prob), "language" and "audio_seconds"
+        """
+        from src.transcription.audio import SAMPLE_RATE
+        
+        model_size = model_size or self.model_size
+        with track("transcribe_waveform"):
+            if model_size == self.model_size and not self.wait_until_ready(timeout=MODEL_LOAD_TIMEOUT):
+                raise RuntimeError(f"Whisper model is {self.loading_status()}")
+            
+            result = self._run_model(audio, model_size, fp16=self.device == "cuda", initial_prompt=initial_prompt)
+            result = self._cacheable_result(result)
+            result["audio_seconds"] = len(audio) / SAMPLE_RATE
+            return result
+    
+    def _run_model(self, audio, model_size, **decode_options):
+        """
+        Run Whisper on a waveform, skipping silence first when VAD is enabled.
+        
+        Segment timestamps always refer to the original (untrimmed) audio.
+        
+        Args:
+            audio (np.ndarray): float32 mono samples at 16 kHz
+            model_size (str): Model size to use
+            **decode_options: Passed through to model.transcribe
+            
+        Returns:
+            dict: Whisper result with "text", "segments" and "language"
+        """
+        from src.transcription.audio import SAMPLE_RATE
+        
+        original_seconds = len(audio) / SAMPLE_RATE
+        AUDIO_SECONDS.inc(original_seconds)
+        timeline = None
+        if VAD_ENABLED:
+            from src.transcription.vad import trim_silence
+            with span("vad"):
+                audio, timeline = trim_silence(audio)
+            kept = timeline.speech_seconds
+            speedup = original_seconds / kept if kept else float("inf")
+            print(f"VAD: kept {kept:.1f}s of {original_seconds:.1f}s audio "
+                  f"(trimmed {original_seconds - kept:.1f}s, ~{speedup:.1f}x less to decode)")
+            if len(audio) == 0:
+                return {"text": "", "segments": [], "language": None}
+        
+        # Limits on repetition loops and decode time (see guardrails.py)
+        guard = DecodeGuard(len(audio) / SAMPLE_RATE)
+        
+        # "decode" spans the whole model call; the encoder's share is also timed as "encode"
+        start = time.time()
+        with span("decode"):
+            if self._use_parallel(len(audio) / SAMPLE_RATE):
+                result = self._get_parallel().transcribe(audio, model_size, guard=guard, **decode_options)
+            elif self.batching and not decode_options.get("initial_prompt"):
+                # Windows with a prompt cannot share a batch, so those decode directly
+                result = self._get_batcher().transcribe(audio, model_size, fp16=decode_options.get("fp16", False),
+                                                        guard=guard)
+            else:
+                with self.registry.acquire(model_size) as model, guarded([guard]):
+                    result = model.transcribe(audio, **decode_options)
+        elapsed = time.time() - start
+        
+        if guard.interventions:
+            result["guardrails"] = dict(guard.interventions)
+            cuts = ", ".join(f"{reason} x{count}" for reason, count in guard.interventions.items())
+            print(f"Decode guardrails cut short or skipped windows: {cuts}")
+        
+        if timeline is not None:
+            for segment in result.get("segments", []):
+                segment["start"] = timeline.to_original(segment["start"])
+                segment["end"] = timeline.to_original(segment["end"])
+                for word in segment.get("words", []):
+                    word["start"] = timeline.to_original(word["start"])
+                    word["end"] = timeline.to_original(word["end"])
+        
+        if original_seconds:
+            print(f"Transcribed {original_seconds:.1f}s of audio in {elapsed:.1f}s "
+                  f"(real-time factor {elapsed / original_seconds:.2f})")
+        return result
+    
+    def _use_parallel(self, seconds):
+        """Whether a recording of this length goes to the process pool."""
+        return (self.parallel_workers > 1 and self.registry.resolve_device() == "cpu"
+                and seconds >= PARALLEL_MIN_SECONDS)
+    
+    def _get_parallel(self):
+        """Create the process pool wrapper on first use."""
+        if self._parallel is None:
+            from src.transcription.parallel import ParallelTranscriber
+            self._parallel = ParallelTranscriber(workers=self.parallel_workers, quantize=self.registry.quantize)
+        return self._parallel
+    
+    def _get_batcher(self):
+        """Create the batch scheduler on first use."""
+        if self._batcher is None:
+            from src.transcription.batching import BatchScheduler
+            self._batcher = BatchScheduler(self.registry)
+        return self._batcher
+    
+    @staticmethod
+    def _cache_key(audio_digest, model_size, decode_options):
+        """Build the transcription cache key."""
+        return f"{audio_digest}:{model_size}:{json.dumps(decode_options, sort_keys=True)}"
+    
+    @staticmethod
+    def _cacheable_result(result):
+        """Keep the JSON-friendly parts of a Whisper result."""
+        cacheable = {
+            "text": result["text"],
+            "language": result.get("language"),
+            "segments": [
+                {key: segment[key] for key in ("start", "end", "text", "avg_logprob", "no_speech_prob")
+                 if key in segment}
+                for segment in result.get("segments", [])
+            ],
+        }
+        if result.get("guardrails"):
+            cacheable["guardrails"] = result["guardrails"]
+        return cacheable
+    
+    def get_model_info(self, model_size=None):
+        """
+        Get information about a model and the registry holding it.
+        
+        Args:
+            model_size (str): Model to describe; defaults to the transcriber's model size
+            
         Returns:
             dict: Information about the model
         """
-        return {
-            "model_size": self.model_size,
+        model_size = model_size or self.model_size
+        registry_stats = self.registry.stats()
+        info = {
+            "model_size": model_size,
             "device": self.device,
-            "parameters": f"{self.model.dims.n_text_state:,}"
-        }
\ No newline at end of file
+            "ready": self.is_ready,
+            "status": self.loading_status(),
+            "loaded_models": [m["model_size"] for m in registry_stats["models"]],
+            "models_memory": format_bytes(registry_stats["memory_used_bytes"]),
+            "process_rss": format_bytes(current_rss_bytes()),
+            "cache": self.cache.stats(),
+        }
+        if self._batcher is not None:
+            info["batching"] = self._batcher.stats()
+        if self.registry.quantize and self.device == "cpu":
+            info["precision"] = "int8"
+        entry = self.registry.peek(model_size)
+        if entry is not None:
+            info["parameters"] = f"{entry.parameters:,}"
+            info["model_memory"] = format_bytes(entry.memory_bytes)
+        return info
@@ -1,4 +1,5 @@
 # UI module initialization
 from .gradio_interface import create_interface
+from .server import create_app
 
-__all__ = ['create_interface']
\ No newline at end of file
+__all__ = ['create_interface', 'create_app']
@@ -1,32 +1,61 @@
 import os
-import gradio as gr
 import time
+import uuid
 from datetime import datetime
-from config import APP_TITLE, APP_DESCRIPTION
+from concurrent.futures import ThreadPoolExecutor
+from config import (
+    APP_TITLE, APP_DESCRIPTION, MODEL_LOAD_TIMEOUT, ARCHIVE_DB_PATH,
+    AUDIO_ARCHIVE_DIR, AUDIO_ARCHIVE_CODEC, AUDIO_ARCHIVE_OPUS_BITRATE, SEGMENTS_DIR,
+    TRANSCRIBE_CONCURRENCY, TRANSCRIBE_QUEUE_SIZE, SUMMARIZE_CONCURRENCY, SUMMARIZE_QUEUE_SIZE
+)
+from src.transcription.model_registry import MODEL_SIZES
+from src.transcription.segments import SegmentTable
+from src.utils.job_queue import JobQueue, QueueFull
+from src.utils.memory import format_bytes
+from src.utils.metrics import span
+from src.storage.meeting_archive import MeetingArchive
+from src.storage.audio_archive import AudioArchive
 
-def create_interface(transcriber, summarizer, save_dir="./data/saved_meetings"):
+def create_interface(transcriber, summarizer, save_dir="./data/saved_meetings", archive=None,
+                     audio_archive=None):
     """
     Create the Gradio interface for the Meeting Recorder app.
     
     Args:
         transcriber: The WhisperTranscriber instance
         summarizer: The MeetingSummarizer instance
-        save_dir: Directory to save meeting recordings and summaries
+        save_dir: Directory for files exported with the save buttons
+        archive: The MeetingArchive that stores every meeting; defaults to ARCHIVE_DB_PATH
+        audio_archive: The AudioArchive that keeps the recordings; defaults to AUDIO_ARCHIVE_DIR
         
     Returns:
         gr.Blocks: Gradio interface
     """
+    # Imported here so that importing src.ui does not pull in gradio
+    import gradio as gr
+    from src.transcription.streaming import StreamingTranscriber
+
     # Ensure the save directory exists
     os.makedirs(save_dir, exist_ok=True)
+    archive = archive or MeetingArchive(ARCHIVE_DB_PATH)
+    audio_archive = audio_archive or AudioArchive(AUDIO_ARCHIVE_DIR, AUDIO_ARCHIVE_CODEC, AUDIO_ARCHIVE_OPUS_BITRATE)
+    
+    # Shared limits on how many transcriptions and summaries run at once
+    transcription_queue = JobQueue("transcription", TRANSCRIBE_CONCURRENCY, TRANSCRIBE_QUEUE_SIZE)
+    summary_queue = JobQueue("summary", SUMMARIZE_CONCURRENCY, SUMMARIZE_QUEUE_SIZE)
+    # Archiving decodes and encodes each upload again; it runs outside the transcription slots
+    archive_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="audio-archive")
     
-    # App state
-    state = {
-        "audio_path": None,
-        "transcript": None,
-        "summary": None,
-        "start_time": None,
-        "session_id": None
-    }
+    def new_session_state():
+        """Fresh per-browser session state."""
+        return {
+            "audio_path": None,
+            "transcript": None,
+            "summary": None,
+            "segments": None,
+            "start_time": None,
+            "session_id": None
+        }
     
     # Helper functions
     def update_status(message, is_error=False):
@@ -37,64 +66,233 @@ def create_interface(transcriber, summarizer, save_dir="./data/saved_meetings"):
     def generate_session_id():
         """Generate a unique session ID for this meeting."""
         timestamp = datetime.now().strftime("%Y%m%d-%H%M%S")
-        return f"meeting-{timestamp}"
+        return f"meeting-{timestamp}-{uuid.uuid4().hex[:6]}"
+    
+    def wait_in_queue(job_queue, ticket):
+        """Yield status messages with queue position and ETA until the job may run."""
+        while not job_queue.wait_turn(ticket, timeout=1.0):
+            position = job_queue.position(ticket)
+            yield update_status(f"Queued for {job_queue.name}: position {position}, "
+                                f"about {job_queue.eta(ticket):.0f}s until it starts ⏳")
+    
+    def busy_message(error):
+        """Status shown when a queue turns a request away."""
+        return update_status(f"The server is busy ({error.queue_name} queue is full). "
+                             f"Please try again in about {error.retry_after:.0f}s.", True)
     
-    def record_started():
+    def record_started(session):
         """Called when recording starts."""
-        state["start_time"] = datetime.now()
-        state["session_id"] = generate_session_id()
-        return update_status("Recording in progress... 🔴")
+        session["start_time"] = datetime.now()
+        session["session_id"] = generate_session_id()
+        return update_status("Recording in progress... 🔴"), session
     
-    def transcribe_audio(audio_path):
-        """Transcribe the recorded audio."""
+    def transcribe_audio(audio_path, model_size, session):
+        """Transcribe the recorded audio with the selected model size."""
         if not audio_path:
-            return update_status("No audio recorded. Please record audio first.", True), None
+            yield update_status("No audio recorded. Please record audio first.", True), None, session
+            return
         
         try:
-            state["audio_path"] = audio_path
-            status = update_status("Transcribing audio... This may take a moment.")
+            ticket = transcription_queue.join()
+        except QueueFull as e:
+            yield busy_message(e), None, session
+            return
+        
+        try:
+            session["audio_path"] = audio_path
+            if session["session_id"] is None:
+                session["session_id"] = generate_session_id()
+            
+            for status in wait_in_queue(transcription_queue, ticket):
+                yield status, None, session
+            
+            # The default model loads in the background; wait for it and say so
+            if model_size == transcriber.model_size and not transcriber.is_ready:
+                yield update_status(f"Whisper model is {transcriber.loading_status()} "
+                                    "Transcription will start when it is ready."), None, session
+                if not transcriber.wait_until_ready(timeout=MODEL_LOAD_TIMEOUT):
+                    yield update_status(f"Whisper model is {transcriber.loading_status()}", True), None, session
+                    return
+            
+            if not transcriber.registry.is_loaded(model_size):
+                yield update_status(f"Loading Whisper {model_size} model... This may take a moment."), None, session
+            else:
+                yield update_status("Transcribing audio... This may take a moment."), None, session
             
             # Call the transcriber
-            transcript = transcriber.transcribe(audio_path)
+            result = transcriber.transcribe_result(audio_path, model_size=model_size)
+            transcript = result["text"]
             
             # Save the transcript
-            if transcript and state["session_id"]:
-                transcript_path = os.path.join(save_dir, f"{state['session_id']}_transcript.txt")
-                with open(transcript_path, "w", encoding="utf-8") as f:
-                    f.write(transcript)
-                print(f"Transcript saved to {transcript_path}")
-            
-            state["transcript"] = transcript
-            return update_status("Transcription complete"), transcript
+            save_transcript(
+                transcript, session,
+                segments=result["segments"],
+                model_size=model_size,
+                language=result.get("language"),
+                audio_seconds=result.get("audio_seconds"),
+                transcribe_seconds=result.get("transcribe_seconds"),
+            )
+            
+            # Keep a compact copy of the recording; Gradio's temp file does not last
+            if transcript:
+                archive_executor.submit(archive_recording, audio_path, session["session_id"])
+            
+            # Timestamps and confidences, saved so they can be mapped back in later
+            table = SegmentTable.from_result(result)
+            try:
+                with span("file_save"):
+                    table.save(os.path.join(SEGMENTS_DIR, f"{session['session_id']}.seg"))
+            except Exception as e:
+                print(f"Segment table error: {str(e)}")
+            
+            session["transcript"] = transcript
+            session["segments"] = table
+            yield update_status("Transcription complete"), transcript, session
         except Exception as e:
             import traceback
             error_trace = traceback.format_exc()
             print(f"Transcription error: {str(e)}")
             print(error_trace)
-            return update_status(f"Transcription error: {str(e)}", True), None
+            yield update_status(f"Transcription error: {str(e)}", True), None, session
+        finally:
+            transcription_queue.leave(ticket)
+    
+    def archive_recording(audio_path, session_id):
+        """Store an upload in the audio archive and link it to its meeting (background thread)."""
+        try:
+            with span("audio_archive"):
+                audio_hash = audio_archive.store(audio_path)
+            archive.save_meeting(session_id, audio_hash=audio_hash)
+        except Exception as e:
+            print(f"Audio archiving error: {str(e)}")
     
-    def generate_meeting_summary(transcript):
+    def save_transcript(transcript, session, **fields):
+        """Store the transcript of a session (and its metadata) in the archive."""
+        if transcript and session["session_id"]:
+            started = session["start_time"] or datetime.now()
+            with span("file_save"):
+                archive.save_meeting(
+                    session["session_id"],
+                    transcript=transcript,
+                    title=started.strftime("Meeting %Y-%m-%d %H:%M"),
+                    created_at=started.timestamp(),
+                    **fields
+                )
+            print(f"Transcript archived as {session['session_id']}")
+    
+    def live_started(model_size, session):
+        """Start a live transcription session when the live recorder starts."""
+        # Windows wait for transcription slots later; a full queue turns the session away now
+        try:
+            transcription_queue.check_room()
+        except QueueFull as e:
+            return None, busy_message(e), gr.update(), session
+        session["start_time"] = datetime.now()
+        session["session_id"] = generate_session_id()
+        live = StreamingTranscriber(transcriber, model_size=model_size, job_queue=transcription_queue)
+        return live, update_status("Live transcription in progress... 🔴"), "", session
+    
+    def live_chunk(chunk, live):
+        """Feed one microphone chunk into the live session."""
+        if chunk is None or live is None:
+            return live, gr.update()
+        sample_rate, samples = chunk
+        live.add_chunk(samples, sample_rate)
+        return live, live.text
+    
+    def live_stopped(live, session):
+        """Transcribe the remaining audio once the live recorder stops."""
+        if live is None:
+            return None, update_status("Live transcription was not started.", True), gr.update(), session
+        try:
+            lag = live.lag_seconds
+            transcript = live.finish()
+            save_transcript(transcript, session, model_size=live.model_size, source="live")
+            session["transcript"] = transcript
+            session["segments"] = None
+            return None, update_status(f"Live transcription complete ({lag:.1f}s left at stop)"), transcript, session
+        except Exception as e:
+            print(f"Live transcription error: {str(e)}")
+            return None, update_status(f"Live transcription error: {str(e)}", True), gr.update(), session
+    
+    def describe_model():
+        """Render the model info panel (re-evaluated on each page load)."""
+        info = transcriber.get_model_info()
+        cache = info["cache"]
+        summary_cache = summarizer.cache.stats()
+        queue_stats = transcription_queue.stats()
+        return (
+            f"**Default model:** Whisper {info['model_size']}\n"
+            f"**Device:** {info['device'] or 'pending'}\n"
+            f"**Status:** {info['status']}\n"
+            f"**Loaded:** {', '.join(info['loaded_models']) or 'none'} ({info['models_memory']})\n"
+            f"**Process memory:** {info['process_rss']}\n"
+            f"**Cache:** {cache['hits']} hits / {cache['misses']} misses\n"
+            f"**Summary cache:** {summary_cache['hits']} hits / {summary_cache['misses']} misses "
+            f"({summary_cache['hit_rate']:.0%} hit rate)\n"
+            f"**Queue:** {queue_stats['running']} running / {queue_stats['waiting']} waiting"
+        )
+    
+    def generate_meeting_summary(transcript, regenerate, session):
         """Generate a summary of the meeting transcript."""
         if not transcript or transcript.strip() == "":
-            return update_status("No transcript available. Please transcribe audio first.", True), None
+            yield update_status("No transcript available. Please transcribe audio first.", True), None, session
+            return
         
         try:
-            status = update_status("Generating summary... This may take a moment.")
+            ticket = summary_queue.join()
+        except QueueFull as e:
+            yield busy_message(e), None, session
+            return
+        
+        try:
+            for status in wait_in_queue(summary_queue, ticket):
+                yield status, None, session
+            
+            yield update_status("Generating summary... This may take a moment."), None, session
+            
+            # Stream the summary into the textbox as it is written
+            started = time.time()
+            summary = ""
+            last_update = 0.0
+            # Leave out segments Whisper was unsure about, unless the transcript was edited
+            table = session["segments"]
+            if table is not None and transcript == session["transcript"]:
+                confident = table.confident()
+                if len(confident) < len(table):
+                    print(f"Summarizing {len(confident)} of {len(table)} segments (dropped low-confidence ones)")
+                transcript = confident.text.strip() or transcript
             
-            # Call the summarizer
-            summary = summarizer.generate_summary(transcript)
+            # Sessions keep a rolling summary, so repeated clicks during a long
+            # meeting only send the text transcribed since the last summary
+            if session["session_id"]:
+                deltas = summarizer.stream_rolling_summary(session["session_id"], transcript, full=regenerate)
+            else:
+                deltas = summarizer.stream_summary(transcript, use_cache=not regenerate)
+            for delta in deltas:
+                summary += delta
+                # Refreshing on every token would flood the browser
+                if time.time() - last_update >= 0.1:
+                    last_update = time.time()
+                    yield update_status("Generating summary..."), summary, session
             
-            # Save the summary
-            if summary and state["session_id"]:
-                summary_path = os.path.join(save_dir, f"{state['session_id']}_summary.txt")
-                with open(summary_path, "w", encoding="utf-8") as f:
-                    f.write(summary)
-                print(f"Summary saved to {summary_path}")
+            # Save the summary once the stream has finished
+            if summary and session["session_id"]:
+                with span("file_save"):
+                    archive.save_meeting(
+                        session["session_id"],
+                        summary=summary,
+                        llm_model=summarizer.model if summarizer.client is not None else "offline",
+                        summarize_seconds=time.time() - started,
+                    )
+                print(f"Summary archived as {session['session_id']}")
             
-            state["summary"] = summary
-            return update_status("Summary generation complete"), summary
+            session["summary"] = summary
+            yield update_status("Summary generation complete"), summary, session
         except Exception as e:
-            return update_status(f"Summary generation error: {str(e)}", True), None
+            yield update_status(f"Summary generation error: {str(e)}", True), None, session
+        finally:
+            summary_queue.leave(ticket)
     
     def save_text(text, prefix="meeting"):
         """Save text to a file."""
@@ -106,24 +304,69 @@ def create_interface(transcriber, summarizer, save_dir="./data/saved_meetings"):
         filepath = os.path.join(save_dir, filename)
         
         try:
-            with open(filepath, "w", encoding="utf-8") as f:
+            with span("file_save"), open(filepath, "w", encoding="utf-8") as f:
                 f.write(text)
             return f"✅ Successfully saved to {filepath}"
         except Exception as e:
             return f"❌ Error saving file: {str(e)}"
     
+    def describe_archive():
+        """Render the archive size line (re-evaluated on each page load)."""
+        stats = archive.stats()
+        audio = audio_archive.stats()
+        return (f"**Archive:** {stats['meetings']} meetings, {stats['audio_seconds'] / 3600:.1f} h of audio, "
+                f"{format_bytes(stats['size_bytes'])}  \n"
+                f"**Recordings:** {audio['objects']} stored in {format_bytes(audio['stored_bytes'])} "
+                f"({audio['compression_ratio']:.1f}x smaller than uploaded, {audio['dedup_hits']} duplicates skipped, "
+                f"encoded at {audio['encode_throughput']:.0f}x real time)")
+    
+    def search_meetings(query):
+        """Search the archive and list the matching meetings and segments."""
+        if not query or not query.strip():
+            return "Enter words to search for.", gr.update(choices=[], value=None)
+        start = time.time()
+        meetings = archive.search(query, limit=20)
+        segments = archive.search_segments(query, limit=10)
+        elapsed_ms = (time.time() - start) * 1000
+        
+        if not meetings:
+            return f"No meetings match **{query}** ({elapsed_ms:.0f} ms).", gr.update(choices=[], value=None)
+        lines = [f"**{len(meetings)} meetings** match ({elapsed_ms:.0f} ms):", ""]
+        for meeting in meetings:
+            date = datetime.fromtimestamp(meeting["created_at"]).strftime("%Y-%m-%d %H:%M")
+            lines.append(f"- **{meeting['title'] or meeting['meeting_id']}** ({date}): {meeting['snippet']}")
+        if segments:
+            lines += ["", "**Matching moments:**", ""]
+            for segment in segments:
+                minutes, seconds = divmod(int(segment["start"]), 60)
+                lines.append(f"- `{segment['meeting_id']}` at {minutes}:{seconds:02d}: {segment['text']}")
+        ids = [meeting["meeting_id"] for meeting in meetings]
+        return "\n".join(lines), gr.update(choices=ids, value=ids[0])
+    
+    def open_meeting(meeting_id):
+        """Show an archived meeting."""
+        meeting = archive.get_meeting(meeting_id) if meeting_id else None
+        if meeting is None:
+            return "", "", ""
+        details = [f"**{meeting['title'] or meeting['meeting_id']}**",
+                   datetime.fromtimestamp(meeting["created_at"]).strftime("%Y-%m-%d %H:%M")]
+        if meeting["audio_seconds"]:
+            details.append(f"{meeting['audio_seconds'] / 60:.1f} min of audio")
+        if meeting["model_size"]:
+            details.append(f"Whisper {meeting['model_size']}")
+        if meeting["llm_model"]:
+            details.append(f"summary by {meeting['llm_model']}")
+        return " · ".join(details), meeting["transcript"], meeting["summary"]
+    
     def clear_all():
-        """Reset the application state."""
-        state["audio_path"] = None
-        state["transcript"] = None
-        state["summary"] = None
-        state["start_time"] = None
+        """Reset the session state."""
         return (
             update_status("All data cleared. Ready to record new meeting."),
             None,  # Clear audio
             "",    # Clear transcript
             "",    # Clear summary
-            ""     # Clear save status
+            "",    # Clear save status
+            new_session_state()
         )
     
     # Create the Gradio interface
@@ -134,72 +377,139 @@ def create_interface(transcriber, summarizer, save_dir="./data/saved_meetings"):
         gr.Markdown(f"# 🎙️ {APP_TITLE}")
         gr.Markdown(f"### {APP_DESCRIPTION}")
         
-        # Status indicator
-        status_indicator = gr.Markdown("### Status: Ready to record")
-        
-        # Audio recording component
-        with gr.Row():
-            with gr.Column(scale=3):
-                audio_input = gr.Audio(
-                    sources=["microphone"],
-                    type="filepath",
-                    label="Meeting Recording",
-                    elem_id="audio_recorder"
-                )
+        with gr.Tab("🎙️ Record meeting"):
+            # Status indicator
+            status_indicator = gr.Markdown("### Status: Ready to record")
             
-            with gr.Column(scale=1):
-                model_info = gr.Markdown(
-                    f"**Model:** Whisper {transcriber.model_size}\n"
-                    f"**Device:** {transcriber.device}"
-                )
-        
-        # Transcription section
-        with gr.Row():
-            transcribe_btn = gr.Button("📝 Transcribe Audio", variant="primary", size="lg")
-        
-        transcript_output = gr.Textbox(
-            label="📄 Meeting Transcript",
-            lines=10,
-            placeholder="Record your meeting and click 'Transcribe Audio' button. The transcript will appear here...",
-            elem_id="transcript_box"
-        )
-        
-        # Summary section
-        with gr.Row():
-            summarize_btn = gr.Button("📋 Generate Meeting Summary", variant="secondary", size="lg")
-        
-        summary_output = gr.Textbox(
-            label="✨ Meeting Summary",
-            lines=10,
-            placeholder="After transcription, click 'Generate Meeting Summary' button. The summary will appear here...",
-            elem_id="summary_box"
-        )
-        
-        # Save and clear options
-        with gr.Row():
-            save_transcript_btn = gr.Button("💾 Save Transcript", size="sm")
-            save_summary_btn = gr.Button("💾 Save Summary", size="sm")
-            clear_all_btn = gr.Button("🗑️ Clear All", size="sm")
+            # Audio recording component
+            with gr.Row():
+                with gr.Column(scale=3):
+                    audio_input = gr.Audio(
+                        sources=["microphone"],
+                        type="filepath",
+                        label="Meeting Recording",
+                        elem_id="audio_recorder"
+                    )
+                    with gr.Accordion("🔴 Live transcription (transcribes while you record)", open=False):
+                        live_audio = gr.Audio(
+                            sources=["microphone"],
+                            type="numpy",
+                            streaming=True,
+                            label="Live Recording",
+                            elem_id="live_recorder"
+                        )
+                    live_session = gr.State(None)
+                    session_state = gr.State(new_session_state())
+            
+                with gr.Column(scale=1):
+                    model_size_input = gr.Dropdown(
+                        choices=MODEL_SIZES,
+                        value=transcriber.model_size,
+                        label="Whisper model",
+                        info="Smaller models are faster, larger ones more accurate"
+                    )
+                    model_info = gr.Markdown(describe_model)
+            
+            # Transcription section
+            with gr.Row():
+                transcribe_btn = gr.Button("📝 Transcribe Audio", variant="primary", size="lg")
+            
+            transcript_output = gr.Textbox(
+                label="📄 Meeting Transcript",
+                lines=10,
+                placeholder="Record your meeting and click 'Transcribe Audio' button. The transcript will appear here...",
+                elem_id="transcript_box"
+            )
+            
+            # Summary section
+            with gr.Row():
+                summarize_btn = gr.Button("📋 Generate Meeting Summary", variant="secondary", size="lg")
+                regenerate_input = gr.Checkbox(label="Re-summarize from scratch (ignore cached and rolling summary)", value=False)
+            
+            summary_output = gr.Textbox(
+                label="✨ Meeting Summary",
+                lines=10,
+                placeholder="After transcription, click 'Generate Meeting Summary' button. The summary will appear here...",
+                elem_id="summary_box"
+            )
+            
+            # Save and clear options
+            with gr.Row():
+                save_transcript_btn = gr.Button("💾 Save Transcript", size="sm")
+                save_summary_btn = gr.Button("💾 Save Summary", size="sm")
+                clear_all_btn = gr.Button("🗑️ Clear All", size="sm")
+            
+            save_status = gr.Markdown("")
         
-        save_status = gr.Markdown("")
+        with gr.Tab("🔎 Search meetings"):
+            archive_info = gr.Markdown(describe_archive)
+            with gr.Row():
+                search_input = gr.Textbox(
+                    label="Search transcripts and summaries",
+                    placeholder="e.g. budget review, hiring*",
+                    scale=4
+                )
+                search_btn = gr.Button("🔎 Search", variant="primary", scale=1)
+            search_results = gr.Markdown("")
+            meeting_select = gr.Dropdown(choices=[], label="Open meeting", interactive=True)
+            meeting_details = gr.Markdown("")
+            with gr.Row():
+                archived_transcript = gr.Textbox(label="📄 Transcript", lines=10)
+                archived_summary = gr.Textbox(label="✨ Summary", lines=10)
         
         # Audio recording event
         audio_input.start_recording(
             fn=record_started,
-            outputs=[status_indicator]
+            inputs=[session_state],
+            outputs=[status_indicator, session_state]
         )
         
-        # Connect events to handlers
+        # Live transcription events
+        live_audio.start_recording(
+            fn=live_started,
+            inputs=[model_size_input, session_state],
+            outputs=[live_session, status_indicator, transcript_output, session_state]
+        )
+        live_audio.stream(
+            fn=live_chunk,
+            inputs=[live_audio, live_session],
+            outputs=[live_session, transcript_output]
+        )
+        live_audio.stop_recording(
+            fn=live_stopped,
+            inputs=[live_session, session_state],
+            outputs=[live_session, status_indicator, transcript_output, session_state]
+        ).then(
+            fn=describe_archive,
+            outputs=[archive_info]
+        )
+        
+        # Connect events to handlers; admission is handled by our own job
+        # queues, so Gradio only needs enough slots to show queue positions
         transcribe_btn.click(
             fn=transcribe_audio,
-            inputs=[audio_input],
-            outputs=[status_indicator, transcript_output]
+            inputs=[audio_input, model_size_input, session_state],
+            outputs=[status_indicator, transcript_output, session_state],
+            concurrency_limit=transcription_queue.capacity + 1
+        ).then(
+            fn=describe_model,
+            outputs=[model_info]
+        ).then(
+            fn=describe_archive,
+            outputs=[archive_info]
         )
         
         summarize_btn.click(
             fn=generate_meeting_summary,
-            inputs=[transcript_output],
-            outputs=[status_indicator, summary_output]
+            inputs=[transcript_output, regenerate_input, session_state],
+            outputs=[status_indicator, summary_output, session_state],
+            concurrency_limit=summary_queue.capacity + 1
+        ).then(
+            fn=describe_model,
+            outputs=[model_info]
+        ).then(
+            fn=describe_archive,
+            outputs=[archive_info]
         )
         
         save_transcript_btn.click(
@@ -214,9 +524,31 @@ def create_interface(transcriber, summarizer, save_dir="./data/saved_meetings"):
             outputs=[save_status]
         )
         
+        search_btn.click(
+            fn=search_meetings,
+            inputs=[search_input],
+            outputs=[search_results, meeting_select]
+        ).then(
+            fn=describe_archive,
+            outputs=[archive_info]
+        )
+        search_input.submit(
+            fn=search_meetings,
+            inputs=[search_input],
+            outputs=[search_results, meeting_select]
+        ).then(
+            fn=describe_archive,
+            outputs=[archive_info]
+        )
+        meeting_select.change(
+            fn=open_meeting,
+            inputs=[meeting_select],
+            outputs=[meeting_details, archived_transcript, archived_summary]
+        )
+        
         clear_all_btn.click(
             fn=clear_all,
-            outputs=[status_indicator, audio_input, transcript_output, summary_output, save_status]
+            outputs=[status_indicator, audio_input, transcript_output, summary_output, save_status, session_state]
         )
         
         # Footer information
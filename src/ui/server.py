@@ -0,0 +1,42 @@
+def create_app(interface, transcriber):
+    """
+    Wrap the Gradio interface in a FastAPI app with health-check and metrics routes.
+    
+    The Gradio UI is served at "/" as soon as the process starts, while the
+    Whisper model may still be loading in the background.
+    
+    Args:
+        interface: The gr.Blocks returned by create_interface
+        transcriber: The WhisperTranscriber instance
+        
+    Returns:
+        FastAPI: App to be served with uvicorn
+    """
+    # Imported here so that importing src.ui stays cheap
+    import gradio as gr
+    from fastapi import FastAPI
+    from fastapi.responses import JSONResponse, PlainTextResponse
+    from src.utils.metrics import METRICS
+
+    app = FastAPI()
+    
+    @app.get("/healthz")
+    def healthz():
+        """Liveness probe: the server is up."""
+        return {"status": "ok"}
+    
+    @app.get("/readyz")
+    def readyz():
+        """Readiness probe: 200 once the Whisper model can transcribe, 503 before."""
+        info = transcriber.get_model_info()
+        return JSONResponse(
+            status_code=200 if info["ready"] else 503,
+            content={"ready": info["ready"], "status": info["status"], "model_size": info["model_size"]},
+        )
+    
+    @app.get("/metrics")
+    def metrics():
+        """Prometheus scrape endpoint: request, stage, token and queue metrics."""
+        return PlainTextResponse(METRICS.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+    
+    return gr.mount_gradio_app(app, interface, path="/")
@@ -0,0 +1,12 @@
+"""Shared helpers for AI-Wizard."""
+
+from src.utils.timing import PhaseTimer
+from src.utils.memory import current_rss_bytes, peak_rss_bytes, format_bytes
+from src.utils.disk_cache import DiskCache, file_digest
+from src.utils.job_queue import JobQueue, QueueFull
+from src.utils.metrics import METRICS, MetricsRegistry, span, track
+
+__all__ = [
+    'PhaseTimer', 'current_rss_bytes', 'peak_rss_bytes', 'format_bytes', 'DiskCache', 'file_digest',
+    'JobQueue', 'QueueFull', 'METRICS', 'MetricsRegistry', 'span', 'track'
+]
@@ -0,0 +1,191 @@
+import os
+import json
+import time
+import hashlib
+import threading
+
+
+class DiskCache:
+    """
+    A small on-disk JSON cache with a size limit and LRU eviction.
+
+    Each entry is one file named after the hash of its key. Reads refresh the
+    file's modification time, so evicting the oldest files first evicts the
+    least recently used entries. The write time is stored inside the entry,
+    so an optional TTL counts from when the value was stored, not last read.
+    """
+
+    def __init__(self, cache_dir, max_bytes, ttl_seconds=None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache_dir (str): Directory holding the cache files
+            max_bytes (int): Size limit of all entries; 0 or None disables the cache
+            ttl_seconds (float): Age after which entries expire; None or 0 keeps them
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = int(max_bytes or 0)
+        self.ttl_seconds = ttl_seconds or None
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expired = 0
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        if self.enabled:
+            os.makedirs(cache_dir, exist_ok=True)
+            self._total_bytes = sum(size for _, _, size in self._entries())
+
+    @property
+    def enabled(self):
+        """bool: False when the cache was configured with a zero size limit."""
+        return self.max_bytes > 0
+
+    def get(self, key):
+        """
+        Look up an entry.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            The cached value, or None on a miss
+        """
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            stored_at, value = entry["stored_at"], entry["value"]
+        except (OSError, ValueError, TypeError, KeyError):
+            with self._lock:
+                self.misses += 1
+            return None
+
+        if self.ttl_seconds and time.time() - stored_at > self.ttl_seconds:
+            with self._lock:
+                self.misses += 1
+                self.expired += 1
+                self._remove(path)
+            return None
+
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def put(self, key, value):
+        """
+        Store an entry, evicting least recently used entries if over the limit.
+
+        Args:
+            key (str): Cache key
+            value: JSON-serializable value
+        """
+        if not self.enabled:
+            return
+        path = self._path(key)
+        data = json.dumps({"stored_at": time.time(), "value": value}, ensure_ascii=False).encode("utf-8")
+        if len(data) > self.max_bytes:
+            return
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with self._lock:
+            old_size = os.path.getsize(path) if os.path.exists(path) else 0
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self._total_bytes += len(data) - old_size
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def clear(self):
+        """Remove every entry."""
+        with self._lock:
+            for path, _, _ in self._entries():
+                os.remove(path)
+            self._total_bytes = 0
+
+    def stats(self):
+        """
+        Get cache counters.
+
+        Returns:
+            dict: Hits, misses, hit rate, evictions, expirations and size
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "expired": self.expired,
+                "size_bytes": self._total_bytes,
+                "max_bytes": self.max_bytes,
+            }
+
+    def _path(self, key):
+        """Map a key to its file path."""
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{digest}.json")
+
+    def _entries(self):
+        """List (path, mtime, size) of every entry file."""
+        entries = []
+        for name in os.listdir(self.cache_dir):
+            if not name.endswith(".json"):
+                continue
+            path = os.path.join(self.cache_dir, name)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_mtime, stat.st_size))
+        return entries
+
+    def _remove(self, path):
+        """Delete one entry file. Caller holds the lock."""
+        try:
+            size = os.path.getsize(path)
+            os.remove(path)
+        except OSError:
+            return
+        self._total_bytes -= size
+
+    def _evict(self):
+        """Delete oldest entries until under the limit. Caller holds the lock."""
+        # Evict down to 90% so that a full cache does not rescan on every put
+        target = self.max_bytes * 0.9
+        for path, _, size in sorted(self._entries(), key=lambda entry: entry[1]):
+            if self._total_bytes <= target:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            self._total_bytes -= size
+            self.evictions += 1
+
+
+def file_digest(path, chunk_size=1024 * 1024):
+    """
+    Hash a file's contents without reading it into memory at once.
+
+    Args:
+        path (str): File to hash
+        chunk_size (int): Bytes read per step
+
+    Returns:
+        str: Hex SHA-256 digest
+    """
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,169 @@
+import time
+import threading
+import itertools
+from collections import deque
+
+from src.utils.metrics import QUEUE_JOBS, QUEUE_WAIT
+
+
+class QueueFull(Exception):
+    """Raised when a job queue cannot accept more work."""
+
+    def __init__(self, queue_name, retry_after):
+        super().__init__(f"The {queue_name} queue is full")
+        self.queue_name = queue_name
+        self.retry_after = retry_after
+
+
+class JobQueue:
+    """
+    A bounded FIFO admission queue with a fixed number of concurrent slots.
+
+    Callers join the queue, poll until their turn comes (which lets a UI show
+    the queue position and ETA meanwhile) and leave when the job is done.
+    """
+
+    def __init__(self, name, concurrency, max_waiting):
+        """
+        Initialize the queue.
+
+        Args:
+            name (str): Name used in messages, e.g. "transcription"
+            concurrency (int): Jobs allowed to run at the same time
+            max_waiting (int): Jobs allowed to wait; more are rejected with QueueFull
+        """
+        self.name = name
+        self.concurrency = max(1, concurrency)
+        self.max_waiting = max_waiting
+        self.completed = 0
+        self.rejected = 0
+        self._waiting = deque()
+        self._running = set()
+        self._durations = deque(maxlen=20)
+        self._started = {}
+        self._joined = {}
+        self._tickets = itertools.count(1)
+        self._cond = threading.Condition()
+
+    @property
+    def capacity(self):
+        """int: Running plus waiting jobs the queue can hold."""
+        return self.concurrency + self.max_waiting
+
+    def join(self):
+        """
+        Enter the queue.
+
+        Returns:
+            int: Ticket to pass to the other methods
+
+        Raises:
+            QueueFull: If max_waiting jobs are already waiting
+        """
+        with self._cond:
+            self._check_room()
+            ticket = next(self._tickets)
+            self._waiting.append(ticket)
+            self._joined[ticket] = time.time()
+            self._promote()
+            return ticket
+
+    def check_room(self):
+        """
+        Turn a caller away now if join() would, without entering the queue.
+
+        Raises:
+            QueueFull: If max_waiting jobs are already waiting
+        """
+        with self._cond:
+            self._check_room()
+
+    def wait_turn(self, ticket, timeout=None):
+        """
+        Wait until the job may run.
+
+        Args:
+            ticket (int): Ticket from join()
+            timeout (float): Seconds to wait before returning False
+
+        Returns:
+            bool: True once the job holds a running slot
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: ticket in self._running, timeout)
+
+    def position(self, ticket):
+        """
+        Get the 1-based place of a waiting job (0 if it is running).
+        """
+        with self._cond:
+            if ticket in self._running:
+                return 0
+            try:
+                return self._waiting.index(ticket) + 1
+            except ValueError:
+                return 0
+
+    def eta(self, ticket):
+        """
+        Estimate seconds until a waiting job starts.
+        """
+        position = self.position(ticket)
+        with self._cond:
+            return self._eta(position) if position else 0.0
+
+    def leave(self, ticket):
+        """
+        Release the job's slot (or its place in line) and admit the next one.
+        """
+        with self._cond:
+            if ticket in self._running:
+                self._running.discard(ticket)
+                self._durations.append(time.time() - self._started.pop(ticket))
+                self.completed += 1
+            elif ticket in self._waiting:
+                self._waiting.remove(ticket)
+                self._joined.pop(ticket, None)
+            self._promote()
+
+    def stats(self):
+        """
+        Get queue counters.
+
+        Returns:
+            dict: Running, waiting, completed and rejected counts and mean job time
+        """
+        with self._cond:
+            return {
+                "running": len(self._running),
+                "waiting": len(self._waiting),
+                "completed": self.completed,
+                "rejected": self.rejected,
+                "mean_job_seconds": self._mean_duration(),
+            }
+
+    def _check_room(self):
+        """Raise QueueFull if every slot and waiting place is taken. Caller holds the lock."""
+        if len(self._running) >= self.concurrency and len(self._waiting) >= self.max_waiting:
+            self.rejected += 1
+            raise QueueFull(self.name, self._eta(len(self._waiting) + 1))
+
+    def _promote(self):
+        """Move waiting jobs into free slots. Caller holds the lock."""
+        while self._waiting and len(self._running) < self.concurrency:
+            ticket = self._waiting.popleft()
+            self._running.add(ticket)
+            self._started[ticket] = time.time()
+            QUEUE_WAIT.observe(self._started[ticket] - self._joined.pop(ticket), queue=self.name)
+        QUEUE_JOBS.set(len(self._running), queue=self.name, state="running")
+        QUEUE_JOBS.set(len(self._waiting), queue=self.name, state="waiting")
+        self._cond.notify_all()
+
+    def _mean_duration(self):
+        """Mean of recent job durations (30 s before any job finished). Caller holds the lock."""
+        return sum(self._durations) / len(self._durations) if self._durations else 30.0
+
+    def _eta(self, position):
+        """Seconds until the job at `position` starts. Caller holds the lock."""
+        rounds = (position - 1) // self.concurrency + 1
+        return rounds * self._mean_duration()
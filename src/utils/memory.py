@@ -0,0 +1,49 @@
+import os
+import sys
+
+
+def current_rss_bytes():
+    """
+    Get the resident set size of this process.
+    
+    Reads /proc/self/statm where available and falls back to the peak RSS
+    reported by the resource module on other platforms.
+    
+    Returns:
+        int: Resident memory in bytes (0 if it cannot be determined)
+    """
+    try:
+        with open("/proc/self/statm", "r") as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        return peak_rss_bytes()
+
+
+def peak_rss_bytes():
+    """
+    Get the peak resident set size of this process.
+    
+    Returns:
+        int: Peak resident memory in bytes (0 if it cannot be determined)
+    """
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in kilobytes elsewhere
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+def format_bytes(num_bytes):
+    """
+    Format a byte count for display.
+    
+    Args:
+        num_bytes (int): Number of bytes
+        
+    Returns:
+        str: e.g. "142.3 MB"
+    """
+    return f"{num_bytes / (1024 * 1024):,.1f} MB"
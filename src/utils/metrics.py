@@ -0,0 +1,252 @@
+"""
+Process-wide counters, gauges and histograms in the Prometheus text format.
+
+Stages of the pipeline are timed with span() ("audio_load", "vad", "mel",
+"encode", "decode", "prompt_build", "llm", "offline_summary", "file_save",
+"audio_archive"); whole requests with track(), which also counts them and
+their errors. METRICS.render() is served
+on /metrics (see src/ui/server.py). Spans are also logged at DEBUG level.
+"""
+import time
+import logging
+import threading
+from contextlib import contextmanager
+
+from src.utils.memory import current_rss_bytes
+
+# Upper bounds in seconds; covers sub-millisecond file writes up to long recordings
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+_log = logging.getLogger(__name__)
+
+
+class _Metric:
+    """Common label handling; values are kept per tuple of label values."""
+
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels):
+        """Label values in labelnames order."""
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _labels(self, key, extra=None):
+        """Render `{a="x",b="y"}` for a key."""
+        pairs = list(zip(self.labelnames, key)) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+    def render(self):
+        """Lines of the text exposition format."""
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        lines += self._samples(items)
+        return lines
+
+    def _samples(self, items):
+        return [f"{self.name}{self._labels(key)} {_number(value)}" for key, value in items]
+
+
+class Counter(_Metric):
+    """A value that only goes up."""
+
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        if not self.labelnames:
+            # Unlabelled counters are exported as 0 before their first increment
+            self._values[()] = 0.0
+
+    def inc(self, amount=1.0, **labels):
+        """Add `amount` (default 1)."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels):
+        """Current value."""
+        with self._lock:
+            return self._values.get(self._key(labels), 0.0)
+
+
+class Gauge(_Metric):
+    """A value that is set, or read from a function when rendered."""
+
+    kind = "gauge"
+
+    def __init__(self, name, documentation, labelnames=(), function=None):
+        super().__init__(name, documentation, labelnames)
+        self.function = function
+
+    def set(self, value, **labels):
+        """Set the current value."""
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def render(self):
+        if self.function is not None:
+            self.set(self.function())
+        return super().render()
+
+
+class Histogram(_Metric):
+    """Observations counted in cumulative buckets, with their sum and count."""
+
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        """Record one observation."""
+        key = self._key(labels)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * len(self.buckets), 0.0, 0]
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    state[0][i] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _samples(self, items):
+        lines = []
+        for key, (counts, total, count) in items:
+            for bound, bucket_count in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{self._labels(key, ('le', _number(bound)))} {bucket_count}")
+            lines.append(f"{self.name}_bucket{self._labels(key, ('le', '+Inf'))} {count}")
+            lines.append(f"{self.name}_sum{self._labels(key)} {_number(total)}")
+            lines.append(f"{self.name}_count{self._labels(key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    A named collection of metrics rendered together.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, documentation, labelnames=()):
+        """Create (or get) a Counter."""
+        return self._register(Counter, name, documentation, labelnames)
+
+    def gauge(self, name, documentation, labelnames=(), function=None):
+        """Create (or get) a Gauge; `function` is called for its value on every render."""
+        return self._register(Gauge, name, documentation, labelnames, function=function)
+
+    def histogram(self, name, documentation, labelnames=(), buckets=DEFAULT_BUCKETS):
+        """Create (or get) a Histogram."""
+        return self._register(Histogram, name, documentation, labelnames, buckets=buckets)
+
+    def render(self):
+        """
+        Render every metric.
+
+        Returns:
+            str: Prometheus text exposition format (version 0.0.4)
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines += metric.render()
+        return "\n".join(lines) + "\n"
+
+    def _register(self, cls, name, documentation, labelnames, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, documentation, labelnames, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"{name} is already registered as a {metric.kind}")
+            return metric
+
+
+METRICS = MetricsRegistry()
+
+REQUESTS = METRICS.counter("aiwizard_requests_total", "Requests handled, by operation", ("operation",))
+ERRORS = METRICS.counter("aiwizard_errors_total", "Requests that failed, by operation", ("operation",))
+REQUEST_SECONDS = METRICS.histogram("aiwizard_request_seconds", "End-to-end request latency, by operation",
+                                    ("operation",))
+STAGE_SECONDS = METRICS.histogram("aiwizard_stage_seconds", "Time spent in each pipeline stage", ("stage",))
+STAGE_ERRORS = METRICS.counter("aiwizard_stage_errors_total", "Pipeline stages that raised", ("stage",))
+AUDIO_SECONDS = METRICS.counter("aiwizard_audio_seconds_total", "Seconds of audio transcribed")
+LLM_TOKENS = METRICS.counter("aiwizard_llm_tokens_total", "Estimated LLM tokens, by direction (sent/received)",
+                             ("direction",))
+SUMMARY_TTFT = METRICS.histogram("aiwizard_summary_ttft_seconds",
+                                 "Time until the first token of a streamed LLM summary (map steps included)")
+SUMMARY_CACHE_LOOKUPS = METRICS.counter("aiwizard_summary_cache_lookups_total",
+                                        "Summary cache lookups, by result (hit/miss)", ("result",))
+QUEUE_WAIT = METRICS.histogram("aiwizard_queue_wait_seconds", "Time jobs waited for a slot, by queue", ("queue",))
+QUEUE_JOBS = METRICS.gauge("aiwizard_queue_jobs", "Jobs in each queue, by state (running/waiting)",
+                           ("queue", "state"))
+GUARDRAIL_INTERVENTIONS = METRICS.counter("aiwizard_guardrail_interventions_total",
+                                          "Whisper windows cut short or skipped, by reason", ("reason",))
+METRICS.gauge("process_resident_memory_bytes", "Resident memory of the process", function=current_rss_bytes)
+
+
+@contextmanager
+def span(stage):
+    """
+    Time the enclosed block as one pipeline stage.
+
+    Args:
+        stage (str): Stage name, e.g. "audio_load"
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        STAGE_ERRORS.inc(stage=stage)
+        raise
+    finally:
+        elapsed = time.perf_counter() - start
+        STAGE_SECONDS.observe(elapsed, stage=stage)
+        _log.debug("span stage=%s seconds=%.4f thread=%s", stage, elapsed, threading.current_thread().name)
+
+
+@contextmanager
+def track(operation):
+    """
+    Count a request, time it end to end and count it as an error if it raises.
+
+    Args:
+        operation (str): Request kind, e.g. "transcribe"
+    """
+    REQUESTS.inc(operation=operation)
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        ERRORS.inc(operation=operation)
+        raise
+    finally:
+        REQUEST_SECONDS.observe(time.perf_counter() - start, operation=operation)
+
+
+def _escape(value):
+    """Escape a label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _number(value):
+    """Format a sample value: integers without a decimal point."""
+    value = float(value)
+    return str(int(value)) if value.is_integer() else repr(value)
@@ -0,0 +1,55 @@
+import time
+from contextlib import contextmanager
+
+
+class PhaseTimer:
+    """
+    Record the wall-clock duration of named phases (e.g. the startup steps).
+    """
+
+    def __init__(self, name="startup"):
+        """
+        Initialize the timer.
+
+        Args:
+            name (str): Label printed in front of every phase line
+        """
+        self.name = name
+        self.phases = []
+
+    @contextmanager
+    def phase(self, label):
+        """
+        Time the enclosed block and record it under `label`.
+
+        Args:
+            label (str): Name of the phase
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases.append((label, elapsed))
+            print(f"[{self.name}] {label}: {elapsed:.3f}s")
+
+    def total(self):
+        """
+        Get the summed duration of all recorded phases.
+
+        Returns:
+            float: Total seconds
+        """
+        return sum(elapsed for _, elapsed in self.phases)
+
+    def report(self):
+        """
+        Format all recorded phases as a small table.
+
+        Returns:
+            str: One line per phase plus a total line
+        """
+        width = max((len(label) for label, _ in self.phases), default=5)
+        lines = [f"[{self.name}] {label:<{width}}  {elapsed:8.3f}s" for label, elapsed in self.phases]
+        lines.append(f"[{self.name}] {'total':<{width}}  {self.total():8.3f}s")
+        return "\n".join(lines)
@@ -0,0 +1,65 @@
+"""
+In-process WAV decoding.
+"""
+import struct
+import wave
+
+import numpy as np
+import pytest
+
+from src.transcription.audio import SAMPLE_RATE, load_audio, read_wav
+
+
+def write_wav(path, frames, sample_rate, bits=16, channels=1, format_tag=1, block_align=None):
+    """Write a WAV file by hand, so layouts the wave module refuses can be tested too."""
+    data = frames.tobytes()
+    block_align = block_align or channels * bits // 8
+    fmt = struct.pack("<HHIIHH", format_tag, channels, sample_rate, sample_rate * block_align, block_align, bits)
+    with open(path, "wb") as f:
+        f.write(b"RIFF" + struct.pack("<I", 4 + 8 + len(fmt) + 8 + len(data)) + b"WAVE")
+        f.write(b"fmt " + struct.pack("<I", len(fmt)) + fmt)
+        f.write(b"data" + struct.pack("<I", len(data)) + data)
+
+
+def test_16_bit_stereo_is_mixed_to_mono(tmp_path):
+    path = str(tmp_path / "stereo.wav")
+    left = np.full(800, 16384, dtype="<i2")
+    right = np.zeros(800, dtype="<i2")
+    with wave.open(path, "wb") as f:
+        f.setnchannels(2)
+        f.setsampwidth(2)
+        f.setframerate(8000)
+        f.writeframes(np.column_stack([left, right]).tobytes())
+
+    samples, sample_rate = read_wav(path)
+
+    assert sample_rate == 8000 and samples.dtype == np.float32
+    assert np.allclose(samples, 0.25)
+    assert len(load_audio(path)) == 2 * len(samples) == SAMPLE_RATE // 10
+
+
+def test_24_bit_samples_are_sign_extended(tmp_path):
+    path = str(tmp_path / "24bit.wav")
+    values = np.array([0, 2 ** 22, -(2 ** 22), -1], dtype="<i4")
+    frames = values.view(np.uint8).reshape(-1, 4)[:, :3].copy()
+    write_wav(path, frames, SAMPLE_RATE, bits=24)
+
+    samples, _ = read_wav(path)
+
+    assert np.allclose(samples, [0.0, 0.5, -0.5, -1 / 2 ** 23])
+
+
+def test_float_samples_are_read_as_is(tmp_path):
+    path = str(tmp_path / "float.wav")
+    write_wav(path, np.array([0.5, -0.25], dtype="<f4"), SAMPLE_RATE, bits=32, format_tag=3)
+
+    assert np.allclose(read_wav(path)[0], [0.5, -0.25])
+
+
+@pytest.mark.parametrize("bits, block_align", [(12, 2), (16, 3)])
+def test_unsupported_layouts_raise_value_error(tmp_path, bits, block_align):
+    path = str(tmp_path / "bad.wav")
+    write_wav(path, np.zeros(12, dtype=np.uint8), SAMPLE_RATE, bits=bits, block_align=block_align)
+
+    with pytest.raises(ValueError):
+        read_wav(path)
@@ -0,0 +1,83 @@
+"""
+BatchPipeline output naming, skipping and resuming, with stand-in models.
+"""
+import os
+
+import pytest
+
+from src.benchmark.fixtures import write_audio_fixture
+from src.pipeline.batch import BatchPipeline, find_audio_files
+
+
+class FakeTranscriber:
+    """Returns no speech for files named "silent*", one segment otherwise."""
+
+    model_size = "base"
+
+    def __init__(self):
+        self.calls = 0
+
+    def transcribe_waveform_result(self, audio, model_size=None, initial_prompt=None):
+        self.calls += 1
+        text = "" if audio.max() < 0.01 else f" {len(audio)} samples of speech"
+        segments = [{"start": 0.0, "end": 1.0, "text": text, "avg_logprob": -0.2, "no_speech_prob": 0.1}]
+        return {"text": text, "language": "en", "segments": segments if text else []}
+
+
+class FakeSummarizer:
+    def __init__(self, fail=False):
+        self.fail = fail
+        self.calls = 0
+
+    def generate_summary(self, transcript, use_cache=True, fallback=True):
+        self.calls += 1
+        if self.fail:
+            raise RuntimeError("LLM unavailable")
+        return f"Summary of{transcript}"
+
+
+@pytest.fixture
+def recordings(tmp_path):
+    input_dir = tmp_path / "in"
+    write_audio_fixture(str(input_dir / "a" / "standup.wav"), 1.0, "tone")
+    write_audio_fixture(str(input_dir / "b" / "standup.wav"), 2.0, "tone")
+    write_audio_fixture(str(input_dir / "silent.wav"), 1.0, "silence")
+    return str(input_dir), find_audio_files(str(input_dir), recursive=True)
+
+
+def test_same_file_names_in_subdirectories_get_separate_outputs(tmp_path, recordings):
+    input_dir, paths = recordings
+    output_dir = str(tmp_path / "out")
+
+    stats = BatchPipeline(FakeTranscriber(), FakeSummarizer(), output_dir, input_dir=input_dir).run(paths)
+
+    assert stats["transcribed"] == 3 and stats["summarized"] == 2 and stats["no_speech"] == 1
+    outputs = set(os.listdir(output_dir))
+    assert {"a__standup.wav_summary.txt", "b__standup.wav_summary.txt"} <= outputs
+    assert "silent.wav_summary.txt" not in outputs
+
+
+def test_rerun_skips_finished_work_including_silent_files(tmp_path, recordings):
+    input_dir, paths = recordings
+    output_dir = str(tmp_path / "out")
+    BatchPipeline(FakeTranscriber(), FakeSummarizer(), output_dir, input_dir=input_dir).run(paths)
+
+    transcriber, summarizer = FakeTranscriber(), FakeSummarizer()
+    stats = BatchPipeline(transcriber, summarizer, output_dir, input_dir=input_dir).run(paths)
+
+    assert stats["skipped"] == 3
+    assert transcriber.calls == 0 and summarizer.calls == 0
+
+
+def test_llm_failure_writes_no_summary_and_is_retried(tmp_path, recordings):
+    input_dir, paths = recordings
+    output_dir = str(tmp_path / "out")
+
+    stats = BatchPipeline(FakeTranscriber(), FakeSummarizer(fail=True), output_dir, input_dir=input_dir).run(paths)
+    assert stats["failed"] == 2 and stats["summarized"] == 0
+    assert not any(name.endswith("_summary.txt") for name in os.listdir(output_dir))
+
+    transcriber, summarizer = FakeTranscriber(), FakeSummarizer()
+    stats = BatchPipeline(transcriber, summarizer, output_dir, input_dir=input_dir).run(paths)
+    assert stats["summarized"] == 2 and stats["skipped"] == 1
+    assert transcriber.calls == 0
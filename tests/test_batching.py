@@ -0,0 +1,33 @@
+"""
+Grouping of queued Whisper windows into batches.
+"""
+from types import SimpleNamespace
+
+from src.transcription.batching import BatchScheduler, _WindowRequest, _needs_fallback
+
+
+def test_windows_are_batched_by_model_and_temperature():
+    scheduler = BatchScheduler(registry=None, max_batch_size=4, max_wait_ms=10)
+    greedy = [_WindowRequest("base", mel=None, fp16=False) for _ in range(3)]
+    retry = _WindowRequest("base", mel=None, fp16=False, temperature=0.2)
+    other_model = _WindowRequest("tiny", mel=None, fp16=False)
+    for request in (greedy[0], retry, greedy[1], other_model, greedy[2]):
+        scheduler._queue.put(request)
+
+    assert scheduler._next_batch() == greedy
+    assert scheduler.stats()["queue_depth"] == 2
+    assert scheduler._next_batch() == [retry]
+    assert scheduler._next_batch() == [other_model]
+    assert scheduler.stats()["queue_depth"] == 0
+
+
+def test_fallback_thresholds_match_model_transcribe():
+    def result(compression_ratio=1.5, avg_logprob=-0.3, no_speech_prob=0.1):
+        return SimpleNamespace(compression_ratio=compression_ratio, avg_logprob=avg_logprob,
+                               no_speech_prob=no_speech_prob)
+
+    assert not _needs_fallback(result())
+    assert _needs_fallback(result(compression_ratio=3.0))
+    assert _needs_fallback(result(avg_logprob=-1.5))
+    # Silence is not retried
+    assert not _needs_fallback(result(avg_logprob=-1.5, no_speech_prob=0.9))
@@ -0,0 +1,34 @@
+"""
+Transcript chunking for map-reduce summaries, in English and CJK text.
+"""
+from src.summarization.chunking import chunk_text, count_tokens, split_sentences
+
+
+def test_english_sentences_are_packed_in_order():
+    text = "The budget was approved. Alice will follow up! Is the launch on time? " * 200
+
+    chunks = chunk_text(text, 100)
+
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk) <= 100 for chunk in chunks)
+    assert " ".join(chunks).split() == text.split()
+
+
+def test_chinese_sentences_fit_the_token_budget():
+    text = "我们讨论了预算。" * 5000
+
+    chunks = chunk_text(text, 3000)
+
+    assert count_tokens(text) >= 40000
+    assert len(chunks) > 1
+    assert all(count_tokens(chunk) <= 3000 for chunk in chunks)
+    assert split_sentences("我们讨论了预算。下周发布！对吗？") == ["我们讨论了预算。", "下周发布！", "对吗？"]
+
+
+def test_text_without_spaces_or_sentence_ends_is_sliced():
+    text = "我们讨论了预算" * 5000
+
+    chunks = chunk_text(text, 3000)
+
+    assert all(count_tokens(chunk) <= 3000 for chunk in chunks)
+    assert "".join(chunks) == text
@@ -0,0 +1,37 @@
+"""
+Filler removal and repeat collapsing before summarization.
+"""
+import pytest
+
+from src.summarization.compaction import collapse_repeats, compact_transcript
+
+
+@pytest.mark.parametrize("transcript, expected", [
+    ("Ah I see. Mm.", "I see."),
+    ("Mm. Mhm. Right, let's go.", "Right, let's go."),
+    ("We, um, decided to uh ship it.", "We decided to ship it."),
+    ("I see, mm.", "I see."),
+    ("Um, the budget is fine. Hmm? Okay.", "the budget is fine. Okay."),
+])
+def test_fillers_leave_no_stray_punctuation(transcript, expected):
+    assert compact_transcript(transcript)[0] == expected
+
+
+def test_capitalized_tokens_that_look_like_fillers_are_kept():
+    transcript = "The ER was full. We asked UMM and HMM about it. Hummus and Emma stayed."
+
+    assert compact_transcript(transcript)[0] == transcript
+
+
+def test_repeated_phrases_collapse_but_doubled_words_stay():
+    words = "Thank you. Thank you. Thank you. It was very very good, I I I think.".split()
+
+    assert " ".join(collapse_repeats(words)) == "Thank you. It was very very good, I think."
+
+
+def test_stats_count_the_saving():
+    compacted, stats = compact_transcript("Um, " + "we agreed. " * 20)
+
+    assert compacted == "we agreed."
+    assert stats["compacted_tokens"] < stats["original_tokens"]
+    assert 0.0 < stats["saved_ratio"] < 1.0
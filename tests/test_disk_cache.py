@@ -0,0 +1,43 @@
+"""
+The size-limited on-disk JSON cache.
+"""
+import os
+import time
+
+from src.utils.disk_cache import DiskCache
+
+
+def test_get_returns_what_put_stored(tmp_path):
+    cache = DiskCache(str(tmp_path), 1 << 20)
+
+    assert cache.get("missing") is None
+    cache.put("key", {"text": "Hallo, 世界", "segments": [1, 2]})
+
+    assert cache.get("key") == {"text": "Hallo, 世界", "segments": [1, 2]}
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 1
+
+
+def test_least_recently_used_entries_are_evicted(tmp_path):
+    cache = DiskCache(str(tmp_path), 600)
+    for key in ("a", "b", "c"):
+        cache.put(key, "x" * 150)
+        time.sleep(0.02)
+    # Reading "a" makes "b" the oldest
+    assert cache.get("a") is not None
+    cache.put("d", "x" * 150)
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("d") is not None
+    assert cache.stats()["size_bytes"] <= 600
+
+
+def test_expired_and_disabled_caches_miss(tmp_path):
+    cache = DiskCache(str(tmp_path / "ttl"), 1 << 20, ttl_seconds=0.05)
+    cache.put("key", 1)
+    time.sleep(0.1)
+    assert cache.get("key") is None and cache.stats()["expired"] == 1
+
+    disabled = DiskCache(str(tmp_path / "off"), 0)
+    disabled.put("key", 1)
+    assert disabled.get("key") is None
+    assert not os.path.exists(tmp_path / "off")
@@ -0,0 +1,37 @@
+"""
+Offline extractive summaries of English, Chinese and unpunctuated transcripts.
+"""
+from src.benchmark.fixtures import synthetic_transcript
+from src.summarization.extractive import MAX_SENTENCE_CHARS, extract_summary, index_terms
+
+
+def test_english_transcript_gets_key_points_and_action_items():
+    transcript = synthetic_transcript(2000, seed=0)
+
+    summary = extract_summary(transcript)
+
+    assert 3 <= len(summary["key_points"]) <= 12
+    assert summary["topics"]
+    assert all(len(point) <= MAX_SENTENCE_CHARS for point in summary["key_points"])
+
+
+def test_chinese_transcript_is_indexed_by_character_pairs():
+    transcript = ("我们讨论了明年的市场预算。" "王经理同意增加市场预算。" "李明下周五之前完成预算报告。"
+                  "大家对新产品的发布时间有不同意见。" "我们决定下次会议再讨论发布时间。") * 3
+
+    summary = extract_summary(transcript)
+
+    assert "预算" in index_terms("增加市场预算")
+    assert "预算" in summary["topics"]
+    assert summary["key_points"] and summary["word_count"] > 50
+
+
+def test_unpunctuated_transcript_is_cut_into_short_points():
+    transcript = " ".join(["we should move the launch to march because the budget is not ready"] * 600)
+
+    summary = extract_summary(transcript)
+
+    assert summary["sentence_count"] > 100
+    assert all(len(point) <= MAX_SENTENCE_CHARS for point in summary["key_points"])
+    unspaced = extract_summary("我们讨论了预算" * 1200)
+    assert all(len(point) <= MAX_SENTENCE_CHARS for point in unspaced["key_points"])
@@ -0,0 +1,34 @@
+"""
+Admission control for transcription and summary jobs.
+"""
+import pytest
+
+from src.utils.job_queue import JobQueue, QueueFull
+
+
+def test_jobs_run_in_order_as_slots_free_up():
+    job_queue = JobQueue("test", concurrency=1, max_waiting=2)
+    first, second, third = job_queue.join(), job_queue.join(), job_queue.join()
+
+    assert job_queue.wait_turn(first, timeout=0)
+    assert [job_queue.position(t) for t in (first, second, third)] == [0, 1, 2]
+    job_queue.leave(first)
+    assert job_queue.wait_turn(second, timeout=0)
+    assert job_queue.position(third) == 1
+    assert job_queue.stats()["completed"] == 1
+
+
+def test_full_queue_rejects_with_a_retry_estimate():
+    job_queue = JobQueue("test", concurrency=1, max_waiting=1)
+    running, waiting = job_queue.join(), job_queue.join()
+
+    with pytest.raises(QueueFull) as rejected:
+        job_queue.join()
+    assert rejected.value.queue_name == "test" and rejected.value.retry_after > 0
+    assert job_queue.stats()["rejected"] == 1
+
+    # Giving up a place in line makes room again
+    job_queue.leave(waiting)
+    job_queue.check_room()
+    job_queue.leave(running)
+    assert job_queue.stats()["running"] == 0
@@ -0,0 +1,92 @@
+"""
+Streaming through AsyncLLMClient with the chunk sequence real servers send, and
+the summarizer built on it.
+"""
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from src.summarization.llm_client import AsyncLLMClient
+
+# OpenAI, vLLM and llama.cpp: role-only first chunk, content, then an empty delta
+CHUNKS = [
+    {"choices": [{"index": 0, "delta": {"role": "assistant"}, "finish_reason": None}]},
+    {"choices": [{"index": 0, "delta": {"content": "Key"}, "finish_reason": None}]},
+    {"choices": [{"index": 0, "delta": {"content": " points"}, "finish_reason": None}]},
+    {"choices": [{"index": 0, "delta": {}, "finish_reason": "stop"}]},
+]
+
+
+class _SSEHandler(BaseHTTPRequestHandler):
+    def do_POST(self):
+        self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.end_headers()
+        for chunk in CHUNKS:
+            self.wfile.write(f"data: {json.dumps(chunk)}\n\n".encode("utf-8"))
+        self.wfile.write(b"data: [DONE]\n\n")
+        self.close_connection = True
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def sse_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _SSEHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}/v1"
+    server.shutdown()
+    server.server_close()
+
+
+def test_stream_tolerates_role_only_and_empty_delta_chunks(sse_url):
+    client = AsyncLLMClient(sse_url, max_retries=0)
+    try:
+        chunks = list(client.chat.completions.create(messages=[{"role": "user", "content": "hi"}], stream=True))
+    finally:
+        client.close()
+
+    deltas = [chunk.choices[0].delta for chunk in chunks]
+    assert [delta.content for delta in deltas] == [None, "Key", " points", None]
+    assert deltas[0].role == "assistant"
+    assert deltas[-1].role is None
+    assert chunks[-1].choices[0].finish_reason == "stop"
+
+
+def test_summarizer_stream_skips_chunks_without_content(sse_url):
+    from src.summarization.llm_summarizer import MeetingSummarizer
+
+    summarizer = MeetingSummarizer.__new__(MeetingSummarizer)
+    summarizer.client = AsyncLLMClient(sse_url, max_retries=0)
+    summarizer.model = "test"
+    try:
+        assert "".join(summarizer._stream("Summarize this")) == "Key points"
+    finally:
+        summarizer.client.close()
+
+
+def test_summary_stats_belong_to_each_call(sse_url, tmp_path):
+    from src.summarization.llm_summarizer import MeetingSummarizer
+    from src.utils.disk_cache import DiskCache
+    from src.utils.metrics import METRICS, SUMMARY_CACHE_LOOKUPS
+
+    hits, misses = SUMMARY_CACHE_LOOKUPS.value(result="hit"), SUMMARY_CACHE_LOOKUPS.value(result="miss")
+    summarizer = MeetingSummarizer(AsyncLLMClient(sse_url, max_retries=0),
+                                   cache=DiskCache(str(tmp_path), 1 << 20), compact=False)
+    first, second = {}, {}
+    try:
+        assert "".join(summarizer.stream_summary("We agreed on the budget.", stats=first)) == "Key points"
+        assert "".join(summarizer.stream_summary("We agreed on the budget.", stats=second)) == "Key points"
+    finally:
+        summarizer.client.close()
+
+    assert first["cached"] is False and first["ttft_seconds"] is not None
+    assert second["cached"] is True
+    assert first["total_seconds"] >= first["ttft_seconds"]
+    assert SUMMARY_CACHE_LOOKUPS.value(result="hit") == hits + 1
+    assert SUMMARY_CACHE_LOOKUPS.value(result="miss") == misses + 1
+    assert "aiwizard_summary_ttft_seconds_count" in METRICS.render()
@@ -0,0 +1,29 @@
+"""
+The SQLite meeting archive and its full-text search.
+"""
+from src.storage.meeting_archive import MeetingArchive
+
+
+def test_saved_meetings_are_found_by_words_and_segments(tmp_path):
+    archive = MeetingArchive(str(tmp_path / "archive.db"))
+    archive.save_meeting("standup", transcript="We approved the marketing budget.", title="Standup",
+                         segments=[{"start": 0.0, "end": 3.0, "text": "We approved the marketing budget."}])
+    archive.save_meeting("retro", transcript="The release slipped by a week.", title="Retro")
+
+    assert [hit["meeting_id"] for hit in archive.search("budget")] == ["standup"]
+    assert [hit["meeting_id"] for hit in archive.search("rel*")] == ["retro"]
+    assert archive.search_segments("marketing")[0]["start"] == 0.0
+    assert archive.search("") == []
+
+
+def test_updates_keep_other_fields(tmp_path):
+    archive = MeetingArchive(str(tmp_path / "archive.db"))
+    archive.save_meeting("standup", transcript="We approved the budget.", title="Standup")
+    archive.save_meeting("standup", summary="- Budget approved")
+
+    meeting = archive.get_meeting("standup")
+    assert meeting["transcript"] == "We approved the budget." and meeting["summary"] == "- Budget approved"
+    assert [hit["meeting_id"] for hit in archive.search("approved")] == ["standup"]
+
+    archive.delete_meeting("standup")
+    assert archive.get_meeting("standup") is None and archive.search("budget") == []
@@ -0,0 +1,45 @@
+"""
+The columnar segment table and its memory-mapped file format.
+"""
+import numpy as np
+
+from src.transcription.segments import SegmentTable
+
+SEGMENTS = [
+    {"start": 0.0, "end": 4.0, "text": " Welcome, everyone.", "avg_logprob": -0.2, "no_speech_prob": 0.01},
+    {"start": 4.0, "end": 9.5, "text": " Das Budget für 2025 steht.", "avg_logprob": -0.4, "no_speech_prob": 0.05},
+    {"start": 9.5, "end": 12.0, "text": " ...", "avg_logprob": -1.6, "no_speech_prob": 0.2},
+    {"start": 12.0, "end": 15.0, "text": " 预算已批准。", "avg_logprob": -0.3, "no_speech_prob": 0.9},
+    {"start": 15.0, "end": 18.0, "text": " Thanks."},
+]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    table = SegmentTable.from_segments(SEGMENTS, language="en")
+    path = str(tmp_path / "meeting.seg")
+    table.save(path)
+
+    for loaded in (SegmentTable.load(path), SegmentTable.load(path, mmap=False)):
+        assert len(loaded) == len(SEGMENTS) and loaded.language == "en"
+        assert loaded.text == "".join(segment["text"] for segment in SEGMENTS)
+        assert loaded[3]["text"] == " 预算已批准。"
+        assert np.isnan(loaded[-1]["avg_logprob"])
+        assert loaded.duration == 18.0
+
+
+def test_confident_drops_unsure_and_silent_segments():
+    confident = SegmentTable.from_segments(SEGMENTS).confident(min_avg_logprob=-1.0, max_no_speech_prob=0.6)
+
+    # Missing confidences keep a segment
+    assert [segment["start"] for segment in confident] == [0.0, 4.0, 15.0]
+    assert confident.text == " Welcome, everyone. Das Budget für 2025 steht. Thanks."
+
+
+def test_between_and_index_at_use_times():
+    table = SegmentTable.from_segments(SEGMENTS)
+
+    assert table.index_at(10.0) == 2
+    assert table.index_at(-1.0) == 0
+    assert [segment["start"] for segment in table.between(5.0, 12.5)] == [4.0, 9.5, 12.0]
+    assert len(table.between(30.0, 40.0)) == 0
+    assert SegmentTable.from_segments([]).text == ""
@@ -0,0 +1,55 @@
+"""
+Live transcription windows sharing the transcription job queue.
+"""
+import threading
+
+import numpy as np
+import pytest
+
+from src.transcription.audio import SAMPLE_RATE
+from src.transcription.streaming import StreamingTranscriber
+from src.utils.job_queue import JobQueue, QueueFull
+
+
+class FakeTranscriber:
+    def __init__(self):
+        self.calls = 0
+        self.decoded = threading.Event()
+
+    def transcribe_waveform(self, audio, model_size=None, initial_prompt=None):
+        self.calls += 1
+        self.decoded.set()
+        return f"window {self.calls}"
+
+
+def test_windows_wait_for_a_queue_slot():
+    job_queue = JobQueue("transcription", concurrency=1, max_waiting=1)
+    upload = job_queue.join()
+    transcriber = FakeTranscriber()
+    live = StreamingTranscriber(transcriber, job_queue=job_queue, window_seconds=1.0)
+
+    live.add_chunk(np.zeros(SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE)
+
+    assert not transcriber.decoded.wait(0.5)
+    assert job_queue.stats()["waiting"] == 1
+    job_queue.leave(upload)
+    assert live.finish().startswith("window 1")
+    stats = job_queue.stats()
+    assert stats["running"] == stats["waiting"] == 0
+    assert stats["completed"] == 1 + transcriber.calls
+
+
+def test_windows_back_off_while_the_queue_is_full():
+    job_queue = JobQueue("transcription", concurrency=1, max_waiting=0)
+    upload = job_queue.join()
+    transcriber = FakeTranscriber()
+    live = StreamingTranscriber(transcriber, job_queue=job_queue, window_seconds=1.0)
+
+    live.add_chunk(np.zeros(SAMPLE_RATE, dtype=np.float32), SAMPLE_RATE)
+
+    assert not transcriber.decoded.wait(0.5)
+    assert job_queue.stats()["rejected"] >= 1
+    with pytest.raises(QueueFull):
+        job_queue.check_room()
+    job_queue.leave(upload)
+    assert live.finish().startswith("window 1")
@@ -0,0 +1,50 @@
+"""
+Voice activity detection on synthetic recordings.
+"""
+import numpy as np
+
+from src.benchmark.fixtures import synthetic_audio
+from src.transcription.audio import SAMPLE_RATE
+from src.transcription.vad import detect_speech, trim_silence
+
+
+def speech_seconds(regions):
+    return sum(end - start for start, end in regions) / SAMPLE_RATE
+
+
+def room_noise(seconds, rms=0.0005, seed=0):
+    rng = np.random.default_rng(seed)
+    return (rng.standard_normal(int(seconds * SAMPLE_RATE)) * rms).astype(np.float32)
+
+
+def test_sparse_speech_in_room_noise():
+    speech = synthetic_audio(5, "speech", seed=3)
+    audio = np.concatenate([room_noise(30), speech, room_noise(30, seed=1)])
+
+    regions = detect_speech(audio)
+
+    assert 3.0 <= speech_seconds(regions) <= 8.0
+    start, end = regions[0][0], regions[-1][1]
+    assert start >= 29 * SAMPLE_RATE and end <= 36 * SAMPLE_RATE
+
+
+def test_silence_and_noise_are_not_speech():
+    assert detect_speech(synthetic_audio(60, "silence")) == []
+    assert detect_speech(synthetic_audio(60, "noise")) == []
+    assert detect_speech(np.zeros(10 * SAMPLE_RATE, dtype=np.float32)) == []
+
+    audio, timeline = trim_silence(synthetic_audio(20, "silence"))
+    assert len(audio) == 0 and timeline.speech_seconds == 0.0
+
+
+def test_continuous_speech_is_kept():
+    assert speech_seconds(detect_speech(synthetic_audio(60, "speech"))) >= 50.0
+
+
+def test_quiet_speaker_after_loud_one_is_kept():
+    audio = synthetic_audio(60, "speech", seed=5)
+    audio[30 * SAMPLE_RATE:] *= 0.1  # 20 dB quieter
+
+    quiet = [(start, end) for start, end in detect_speech(audio) if start >= 30 * SAMPLE_RATE]
+
+    assert speech_seconds(quiet) >= 24.0